@@ -0,0 +1,122 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from EventLog import EventRecord
+from Project import PrintJob, PrintQueueManager
+
+
+class AsyncPrintQueueManager:
+    def __init__(self, manager: Optional[PrintQueueManager] = None, event_buffer: int = 1000,
+                 **manager_options: Any):
+        self.manager = manager if manager is not None else PrintQueueManager(**manager_options)
+        self.event_buffer = event_buffer
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._jobs_available: Optional[asyncio.Event] = None
+        self._subscribers: Set[asyncio.Queue] = set()
+        self.manager.add_queue_listener(self._on_queue_change)
+        self.manager.add_event_listener(self._on_manager_event)
+
+    def close(self):
+        self.manager.remove_queue_listener(self._on_queue_change)
+        self.manager.remove_event_listener(self._on_manager_event)
+
+    def _bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if loop is self._loop:
+            return
+        if self._loop is not None and self._loop.is_running():
+            raise RuntimeError("AsyncPrintQueueManager is already in use by another running event loop")
+
+        self._loop = loop
+        self._jobs_available = asyncio.Event()
+        self._subscribers = set()
+        self._refresh_availability()
+
+    async def enqueue_job(self, user_id: str, job_id: str, priority: int,
+                          content: str = "Document", expiry_time: Optional[float] = None) -> bool:
+        self._bind_loop()
+        success = self.manager.enqueue_job(user_id, job_id, priority, content, expiry_time)
+        self._refresh_availability()
+        return success
+
+    async def handle_simultaneous_submissions(self, job_specs: List[Tuple[str, str, int, str]]) -> Dict[str, bool]:
+        self._bind_loop()
+        results = self.manager.handle_simultaneous_submissions(job_specs)
+        self._refresh_availability()
+        return results
+
+    async def claim_job(self, timeout: Optional[float] = None) -> Optional[PrintJob]:
+        self._bind_loop()
+        deadline = None if timeout is None else self._loop.time() + timeout
+        while True:
+            job = self.manager.claim_job()
+            if job is not None:
+                self._refresh_availability()
+                return job
+
+            self._jobs_available.clear()
+            if not self.manager.queue.is_empty():
+                continue
+            remaining = None if deadline is None else deadline - self._loop.time()
+            if remaining is not None and remaining <= 0:
+                return None
+            try:
+                await asyncio.wait_for(self._jobs_available.wait(), remaining)
+            except asyncio.TimeoutError:
+                return None
+
+    async def print_job(self, timeout: Optional[float] = None) -> Optional[PrintJob]:
+        job = await self.claim_job(timeout)
+        if job is not None:
+            self.manager.complete_job(job)
+        return job
+
+    async def complete_job(self, job: PrintJob):
+        self._bind_loop()
+        self.manager.complete_job(job)
+
+    async def cancel_job(self, job_id: str) -> bool:
+        self._bind_loop()
+        return self.manager.cancel_job(job_id)
+
+    async def tick(self, time_increment: float = 1.0):
+        self._bind_loop()
+        self.manager.tick(time_increment)
+        self._refresh_availability()
+
+    def get_job_info(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.manager.get_job_info(job_id)
+
+    async def events(self) -> AsyncIterator[EventRecord]:
+        self._bind_loop()
+        subscriber: asyncio.Queue = asyncio.Queue(self.event_buffer)
+        self._subscribers.add(subscriber)
+        try:
+            while True:
+                yield await subscriber.get()
+        finally:
+            self._subscribers.discard(subscriber)
+
+    def _refresh_availability(self):
+        if self._jobs_available is None:
+            return
+        if self.manager.queue.is_empty():
+            self._jobs_available.clear()
+        else:
+            self._jobs_available.set()
+
+    def _on_queue_change(self, change: str):
+        if self._loop is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._refresh_availability)
+
+    def _on_manager_event(self, record: EventRecord):
+        if self._loop is None or self._loop.is_closed() or not self._subscribers:
+            return
+        self._loop.call_soon_threadsafe(self._dispatch_event, record)
+
+    def _dispatch_event(self, record: EventRecord):
+        for subscriber in self._subscribers:
+            if subscriber.full():
+                subscriber.get_nowait()
+            subscriber.put_nowait(record)
@@ -0,0 +1,316 @@
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from EventLog import LogLevel
+from Project import PrintJob, PrintQueueManager, QUEUE_ENGINES, create_queue
+from Workloads import PRIORITY_DISTRIBUTIONS, WorkloadSpec, generate_bursts, generate_jobs, percentile
+
+OPERATIONS = ("enqueue", "dequeue", "remove", "tick", "simultaneous")
+TICK_MODES = {
+    "standard": {},
+    "incremental": {'incremental_aging': True, 'indexed_expiry': True},
+    "batch": {'batch_tick': True}
+}
+
+
+@dataclass
+class BenchmarkResult:
+    operation: str
+    engine: str
+    depth: int
+    operations: int
+    total_seconds: float
+    ops_per_second: float
+    p50_us: float
+    p90_us: float
+    p99_us: float
+    max_us: float
+    peak_memory_bytes: Optional[int] = None
+    variant: str = ""
+
+    @property
+    def name(self) -> str:
+        return f"{self.operation}[{self.variant}]" if self.variant else self.operation
+
+    def key(self) -> Tuple[str, str, int]:
+        return self.name, self.engine, self.depth
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class BenchmarkConfig:
+    engines: Tuple[str, ...] = ("circular", "heap", "sharded")
+    depths: Tuple[int, ...] = (1000, 10000, 100000)
+    operations: Tuple[str, ...] = OPERATIONS
+    samples: int = 1000
+    ticks: int = 5
+    tick_modes: Tuple[str, ...] = tuple(TICK_MODES)
+    max_circular_depth: int = 5000
+    track_memory: bool = False
+    workload: WorkloadSpec = field(default_factory=WorkloadSpec)
+
+
+def _make_jobs(spec: WorkloadSpec, count: int, prefix: str = "") -> List[PrintJob]:
+    job_spec = WorkloadSpec(**{**spec.to_dict(), 'jobs': count})
+    return [
+        PrintJob(user_id, prefix + job_id, priority, content, submission_time=index,
+                 last_aged=index, expiry_time=expiry or 30.0)
+        for index, (user_id, job_id, priority, content, expiry) in enumerate(generate_jobs(job_spec))
+    ]
+
+
+def _time_each(operation: Callable[[int], Any], count: int) -> List[int]:
+    timings = []
+    clock = time.perf_counter_ns
+    for index in range(count):
+        started = clock()
+        operation(index)
+        timings.append(clock() - started)
+    return timings
+
+
+def _prefilled_queue(engine: str, depth: int, spec: WorkloadSpec, headroom: int):
+    queue = create_queue(engine, depth + headroom)
+    jobs = _make_jobs(spec, depth)
+    queue.enqueue_many(jobs)
+    return queue, jobs
+
+
+def _prefilled_manager(engine: str, depth: int, spec: WorkloadSpec, headroom: int,
+                       **manager_options: Any) -> PrintQueueManager:
+    manager = PrintQueueManager(capacity=depth + headroom, engine=engine, verbose=False,
+                                log_level=LogLevel.OFF, **manager_options)
+    for burst in generate_bursts(WorkloadSpec(**{**spec.to_dict(), 'jobs': depth, 'burst_size': 10000})):
+        manager.enqueue_batch(burst)
+    return manager
+
+
+def bench_enqueue(engine: str, depth: int, config: BenchmarkConfig) -> Tuple[str, List[int]]:
+    queue, _ = _prefilled_queue(engine, depth, config.workload, config.samples)
+    new_jobs = _make_jobs(config.workload, config.samples, prefix="new-")
+    return "", _time_each(lambda index: queue.enqueue_job(new_jobs[index]), len(new_jobs))
+
+
+def bench_dequeue(engine: str, depth: int, config: BenchmarkConfig) -> Tuple[str, List[int]]:
+    queue, _ = _prefilled_queue(engine, depth, config.workload, 0)
+    return "", _time_each(lambda index: queue.dequeue_job(), min(config.samples, depth))
+
+
+def bench_remove(engine: str, depth: int, config: BenchmarkConfig) -> Tuple[str, List[int]]:
+    queue, jobs = _prefilled_queue(engine, depth, config.workload, 0)
+    victims = random.Random(config.workload.seed).sample(jobs, min(config.samples, depth))
+    return "", _time_each(lambda index: queue.remove_job(victims[index].job_id), len(victims))
+
+
+def bench_tick(engine: str, depth: int, config: BenchmarkConfig, mode: str) -> Tuple[str, List[int]]:
+    manager = _prefilled_manager(engine, depth, config.workload, 0, default_expiry=10 ** 9,
+                                 **TICK_MODES[mode])
+    return mode, _time_each(lambda index: manager.tick(1.0), config.ticks)
+
+
+def bench_simultaneous(engine: str, depth: int, config: BenchmarkConfig) -> Tuple[str, List[int]]:
+    burst_size = max(1, config.workload.burst_size)
+    bursts = max(1, config.samples // burst_size)
+    manager = _prefilled_manager(engine, depth, config.workload, bursts * burst_size)
+    batches = [
+        [(user_id, f"sim-{job_id}", priority, content) for user_id, job_id, priority, content, _ in burst]
+        for burst in generate_bursts(WorkloadSpec(**{**config.workload.to_dict(), 'jobs': bursts * burst_size}))
+    ]
+    return f"burst={burst_size}", _time_each(lambda index: manager.handle_simultaneous_submissions(batches[index]),
+                                             len(batches))
+
+
+def _cases(config: BenchmarkConfig) -> List[Tuple[str, Callable[..., Tuple[str, List[int]]], Dict[str, Any]]]:
+    cases = []
+    for operation in config.operations:
+        if operation == "tick":
+            cases.extend(("tick", bench_tick, {'mode': mode}) for mode in config.tick_modes)
+        else:
+            cases.append((operation, BENCHMARKS[operation], {}))
+    return cases
+
+
+def run_case(operation: str, bench: Callable[..., Tuple[str, List[int]]], engine: str, depth: int,
+             config: BenchmarkConfig, **case_options: Any) -> BenchmarkResult:
+    gc.collect()
+    variant, timings = bench(engine, depth, config, **case_options)
+
+    peak_memory = None
+    if config.track_memory:
+        gc.collect()
+        tracemalloc.start()
+        bench(engine, depth, config, **case_options)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    total_seconds = sum(timings) / 1e9
+    timings.sort()
+    return BenchmarkResult(
+        operation=operation,
+        engine=engine,
+        depth=depth,
+        operations=len(timings),
+        total_seconds=total_seconds,
+        ops_per_second=len(timings) / total_seconds if total_seconds else 0.0,
+        p50_us=percentile(timings, 0.50) / 1000,
+        p90_us=percentile(timings, 0.90) / 1000,
+        p99_us=percentile(timings, 0.99) / 1000,
+        max_us=timings[-1] / 1000 if timings else 0.0,
+        peak_memory_bytes=peak_memory,
+        variant=variant
+    )
+
+
+def run_suite(config: BenchmarkConfig, on_result: Optional[Callable[[BenchmarkResult], None]] = None
+              ) -> List[BenchmarkResult]:
+    results = []
+    for depth in config.depths:
+        for engine in config.engines:
+            if engine == "circular" and depth > config.max_circular_depth:
+                continue
+            for operation, bench, case_options in _cases(config):
+                result = run_case(operation, bench, engine, depth, config, **case_options)
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S")
+    }
+
+
+def save_results(path: str, config: BenchmarkConfig, results: List[BenchmarkResult]):
+    document = {
+        'environment': environment(),
+        'config': asdict(config),
+        'results': [result.to_dict() for result in results]
+    }
+    with open(path, "w", encoding="utf-8") as output:
+        json.dump(document, output, indent=2)
+
+
+def load_results(path: str) -> List[BenchmarkResult]:
+    with open(path, encoding="utf-8") as source:
+        return [BenchmarkResult(**result) for result in json.load(source)['results']]
+
+
+def compare_results(baseline: List[BenchmarkResult], current: List[BenchmarkResult],
+                    threshold: float = 0.10) -> List[Dict[str, Any]]:
+    baseline_by_key = {result.key(): result for result in baseline}
+    comparisons = []
+    for result in current:
+        before = baseline_by_key.get(result.key())
+        if before is None or not before.ops_per_second or not before.p99_us:
+            continue
+        throughput_change = result.ops_per_second / before.ops_per_second - 1
+        p99_change = result.p99_us / before.p99_us - 1
+        comparisons.append({
+            'name': result.name,
+            'engine': result.engine,
+            'depth': result.depth,
+            'ops_per_second_change': throughput_change,
+            'p99_change': p99_change,
+            'regression': throughput_change < -threshold or p99_change > threshold
+        })
+    return comparisons
+
+
+def format_result(result: BenchmarkResult) -> str:
+    memory = f"{result.peak_memory_bytes / 2 ** 20:>9.1f}MB" if result.peak_memory_bytes is not None else ""
+    return (f"{result.name:<26} {result.engine:<9} {result.depth:>8} {result.ops_per_second:>12.0f} "
+            f"{result.p50_us:>10.1f} {result.p90_us:>10.1f} {result.p99_us:>10.1f} {result.max_us:>11.1f}{memory}")
+
+
+def format_comparison(comparison: Dict[str, Any]) -> str:
+    flag = "REGRESSION" if comparison['regression'] else ""
+    return (f"{comparison['name']:<26} {comparison['engine']:<9} {comparison['depth']:>8} "
+            f"{comparison['ops_per_second_change'] * 100:>+9.1f}% {comparison['p99_change'] * 100:>+9.1f}% {flag}")
+
+
+BENCHMARKS = {
+    "enqueue": bench_enqueue,
+    "dequeue": bench_dequeue,
+    "remove": bench_remove,
+    "tick": bench_tick,
+    "simultaneous": bench_simultaneous
+}
+
+
+def _csv(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the print queue core operations")
+    parser.add_argument("--engines", default="circular,heap,sharded",
+                        help=f"comma separated subset of {sorted(QUEUE_ENGINES)}")
+    parser.add_argument("--depths", default="1000,10000,100000", help="comma separated queue depths")
+    parser.add_argument("--operations", default=",".join(OPERATIONS),
+                        help=f"comma separated subset of {list(OPERATIONS)}")
+    parser.add_argument("--tick-modes", default=",".join(TICK_MODES),
+                        help=f"comma separated subset of {list(TICK_MODES)}")
+    parser.add_argument("--samples", type=int, default=1000, help="timed operations per case")
+    parser.add_argument("--ticks", type=int, default=5, help="timed ticks per tick case")
+    parser.add_argument("--burst-size", type=int, default=50)
+    parser.add_argument("--priorities", choices=sorted(PRIORITY_DISTRIBUTIONS), default="uniform")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-circular-depth", type=int, default=5000,
+                        help="skip the O(n) circular engine above this depth")
+    parser.add_argument("--memory", action="store_true", help="re-run each case under tracemalloc for peak memory")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--compare", help="baseline JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="regression threshold as a fraction")
+    args = parser.parse_args(argv)
+
+    config = BenchmarkConfig(
+        engines=tuple(_csv(args.engines)),
+        depths=tuple(int(depth) for depth in _csv(args.depths)),
+        operations=tuple(_csv(args.operations)),
+        samples=args.samples,
+        ticks=args.ticks,
+        tick_modes=tuple(_csv(args.tick_modes)),
+        max_circular_depth=args.max_circular_depth,
+        track_memory=args.memory,
+        workload=WorkloadSpec(users=args.users, burst_size=args.burst_size,
+                              priority_weights=PRIORITY_DISTRIBUTIONS[args.priorities], seed=args.seed)
+    )
+    for operation in config.operations:
+        if operation not in BENCHMARKS:
+            parser.error(f"unknown operation '{operation}', expected one of {list(OPERATIONS)}")
+
+    print(f"{'Operation':<26} {'Engine':<9} {'Depth':>8} {'Ops/s':>12} {'p50 us':>10} {'p90 us':>10} "
+          f"{'p99 us':>10} {'max us':>11}{'     Peak' if config.track_memory else ''}")
+    results = run_suite(config, on_result=lambda result: print(format_result(result), flush=True))
+
+    if args.output:
+        save_results(args.output, config, results)
+
+    if args.compare:
+        comparisons = compare_results(load_results(args.compare), results, args.threshold)
+        print(f"\n{'Operation':<26} {'Engine':<9} {'Depth':>8} {'Ops/s':>10} {'p99':>10}")
+        for comparison in comparisons:
+            print(format_comparison(comparison))
+        if any(comparison['regression'] for comparison in comparisons):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+import argparse
+import csv
+import gzip
+import io
+import json
+import sys
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Any, ContextManager, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from Project import PrintQueueManager, QUEUE_ENGINES
+
+ENQUEUE_JOB = "enqueue_job"
+TICK = "tick"
+PRINT_JOB = "print_job"
+SHOW_STATUS = "show_status"
+SEND_SIMULTANEOUS = "send_simultaneous"
+CANCEL_JOB = "cancel_job"
+
+EVENT_TYPES = (ENQUEUE_JOB, TICK, PRINT_JOB, SHOW_STATUS, SEND_SIMULTANEOUS, CANCEL_JOB)
+
+Event = Tuple[str, Dict[str, Any]]
+
+
+@dataclass
+class DriverReport:
+    events: int = 0
+    batches: int = 0
+    jobs_submitted: int = 0
+    jobs_rejected: int = 0
+    event_counts: Dict[str, int] = field(default_factory=dict)
+
+
+def open_event_file(path: str) -> ContextManager[TextIO]:
+    if path == "-":
+        return nullcontext(sys.stdin)
+    if path.endswith(".gz"):
+        return io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8", newline="")
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def read_events(path: str, event_format: Optional[str] = None) -> Iterator[Event]:
+    if event_format is None:
+        stem = path[:-3] if path.endswith(".gz") else path
+        event_format = "csv" if stem.endswith(".csv") else "jsonl"
+
+    with open_event_file(path) as stream:
+        if event_format == "csv":
+            yield from read_csv_events(stream)
+        elif event_format == "jsonl":
+            yield from read_jsonl_events(stream)
+        else:
+            raise ValueError(f"Unknown event format '{event_format}', expected 'jsonl' or 'csv'")
+
+
+def read_jsonl_events(lines: Iterable[str]) -> Iterator[Event]:
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        record = json.loads(line)
+        event_type = record.pop("event", None)
+        if event_type not in EVENT_TYPES:
+            raise ValueError(f"Line {line_number}: unknown event '{event_type}'")
+        yield event_type, record
+
+
+def read_csv_events(lines: Iterable[str]) -> Iterator[Event]:
+    pending_batch: List[List[Any]] = []
+    pending_batch_id: Optional[str] = None
+
+    for row in csv.DictReader(lines):
+        event_type = (row.get("event") or "").strip()
+        if event_type not in EVENT_TYPES:
+            raise ValueError(f"Unknown CSV event '{event_type}'")
+
+        if event_type == SEND_SIMULTANEOUS:
+            batch_id = row.get("batch") or ""
+            if pending_batch and batch_id != pending_batch_id:
+                yield SEND_SIMULTANEOUS, {"jobs": pending_batch}
+                pending_batch = []
+            pending_batch_id = batch_id
+            pending_batch.append([row["user_id"], row["job_id"], int(row["priority"]),
+                                  row.get("content") or "Document"])
+            continue
+
+        if pending_batch:
+            yield SEND_SIMULTANEOUS, {"jobs": pending_batch}
+            pending_batch = []
+
+        yield event_type, _parse_csv_fields(row)
+
+    if pending_batch:
+        yield SEND_SIMULTANEOUS, {"jobs": pending_batch}
+
+
+def _parse_csv_fields(row: Dict[str, str]) -> Dict[str, Any]:
+    fields: Dict[str, Any] = {}
+    for name in ("user_id", "job_id", "content"):
+        if row.get(name):
+            fields[name] = row[name]
+    if row.get("priority"):
+        fields["priority"] = int(row["priority"])
+    if row.get("expiry_time"):
+        fields["expiry_time"] = float(row["expiry_time"])
+    if row.get("time_increment"):
+        fields["time_increment"] = float(row["time_increment"])
+    return fields
+
+
+class EventDriver:
+    def __init__(self, manager: PrintQueueManager, batch_size: int = 1000, show_status: bool = True):
+        self.manager = manager
+        self.batch_size = max(1, batch_size)
+        self.show_status = show_status
+        self._pending_submits: List[Tuple[Any, ...]] = []
+
+    def run(self, events: Iterable[Event]) -> DriverReport:
+        report = DriverReport()
+        for event_type, fields in events:
+            report.events += 1
+            report.event_counts[event_type] = report.event_counts.get(event_type, 0) + 1
+
+            if event_type == ENQUEUE_JOB:
+                self._pending_submits.append((
+                    fields["user_id"], fields["job_id"], fields["priority"],
+                    fields.get("content", "Document"), fields.get("expiry_time")
+                ))
+                if len(self._pending_submits) >= self.batch_size:
+                    self._flush_submits(report)
+                continue
+
+            self._flush_submits(report)
+            self._dispatch(event_type, fields)
+
+        self._flush_submits(report)
+        return report
+
+    def _flush_submits(self, report: DriverReport):
+        if not self._pending_submits:
+            return
+
+        if len(self._pending_submits) == 1:
+            outcomes = [self.manager.enqueue_job(*self._pending_submits[0])]
+        else:
+            results = self.manager.enqueue_batch(self._pending_submits)
+            report.batches += 1
+            # results are keyed by job id; only the first submission of an id can have been accepted
+            seen = set()
+            outcomes = []
+            for job_spec in self._pending_submits:
+                job_id = job_spec[1]
+                outcomes.append(job_id not in seen and results.get(job_id, False))
+                seen.add(job_id)
+
+        accepted = sum(outcomes)
+        report.jobs_submitted += accepted
+        report.jobs_rejected += len(outcomes) - accepted
+        self._pending_submits = []
+
+    def _dispatch(self, event_type: str, fields: Dict[str, Any]):
+        if event_type == TICK:
+            self.manager.tick(fields.get("time_increment", 1.0))
+        elif event_type == PRINT_JOB:
+            self.manager.print_job()
+        elif event_type == SHOW_STATUS:
+            if self.show_status:
+                self.manager.show_status()
+        elif event_type == SEND_SIMULTANEOUS:
+            self.manager.handle_simultaneous_submissions([tuple(job) for job in fields["jobs"]])
+        elif event_type == CANCEL_JOB:
+            self.manager.cancel_job(fields["job_id"])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Stream print queue events from a JSON Lines or CSV file")
+    parser.add_argument("path", help="event file (.jsonl, .csv, optionally .gz) or - for stdin")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default=None)
+    parser.add_argument("--capacity", type=int, default=100)
+    parser.add_argument("--engine", choices=sorted(QUEUE_ENGINES), default="circular")
+    parser.add_argument("--aging-interval", type=float, default=5.0)
+    parser.add_argument("--default-expiry", type=float, default=30.0)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--no-status", action="store_true", help="suppress show_status output")
+    parser.add_argument("--quiet", action="store_true", help="do not echo the event log")
+    args = parser.parse_args(argv)
+
+    manager = PrintQueueManager(
+        capacity=args.capacity,
+        aging_interval=args.aging_interval,
+        default_expiry=args.default_expiry,
+        engine=args.engine,
+        incremental_aging=True,
+        indexed_expiry=True,
+        verbose=not args.quiet
+    )
+    driver = EventDriver(manager, batch_size=args.batch_size, show_status=not args.no_status)
+    report = driver.run(read_events(args.path, args.format))
+
+    print(f"Processed {report.events} events "
+          f"({report.jobs_submitted} jobs submitted, {report.jobs_rejected} rejected, {report.batches} batches)")
+    print(f"Final statistics: {manager.stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+import json
+import queue
+import threading
+from collections import deque
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, TextIO
+
+
+class LogLevel(IntEnum):
+    DEBUG = 10
+    INFO = 20
+    WARNING = 30
+    ERROR = 40
+    OFF = 100
+
+
+EVENT_TEMPLATES = {
+    "job_added": "Job {user_id}-{job_id} added (Priority: {priority})",
+    "duplicate_job": "ERROR: Job {job_id} already exists!",
+    "queue_full": "ERROR: Queue full! Cannot add job {user_id}-{job_id}",
+    "queue_empty": "No jobs to print - queue is empty!",
+    "job_printed": "PRINTED: {user_id}-{job_id} (Priority: {priority}, Waited: {waiting_time:.1f}s)",
+    "batch_submitted": "Batch submission: {successful}/{total} jobs added",
+    "simultaneous_started": "SIMULTANEOUS SUBMISSION: {total} jobs",
+    "simultaneous_completed": "Simultaneous submission completed: {successful}/{total} successful",
+    "job_cancelled": "CANCELLED: {user_id}-{job_id}",
+    "cancel_failed": "ERROR: Job {job_id} is not pending and cannot be cancelled"
+}
+
+
+@dataclass(slots=True)
+class EventRecord:
+    timestamp: float
+    level: LogLevel
+    kind: str
+    fields: Dict[str, Any]
+
+    def message(self) -> str:
+        template = EVENT_TEMPLATES.get(self.kind)
+        if template is None:
+            return f"{self.kind} {self.fields}"
+        return template.format(**self.fields)
+
+    def format(self) -> str:
+        return f"[{self.timestamp:.1f}s] {self.message()}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'time': self.timestamp, 'level': self.level.name, 'event': self.kind, **self.fields}
+
+
+class EventLog:
+    def __init__(self, capacity: Optional[int] = 10000, level: LogLevel = LogLevel.INFO,
+                 sink: Optional[TextIO] = None, sink_format: str = "text", echo: bool = False,
+                 batch_size: int = 256, sink_buffer: int = 65536):
+        if sink_format not in ("text", "json"):
+            raise ValueError(f"Unknown sink format '{sink_format}', expected 'text' or 'json'")
+
+        self.level = level
+        self.echo = echo
+        self.sink = sink
+        self.sink_format = sink_format
+        self.batch_size = batch_size
+        self.records: Deque[EventRecord] = deque(maxlen=capacity)
+        self.listeners: List[Callable[[EventRecord], None]] = []
+        self.dropped = 0
+        self.sink_dropped = 0
+        self.sink_errors = 0
+        self._pending: "queue.Queue[Optional[EventRecord]]" = queue.Queue(sink_buffer)
+        self._writer: Optional[threading.Thread] = None
+        if sink is not None:
+            self._writer = threading.Thread(target=self._write_loop, name="EventLogWriter", daemon=True)
+            self._writer.start()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[EventRecord]:
+        return iter(list(self.records))
+
+    def is_enabled(self, level: LogLevel) -> bool:
+        return level >= self.level
+
+    def log(self, timestamp: float, level: LogLevel, kind: str, **fields: Any) -> Optional[EventRecord]:
+        if level < self.level:
+            if self.listeners:
+                self._notify(EventRecord(timestamp, level, kind, fields))
+            return None
+
+        record = EventRecord(timestamp, level, kind, fields)
+        if self.records.maxlen is not None and len(self.records) == self.records.maxlen:
+            self.dropped += 1
+        self.records.append(record)
+
+        if self.echo:
+            print(record.format())
+        if self._writer is not None:
+            try:
+                self._pending.put_nowait(record)
+            except queue.Full:
+                self.sink_dropped += 1
+        self._notify(record)
+        return record
+
+    def _notify(self, record: EventRecord):
+        for listener in self.listeners:
+            listener(record)
+
+    def messages(self) -> List[str]:
+        return [record.format() for record in list(self.records)]
+
+    def add_listener(self, listener: Callable[[EventRecord], None]):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[EventRecord], None]):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def close(self):
+        if self._writer is None:
+            return
+        self._pending.put(None)
+        self._writer.join()
+        self._writer = None
+
+    def _write_loop(self):
+        while True:
+            record = self._pending.get()
+            batch = [] if record is None else [record]
+            closing = record is None
+            while not closing and len(batch) < self.batch_size:
+                try:
+                    record = self._pending.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    closing = True
+                else:
+                    batch.append(record)
+
+            if batch:
+                try:
+                    self.sink.write("".join(self._serialize(record) for record in batch))
+                    self.sink.flush()
+                except Exception:
+                    self.sink_errors += 1
+            if closing:
+                return
+
+    def _serialize(self, record: EventRecord) -> str:
+        if self.sink_format == "json":
+            return json.dumps(record.to_dict()) + "\n"
+        return record.format() + "\n"
@@ -0,0 +1,236 @@
+import json
+import math
+import threading
+import time
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+OPERATIONS = ("enqueue", "enqueue_batch", "dequeue", "complete", "cancel", "tick",
+              "tick_waiting_update", "tick_scan", "tick_aging", "tick_expiry")
+
+
+class Histogram:
+    def __init__(self, name: str, minimum: float = 1e-7, maximum: float = 100.0, buckets_per_octave: int = 4):
+        self.name = name
+        self.minimum = minimum
+        self._scale = buckets_per_octave / math.log(2)
+        size = int(math.ceil(math.log(maximum / minimum) * self._scale)) + 1
+        self.bounds = [minimum * math.exp(index / self._scale) for index in range(size)]
+        self.counts = array('q', bytes(8 * (size + 1)))
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value: float):
+        if value <= self.minimum:
+            index = 0
+        else:
+            index = min(int(math.ceil(math.log(value / self.minimum) * self._scale)), len(self.bounds))
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target and count:
+                return min(self.bounds[index], self.max) if index < len(self.bounds) else self.max
+        return self.max
+
+    def reset(self):
+        for index in range(len(self.counts)):
+            self.counts[index] = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def buckets(self) -> Iterable[Tuple[float, int]]:
+        cumulative = 0
+        for index, bound in enumerate(self.bounds):
+            cumulative += self.counts[index]
+            yield bound, cumulative
+        yield math.inf, self.count
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'mean': self.mean,
+            'p50': self.percentile(0.50),
+            'p90': self.percentile(0.90),
+            'p99': self.percentile(0.99),
+            'max': self.max
+        }
+
+
+class DepthSeries:
+    def __init__(self, capacity: int = 10000):
+        self.capacity = capacity
+        self.times = array('d', bytes(8 * capacity))
+        self.depths = array('q', bytes(8 * capacity))
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def record(self, timestamp: float, depth: int):
+        self.times[self._next] = timestamp
+        self.depths[self._next] = depth
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def points(self) -> List[Tuple[float, int]]:
+        start = (self._next - self._size) % self.capacity
+        return [(self.times[(start + offset) % self.capacity], self.depths[(start + offset) % self.capacity])
+                for offset in range(self._size)]
+
+    def latest(self) -> Optional[int]:
+        return self.depths[(self._next - 1) % self.capacity] if self._size else None
+
+
+class InstrumentedLock:
+    def __init__(self, lock: Any, wait: Histogram, hold: Histogram, sample_every: int = 1):
+        self._lock = lock
+        self._wait = wait
+        self._hold = hold
+        self._sample_every = max(1, sample_every)
+        self._acquisitions = 0
+        self._local = threading.local()
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        local = self._local
+        depth = getattr(local, "depth", 0)
+        if depth:
+            acquired = self._lock.acquire(blocking, timeout)
+            if acquired:
+                local.depth = depth + 1
+            return acquired
+
+        self._acquisitions += 1
+        if self._acquisitions % self._sample_every:
+            acquired = self._lock.acquire(blocking, timeout)
+            local.acquired_at = None
+        else:
+            started = time.perf_counter()
+            acquired = self._lock.acquire(blocking, timeout)
+            local.acquired_at = time.perf_counter()
+            self._wait.record(local.acquired_at - started)
+        if acquired:
+            local.depth = 1
+        return acquired
+
+    def release(self):
+        local = self._local
+        local.depth -= 1
+        if not local.depth and local.acquired_at is not None:
+            self._hold.record(time.perf_counter() - local.acquired_at)
+        self._lock.release()
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(self, *exc_info: Any):
+        self.release()
+
+
+class QueueMetrics:
+    def __init__(self, sample_every: int = 1, depth_samples: int = 10000, prefix: str = "printqueue"):
+        self.sample_every = max(1, sample_every)
+        self.prefix = prefix
+        self.operations = {operation: Histogram(operation) for operation in OPERATIONS}
+        self.lock_wait = Histogram("lock_wait")
+        self.lock_hold = Histogram("lock_hold")
+        self.job_wait = Histogram("job_wait", minimum=0.01, maximum=1e6, buckets_per_octave=2)
+        self.depth = DepthSeries(depth_samples)
+        self._calls = 0
+
+    def start(self, sampled: bool = True) -> Optional[float]:
+        if sampled:
+            self._calls += 1
+            if self._calls % self.sample_every:
+                return None
+        return time.perf_counter()
+
+    def stop(self, operation: str, started: Optional[float]) -> Optional[float]:
+        if started is None:
+            return None
+        now = time.perf_counter()
+        self.operations[operation].record(now - started)
+        return now
+
+    def record_depth(self, timestamp: float, depth: int):
+        self.depth.record(timestamp, depth)
+
+    def record_job_wait(self, waiting_time: float):
+        self.job_wait.record(waiting_time)
+
+    def instrument_lock(self, queue: Any):
+        for target in getattr(queue, "_shards", None) or [queue]:
+            if not isinstance(target._lock, InstrumentedLock):
+                target._lock = InstrumentedLock(target._lock, self.lock_wait, self.lock_hold, self.sample_every)
+
+    def histograms(self) -> Dict[str, Histogram]:
+        return {**self.operations, 'lock_wait': self.lock_wait, 'lock_hold': self.lock_hold,
+                'job_wait': self.job_wait}
+
+    def to_dict(self, counters: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        return {
+            'sample_every': self.sample_every,
+            'operations': {name: histogram.summary() for name, histogram in self.operations.items()
+                           if histogram.count},
+            'lock': {'wait': self.lock_wait.summary(), 'hold': self.lock_hold.summary()},
+            'job_wait': self.job_wait.summary(),
+            'depth': self.depth.points(),
+            'counters': dict(counters or {})
+        }
+
+    def to_json(self, counters: Optional[Dict[str, int]] = None) -> str:
+        return json.dumps(self.to_dict(counters))
+
+    def to_prometheus(self, counters: Optional[Dict[str, int]] = None) -> str:
+        prefix = self.prefix
+        lines = []
+        for metric, histograms, label in (
+            (f"{prefix}_operation_seconds", self.operations.items(), "operation"),
+            (f"{prefix}_lock_seconds", (('wait', self.lock_wait), ('hold', self.lock_hold)), "phase")
+        ):
+            lines.append(f"# TYPE {metric} histogram")
+            for name, histogram in histograms:
+                lines.extend(self._histogram_lines(metric, histogram, f'{label}="{name}"'))
+
+        metric = f"{prefix}_job_wait_seconds"
+        lines.append(f"# TYPE {metric} histogram")
+        lines.extend(self._histogram_lines(metric, self.job_wait, ""))
+
+        depth = self.depth.latest()
+        if depth is not None:
+            lines.append(f"# TYPE {prefix}_queue_depth gauge")
+            lines.append(f"{prefix}_queue_depth {depth}")
+        for name, value in (counters or {}).items():
+            metric = f"{prefix}_{name[len('total_'):] if name.startswith('total_') else name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _histogram_lines(metric: str, histogram: Histogram, labels: str) -> List[str]:
+        separator = "," if labels else ""
+        lines = [
+            f'{metric}_bucket{{{labels}{separator}le="{"+Inf" if math.isinf(bound) else f"{bound:.9g}"}"}} {count}'
+            for bound, count in histogram.buckets()
+        ]
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{metric}_sum{suffix} {histogram.total:.9g}")
+        lines.append(f"{metric}_count{suffix} {histogram.count}")
+        return lines
@@ -0,0 +1,141 @@
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+from EventLog import LogLevel
+from Project import PrintJob, PrintQueueManager, QUEUE_ENGINES, SCHEDULING_POLICIES
+from Simulator import DiscreteEventSimulator
+from Workloads import PRIORITY_DISTRIBUTIONS, WorkloadSpec, generate_trace, percentile
+
+DEFAULT_POLICIES = ("strict", "aging", "sjf", "edf", "fairshare")
+
+
+@dataclass
+class PolicyResult:
+    policy: str
+    engine: str
+    jobs_submitted: int
+    jobs_printed: int
+    jobs_expired: int
+    simulated_time: float
+    wall_time: float
+    cpu_time: float
+    events: int
+    throughput: float
+    mean_wait: float
+    p99_wait: float
+    expiry_rate: float
+    cpu_per_op_us: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class PrintTimeModel:
+    def __init__(self, setup_time: float = 0.2, bytes_per_second: float = 20000.0):
+        self.setup_time = setup_time
+        self.bytes_per_second = bytes_per_second
+
+    def __call__(self, job: PrintJob) -> float:
+        return self.setup_time + len(job.content) / self.bytes_per_second
+
+
+def run_policy(policy: str, spec: WorkloadSpec, engine: str = "heap", printers: int = 1,
+               print_time: Optional[PrintTimeModel] = None, **manager_options: Any) -> PolicyResult:
+    manager_options.setdefault("capacity", spec.jobs)
+    manager = PrintQueueManager(
+        engine=engine,
+        policy=policy,
+        incremental_aging=True,
+        indexed_expiry=True,
+        verbose=False,
+        log_level=LogLevel.OFF,
+        **manager_options
+    )
+    simulator = DiscreteEventSimulator(manager, printers=printers, print_time=print_time or PrintTimeModel())
+
+    cpu_started = time.process_time()
+    report = simulator.run(generate_trace(spec))
+    cpu_time = time.process_time() - cpu_started
+
+    waits = sorted(job.waiting_time for job in manager.completed_jobs)
+    stats = manager.stats
+    return PolicyResult(
+        policy=policy,
+        engine=engine,
+        jobs_submitted=stats['total_submitted'],
+        jobs_printed=stats['total_printed'],
+        jobs_expired=stats['total_expired'],
+        simulated_time=report.simulated_time,
+        wall_time=report.wall_time,
+        cpu_time=cpu_time,
+        events=report.events_processed,
+        throughput=stats['total_printed'] / report.simulated_time if report.simulated_time else 0.0,
+        mean_wait=sum(waits) / len(waits) if waits else 0.0,
+        p99_wait=percentile(waits, 0.99),
+        expiry_rate=stats['total_expired'] / stats['total_submitted'] if stats['total_submitted'] else 0.0,
+        cpu_per_op_us=cpu_time / report.events_processed * 1e6 if report.events_processed else 0.0
+    )
+
+
+def compare_policies(spec: WorkloadSpec, policies: List[str] = DEFAULT_POLICIES,
+                     **run_options: Any) -> List[PolicyResult]:
+    return [run_policy(policy, spec, **run_options) for policy in policies]
+
+
+def format_results(results: List[PolicyResult]) -> str:
+    lines = [f"{'Policy':<10} {'Printed':>8} {'Expired':>8} {'Jobs/s':>8} {'Mean wait':>10} "
+             f"{'p99 wait':>10} {'Expiry %':>9} {'CPU/op us':>10}"]
+    for result in results:
+        lines.append(f"{result.policy:<10} {result.jobs_printed:>8} {result.jobs_expired:>8} "
+                     f"{result.throughput:>8.3f} {result.mean_wait:>9.1f}s {result.p99_wait:>9.1f}s "
+                     f"{result.expiry_rate * 100:>8.1f}% {result.cpu_per_op_us:>10.1f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run one synthetic workload through each scheduling policy")
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--arrival-rate", type=float, default=1.0)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--burst-size", type=int, default=1)
+    parser.add_argument("--priorities", choices=sorted(PRIORITY_DISTRIBUTIONS), default="uniform")
+    parser.add_argument("--heavy-user-share", type=float, default=0.3)
+    parser.add_argument("--expiry", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--policies", default=",".join(DEFAULT_POLICIES),
+                        help=f"comma separated subset of {sorted(SCHEDULING_POLICIES)}")
+    parser.add_argument("--engine", choices=sorted(QUEUE_ENGINES), default="heap")
+    parser.add_argument("--printers", type=int, default=1)
+    parser.add_argument("--aging-interval", type=float, default=5.0)
+    parser.add_argument("--json", dest="json_path", help="write results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    spec = WorkloadSpec(
+        jobs=args.jobs,
+        arrival_rate=args.arrival_rate,
+        users=args.users,
+        priority_weights=PRIORITY_DISTRIBUTIONS[args.priorities],
+        burst_size=args.burst_size,
+        expiry=args.expiry,
+        heavy_user_share=args.heavy_user_share,
+        seed=args.seed
+    )
+    results = compare_policies(
+        spec, [policy.strip() for policy in args.policies.split(",") if policy.strip()],
+        engine=args.engine, printers=args.printers, aging_interval=args.aging_interval
+    )
+    print(format_results(results))
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as output:
+            json.dump({'workload': spec.to_dict(), 'results': [result.to_dict() for result in results]},
+                      output, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Any
+
+from Project import PrintJob, PrintQueueManager
+
+
+@dataclass
+class PrinterStats:
+    printer_id: str
+    jobs_printed: int = 0
+    jobs_failed: int = 0
+    busy_time: float = 0.0
+    idle_time: float = 0.0
+    current_job: Optional[str] = None
+
+    def utilization(self) -> float:
+        total_time = self.busy_time + self.idle_time
+        return self.busy_time / total_time if total_time else 0.0
+
+
+class PrinterPool:
+    def __init__(self, manager: PrintQueueManager, printers: int = 2,
+                 print_function: Optional[Callable[[PrintJob], None]] = None,
+                 on_start: Optional[Callable[[str, PrintJob], None]] = None,
+                 on_complete: Optional[Callable[[str, PrintJob], None]] = None,
+                 on_failure: Optional[Callable[[str, PrintJob, Exception], None]] = None,
+                 poll_interval: float = 0.05):
+        self.manager = manager
+        self.print_function = print_function or (lambda job: None)
+        self.on_start = on_start
+        self.on_complete = on_complete
+        self.on_failure = on_failure
+        self.poll_interval = poll_interval
+        self.printers: Dict[str, PrinterStats] = {
+            f"printer-{index + 1}": PrinterStats(f"printer-{index + 1}") for index in range(printers)
+        }
+        self.failed_jobs: List[PrintJob] = []
+        self._workers: List[threading.Thread] = []
+        self._stop_event = threading.Event()
+        self._active_printers = 0
+        self._active_lock = threading.Lock()
+        self._started_at: Optional[float] = None
+        self._stopped_at: Optional[float] = None
+
+    def start(self):
+        if self._workers:
+            return
+
+        self._stop_event.clear()
+        self._started_at = time.perf_counter()
+        self._stopped_at = None
+        for stats in self.printers.values():
+            worker = threading.Thread(target=self._run_printer, args=(stats,),
+                                      name=f"Printer-{stats.printer_id}", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop_event.set()
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
+        self._stopped_at = time.perf_counter()
+
+    def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while not self.manager.queue.is_empty() or self.busy_printers():
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            time.sleep(self.poll_interval)
+        return True
+
+    def busy_printers(self) -> int:
+        return self._active_printers
+
+    def _set_active(self, delta: int):
+        with self._active_lock:
+            self._active_printers += delta
+
+    def _run_printer(self, stats: PrinterStats):
+        idle_since = time.perf_counter()
+        while not self._stop_event.is_set():
+            self._set_active(1)
+            job = self.manager.claim_job()
+            if job is None:
+                self._set_active(-1)
+                self._stop_event.wait(self.poll_interval)
+                continue
+
+            started = time.perf_counter()
+            stats.idle_time += started - idle_since
+            stats.current_job = job.job_id
+            if self.on_start is not None:
+                self.on_start(stats.printer_id, job)
+
+            try:
+                self.print_function(job)
+            except Exception as error:
+                self.manager.fail_job(job)
+                stats.jobs_failed += 1
+                self.failed_jobs.append(job)
+                if self.on_failure is not None:
+                    self.on_failure(stats.printer_id, job, error)
+            else:
+                self.manager.complete_job(job)
+                stats.jobs_printed += 1
+                if self.on_complete is not None:
+                    self.on_complete(stats.printer_id, job)
+            finally:
+                idle_since = time.perf_counter()
+                stats.busy_time += idle_since - started
+                stats.current_job = None
+                self._set_active(-1)
+
+        stats.idle_time += time.perf_counter() - idle_since
+
+    def elapsed_time(self) -> float:
+        if self._started_at is None:
+            return 0.0
+        end = self._stopped_at if self._stopped_at is not None else time.perf_counter()
+        return end - self._started_at
+
+    def throughput(self) -> float:
+        elapsed = self.elapsed_time()
+        printed = sum(stats.jobs_printed for stats in self.printers.values())
+        return printed / elapsed if elapsed else 0.0
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            'elapsed_time': self.elapsed_time(),
+            'jobs_per_second': self.throughput(),
+            'failed_jobs': len(self.failed_jobs),
+            'printers': {
+                printer_id: {
+                    'jobs_printed': stats.jobs_printed,
+                    'jobs_failed': stats.jobs_failed,
+                    'busy_time': stats.busy_time,
+                    'idle_time': stats.idle_time,
+                    'utilization': stats.utilization()
+                }
+                for printer_id, stats in self.printers.items()
+            }
+        }
@@ -1,18 +1,54 @@
+from array import array
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
+from functools import cached_property, partial, wraps
+import heapq
+import itertools
+import math
+import operator
+import random
+import sys
 import threading
 import time
-from typing import Optional, List, Tuple, Dict, Any
+import zlib
+from operator import itemgetter
+from typing import Optional, List, Tuple, Dict, Any, Union, Callable, Deque, Iterable, Iterator, NamedTuple, TextIO
 from dataclasses import dataclass, field
 
+from EventLog import EventLog, EventRecord, LogLevel
+from Metrics import QueueMetrics
+from Snapshots import QueueSnapshot, SnapshotDiff, SnapshotRow, diff_snapshots
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 class JobStatus(Enum):
     PENDING = "pending"
     PRINTING = "printing"
     COMPLETED = "completed"
     EXPIRED = "expired"
+    CANCELLED = "cancelled"
+    FAILED = "failed"
+
+
+class JobRow(NamedTuple):
+    user_id: str
+    job_id: str
+    priority: int
+    content: str
+    submission_time: float
+    waiting_time: float
+    original_priority: int
+    last_aged: float
+    status: JobStatus
+    expiry_time: float
 
 
-@dataclass(order=True)
+@dataclass(order=True, slots=True)
 class PrintJob:
     user_id: str
     job_id: str
@@ -27,6 +63,12 @@ class PrintJob:
 
     def __post_init__(self):
         self.original_priority = self.priority
+        if isinstance(self.user_id, str):
+            self.user_id = sys.intern(self.user_id)
+
+    def freeze(self) -> JobRow:
+        return JobRow(self.user_id, self.job_id, self.priority, self.content, self.submission_time,
+                      self.waiting_time, self.original_priority, self.last_aged, self.status, self.expiry_time)
 
     def update_waiting_time(self, current_time: float):
         self.waiting_time = current_time - self.submission_time
@@ -45,13 +87,228 @@ class PrintJob:
         return False
 
 
+class JobTable:
+    IDLE = math.inf
+
+    def __init__(self):
+        self.priority = array('i')
+        self.submission_time = array('d')
+        self.last_aged = array('d')
+        self.expiry_time = array('d')
+        self._rows: Dict[str, int] = {}
+        self._free_rows: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._rows
+
+    @property
+    def row_count(self) -> int:
+        return len(self.priority)
+
+    def row_of(self, job_id: str) -> Optional[int]:
+        return self._rows.get(job_id)
+
+    def add_job(self, job: PrintJob) -> int:
+        values = (job.priority, job.submission_time,
+                  job.last_aged if job.priority > 1 else self.IDLE, job.expiry_time)
+        columns = (self.priority, self.submission_time, self.last_aged, self.expiry_time)
+
+        if self._free_rows:
+            row = self._free_rows.pop()
+            for column, value in zip(columns, values):
+                column[row] = value
+        else:
+            row = len(self.priority)
+            for column, value in zip(columns, values):
+                column.append(value)
+
+        self._rows[job.job_id] = row
+        return row
+
+    def release(self, job_id: str) -> bool:
+        row = self._rows.pop(job_id, None)
+        if row is None:
+            return False
+
+        self.last_aged[row] = self.IDLE
+        self.expiry_time[row] = self.IDLE
+        self._free_rows.append(row)
+        return True
+
+
+class FairShareClock:
+    def __init__(self, weights: Optional[Dict[str, float]] = None, default_weight: float = 1.0):
+        self.weights = dict(weights or {})
+        self.default_weight = default_weight
+        self.virtual_time = 0.0
+        self.tags: Dict[str, float] = {}
+
+    def weight_of(self, user_id: str) -> float:
+        return self.weights.get(user_id, self.default_weight)
+
+    def set_weight(self, user_id: str, weight: float):
+        if weight <= 0:
+            raise ValueError(f"Weight for user '{user_id}' must be positive")
+        self.weights[user_id] = weight
+
+    def start_tag(self, user_id: str) -> float:
+        return max(self.virtual_time, self.tags.get(user_id, 0.0))
+
+    def activate(self, user_id: str):
+        self.tags[user_id] = self.start_tag(user_id)
+
+    def charge(self, user_id: str, start_tag: float):
+        self.tags[user_id] = start_tag + 1.0 / self.weight_of(user_id)
+
+    def advance(self, tag: float):
+        self.virtual_time = max(self.virtual_time, tag)
+
+
+class SchedulingPolicy:
+    name = "base"
+
+    def key(self, job: PrintJob, sequence: int) -> Tuple:
+        raise NotImplementedError
+
+    def on_enqueued(self, job: PrintJob):
+        pass
+
+    def on_dispatched(self, job: PrintJob):
+        pass
+
+    def on_removed(self, job: PrintJob):
+        pass
+
+
+class LegacyOrderingPolicy(SchedulingPolicy):
+    name = "legacy"
+
+    def key(self, job: PrintJob, sequence: int) -> Tuple:
+        return job, sequence
+
+
+class StrictPriorityPolicy(SchedulingPolicy):
+    name = "strict"
+
+    def key(self, job: PrintJob, sequence: int) -> Tuple:
+        return job.original_priority, job.submission_time, sequence
+
+
+class PriorityAgingPolicy(SchedulingPolicy):
+    name = "aging"
+
+    def key(self, job: PrintJob, sequence: int) -> Tuple:
+        return job.priority, job.submission_time, sequence
+
+
+class ShortestJobFirstPolicy(SchedulingPolicy):
+    name = "sjf"
+
+    def key(self, job: PrintJob, sequence: int) -> Tuple:
+        return len(job.content), job.priority, sequence
+
+
+class EarliestDeadlineFirstPolicy(SchedulingPolicy):
+    name = "edf"
+
+    def key(self, job: PrintJob, sequence: int) -> Tuple:
+        return job.submission_time + job.expiry_time, job.priority, sequence
+
+
+class FairSharePolicy(SchedulingPolicy):
+    name = "fairshare"
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None, default_weight: float = 1.0):
+        self.clock = FairShareClock(weights, default_weight)
+        self._start_tags: Dict[str, float] = {}
+
+    def key(self, job: PrintJob, sequence: int) -> Tuple:
+        start_tag = self._start_tags.get(job.job_id)
+        if start_tag is None:
+            start_tag = self.clock.start_tag(job.user_id)
+        return start_tag, job.priority, sequence
+
+    def on_enqueued(self, job: PrintJob):
+        if job.job_id not in self._start_tags:
+            start_tag = self._start_tags[job.job_id] = self.clock.start_tag(job.user_id)
+            self.clock.charge(job.user_id, start_tag)
+
+    def on_dispatched(self, job: PrintJob):
+        start_tag = self._start_tags.pop(job.job_id, None)
+        if start_tag is not None:
+            self.clock.advance(start_tag)
+
+    def on_removed(self, job: PrintJob):
+        self._start_tags.pop(job.job_id, None)
+
+
+SCHEDULING_POLICIES = {
+    policy.name: policy
+    for policy in (LegacyOrderingPolicy, StrictPriorityPolicy, PriorityAgingPolicy,
+                   ShortestJobFirstPolicy, EarliestDeadlineFirstPolicy, FairSharePolicy)
+}
+
+
+def create_policy(policy: Union[str, SchedulingPolicy, None], default: str = "aging") -> SchedulingPolicy:
+    if isinstance(policy, SchedulingPolicy):
+        return policy
+    name = policy or default
+    if name not in SCHEDULING_POLICIES:
+        raise ValueError(f"Unknown scheduling policy '{name}', expected one of {sorted(SCHEDULING_POLICIES)}")
+    return SCHEDULING_POLICIES[name]()
+
+
+@dataclass(frozen=True)
+class QueueView:
+    version: int
+    jobs: Tuple[JobRow, ...] = ()
+    keys: Tuple[Tuple[int, float, int], ...] = ()
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def __iter__(self) -> Iterator[JobRow]:
+        return iter(self.jobs)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._index
+
+    @cached_property
+    def _index(self) -> Dict[str, int]:
+        return {job.job_id: rank for rank, job in enumerate(self.jobs)}
+
+    def peek(self) -> Optional[JobRow]:
+        return self.jobs[0] if self.jobs else None
+
+    def top(self, count: int) -> Tuple[JobRow, ...]:
+        return self.jobs[:count]
+
+    def find(self, job_id: str) -> Optional[JobRow]:
+        rank = self._index.get(job_id)
+        return self.jobs[rank] if rank is not None else None
+
+    def rank_of(self, job_id: str) -> Optional[int]:
+        rank = self._index.get(job_id)
+        return rank + 1 if rank is not None else None
+
+
 class CircularQueue:
-    def __init__(self, capacity: int = 100):
+    def __init__(self, capacity: int = 100, policy: Union[str, SchedulingPolicy, None] = None):
         self._capacity = capacity
+        self.policy = create_policy(policy, default="legacy")
+        self._order_key = None if isinstance(self.policy, LegacyOrderingPolicy) else self._policy_key
         self._data: List[Optional[PrintJob]] = [None] * capacity
         self._front = 0
         self._size = 0
+        self._sequence = itertools.count()
+        self._sequences: Dict[str, int] = {}
         self._lock = threading.RLock()
+        self._version = 0
+        self._view = QueueView(0)
+        self._publishing = False
         self.total_jobs_submitted = 0
         self.total_jobs_printed = 0
 
@@ -69,22 +326,69 @@ class CircularQueue:
             if self.is_full():
                 return False
 
+            self._admit(job)
             insert_pos = self._find_insert_position(job)
             self._insert_at_position(job, insert_pos)
 
             self._size += 1
+            self._version += 1
             self.total_jobs_submitted += 1
+            self._publish_view()
             return True
 
+    def enqueue_many(self, jobs: List[PrintJob]) -> List[bool]:
+        with self._lock:
+            queued = self.get_all_jobs()
+            job_ids = {job.job_id for job in queued}
+            free_slots = self._capacity - self._size
+            accepted_jobs: List[PrintJob] = []
+            results = []
+            for job in jobs:
+                accepted = len(accepted_jobs) < free_slots and job.job_id not in job_ids
+                if accepted:
+                    job_ids.add(job.job_id)
+                    accepted_jobs.append(job)
+                    self._admit(job)
+                results.append(accepted)
+            if not accepted_jobs:
+                return results
+
+            order = self._order_key
+            merged = list(heapq.merge(queued, sorted(accepted_jobs, key=order), key=order))
+            self._data = merged + [None] * (self._capacity - len(merged))
+            self._front = 0
+            self._size = len(merged)
+            self._version += 1
+            self.total_jobs_submitted += len(accepted_jobs)
+            self._publish_view()
+            return results
+
+    def _admit(self, job: PrintJob):
+        self._sequences[job.job_id] = next(self._sequence)
+        self.policy.on_enqueued(job)
+
+    def _policy_key(self, job: PrintJob) -> Tuple:
+        return self.policy.key(job, self._sequences[job.job_id])
+
+    def resort(self):
+        with self._lock:
+            jobs = sorted(self.get_all_jobs(), key=self._order_key)
+            self._data = jobs + [None] * (self._capacity - len(jobs))
+            self._front = 0
+            self._version += 1
+            self._publish_view()
+
     def _find_insert_position(self, new_job: PrintJob) -> int:
         if self._size == 0:
             return 0
 
+        order = self._order_key
+        new_key = order(new_job) if order else new_job
         for i in range(self._size):
             current_index = (self._front + i) % self._capacity
             current_job = self._data[current_index]
 
-            if current_job is not None and new_job < current_job:
+            if current_job is not None and new_key < (order(current_job) if order else current_job):
                 return i
 
         return self._size
@@ -111,8 +415,11 @@ class CircularQueue:
             self._data[self._front] = None
             self._front = (self._front + 1) % self._capacity
             self._size -= 1
+            self._version += 1
             self.total_jobs_printed += 1
-
+            del self._sequences[job.job_id]
+            self.policy.on_dispatched(job)
+            self._publish_view()
             return job
 
     def peek_job(self) -> Optional[PrintJob]:
@@ -131,30 +438,879 @@ class CircularQueue:
                     jobs.append(job)
             return jobs
 
+    def top_jobs(self, count: int) -> List[PrintJob]:
+        with self._lock:
+            return [self._data[(self._front + i) % self._capacity] for i in range(min(count, self._size))]
+
+    def view(self) -> QueueView:
+        if not self._publishing:
+            with self._lock:
+                self._publishing = True
+                self._publish_view()
+        return self._view
+
+    def publish_view(self):
+        with self._lock:
+            self._version += 1
+            self._publish_view()
+
+    def _publish_view(self):
+        if self._publishing:
+            self._view = QueueView(self._version, tuple(job.freeze() for job in self.get_all_jobs()))
+
     def remove_job(self, job_id: str) -> bool:
         with self._lock:
-            for i in range(self._size):
-                index = (self._front + i) % self._capacity
-                job = self._data[index]
-                if job is not None and job.job_id == job_id:
-                    for j in range(i, self._size - 1):
-                        current_index = (self._front + j) % self._capacity
-                        next_index = (self._front + j + 1) % self._capacity
-                        self._data[current_index] = self._data[next_index]
-
-                    last_index = (self._front + self._size - 1) % self._capacity
-                    self._data[last_index] = None
-                    self._size -= 1
-                    return True
+            position = self._find_job_position(job_id)
+            if position is None:
+                return False
+            job = self._data[(self._front + position) % self._capacity]
+            del self._sequences[job.job_id]
+            self.policy.on_removed(job)
+            self._remove_at_position(position)
+            self._publish_view()
+            return True
+
+    def reposition_job(self, job: PrintJob) -> bool:
+        with self._lock:
+            position = self._find_job_position(job.job_id)
+            if position is None:
+                return False
+
+            self._remove_at_position(position)
+            self._insert_at_position(job, self._find_insert_position(job))
+            self._size += 1
+            self._publish_view()
+            return True
+
+    def _find_job_position(self, job_id: str) -> Optional[int]:
+        for i in range(self._size):
+            job = self._data[(self._front + i) % self._capacity]
+            if job is not None and job.job_id == job_id:
+                return i
+        return None
+
+    def _remove_at_position(self, position: int):
+        for j in range(position, self._size - 1):
+            current_index = (self._front + j) % self._capacity
+            next_index = (self._front + j + 1) % self._capacity
+            self._data[current_index] = self._data[next_index]
+
+        last_index = (self._front + self._size - 1) % self._capacity
+        self._data[last_index] = None
+        self._size -= 1
+        self._version += 1
+
+class HeapPriorityQueue:
+    def __init__(self, capacity: int = 100, sequence: Optional[Iterator[int]] = None,
+                 policy: Union[str, SchedulingPolicy, None] = None):
+        self._capacity = capacity
+        self.policy = create_policy(policy)
+        self._job_key = self.policy.key
+        self._heap: List[Tuple[Tuple[int, float, int], PrintJob]] = []
+        self._positions: Dict[str, int] = {}
+        self._sequence = sequence if sequence is not None else itertools.count()
+        self._lock = threading.RLock()
+        self._version = 0
+        self._view = QueueView(0)
+        self._publishing = False
+        self.total_jobs_submitted = 0
+        self.total_jobs_printed = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._positions
+
+    def is_empty(self) -> bool:
+        return not self._heap
+
+    def is_full(self) -> bool:
+        return len(self._heap) >= self._capacity
+
+    def enqueue_job(self, job: PrintJob) -> bool:
+        with self._lock:
+            if self.is_full() or job.job_id in self._positions:
+                return False
+
+            self.policy.on_enqueued(job)
+            self._heap.append((self._job_key(job, next(self._sequence)), job))
+            self._sift_up(len(self._heap) - 1)
+            self._version += 1
+            self.total_jobs_submitted += 1
+            self._publish_view()
+            return True
+
+    def enqueue_many(self, jobs: List[PrintJob], sequences: Optional[List[int]] = None) -> List[bool]:
+        with self._lock:
+            results = []
+            entries = []
+            batch_ids = set()
+            free_slots = self._capacity - len(self._heap)
+
+            for index, job in enumerate(jobs):
+                accepted = (len(entries) < free_slots and job.job_id not in self._positions
+                            and job.job_id not in batch_ids)
+                if accepted:
+                    batch_ids.add(job.job_id)
+                    sequence = sequences[index] if sequences is not None else next(self._sequence)
+                    self.policy.on_enqueued(job)
+                    entries.append((self._job_key(job, sequence), job))
+                results.append(accepted)
+
+            if len(entries) * 4 > len(self._heap):
+                self._heap.extend(entries)
+                heapq.heapify(self._heap)
+                self._positions = {job.job_id: index for index, (_, job) in enumerate(self._heap)}
+            else:
+                for entry in entries:
+                    self._heap.append(entry)
+                    self._sift_up(len(self._heap) - 1)
+
+            if entries:
+                self._version += 1
+                self._publish_view()
+            self.total_jobs_submitted += len(entries)
+            return results
+
+    def dequeue_job(self) -> Optional[PrintJob]:
+        with self._lock:
+            if self.is_empty():
+                return None
+
+            job = self._remove_at(0)
+            self.total_jobs_printed += 1
+            self.policy.on_dispatched(job)
+            self._publish_view()
+            return job
+
+    def peek_job(self) -> Optional[PrintJob]:
+        with self._lock:
+            if self.is_empty():
+                return None
+            return self._heap[0][1]
+
+    def get_all_jobs(self) -> List[PrintJob]:
+        return [job for _, job in self.sorted_entries()]
+
+    def sorted_entries(self) -> List[Tuple[Tuple[int, float, int], PrintJob]]:
+        with self._lock:
+            entries = list(self._heap)
+        entries.sort(key=itemgetter(0))
+        return entries
+
+    def top_jobs(self, count: int) -> List[PrintJob]:
+        return [job for _, job in self.top_entries(count)]
+
+    def top_entries(self, count: int) -> List[Tuple[Tuple[int, float, int], PrintJob]]:
+        with self._lock:
+            heap = self._heap
+            entries = []
+            frontier = [(heap[0][0], 0)] if heap else []
+            while frontier and len(entries) < count:
+                _, index = heapq.heappop(frontier)
+                entries.append(heap[index])
+                for child in (2 * index + 1, 2 * index + 2):
+                    if child < len(heap):
+                        heapq.heappush(frontier, (heap[child][0], child))
+            return entries
+
+    def view(self) -> QueueView:
+        if not self._publishing:
+            with self._lock:
+                self._publishing = True
+                self._publish_view()
+        return self._view
+
+    def publish_view(self):
+        with self._lock:
+            self._version += 1
+            self._publish_view()
+
+    def _publish_view(self):
+        if self._publishing:
+            entries = sorted(self._heap, key=itemgetter(0))
+            self._view = QueueView(self._version, tuple(job.freeze() for _, job in entries),
+                                   tuple(key for key, _ in entries))
+
+    def peek_entry(self) -> Optional[Tuple[Tuple[int, float, int], PrintJob]]:
+        with self._lock:
+            return self._heap[0] if self._heap else None
+
+    def dequeue_if_head(self, job: PrintJob) -> bool:
+        with self._lock:
+            if not self._heap or self._heap[0][1] is not job:
+                return False
+            self._remove_at(0)
+            self.total_jobs_printed += 1
+            self.policy.on_dispatched(job)
+            self._publish_view()
+            return True
+
+    def remove_job(self, job_id: str) -> bool:
+        entry = self.take_entry(job_id)
+        if entry is None:
+            return False
+        self.policy.on_removed(entry[1])
+        return True
+
+    def take_entry(self, job_id: str) -> Optional[Tuple[Tuple[int, float, int], PrintJob]]:
+        with self._lock:
+            index = self._positions.get(job_id)
+            if index is None:
+                return None
+            entry = self._heap[index]
+            self._remove_at(index)
+            self._publish_view()
+            return entry
+
+    def reposition_job(self, job: PrintJob) -> bool:
+        with self._lock:
+            index = self._positions.get(job.job_id)
+            if index is None:
+                return False
+
+            old_key = self._heap[index][0]
+            self._heap[index] = (self._job_key(job, old_key[-1]), job)
+            if self._sift_up(index) == index:
+                self._sift_down(index)
+            self._version += 1
+            self._publish_view()
+            return True
+
+    def _remove_at(self, index: int) -> PrintJob:
+        job = self._heap[index][1]
+        del self._positions[job.job_id]
+        self._version += 1
+
+        last = self._heap.pop()
+        if index < len(self._heap):
+            self._heap[index] = last
+            if self._sift_up(index) == index:
+                self._sift_down(index)
+        return job
+
+    def _sift_up(self, index: int) -> int:
+        heap = self._heap
+        entry = heap[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            if not entry[0] < heap[parent][0]:
+                break
+            heap[index] = heap[parent]
+            self._positions[heap[index][1].job_id] = index
+            index = parent
+
+        heap[index] = entry
+        self._positions[entry[1].job_id] = index
+        return index
+
+    def _sift_down(self, index: int) -> int:
+        heap = self._heap
+        size = len(heap)
+        entry = heap[index]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1][0] < heap[child][0]:
+                child += 1
+            if not heap[child][0] < entry[0]:
+                break
+            heap[index] = heap[child]
+            self._positions[heap[index][1].job_id] = index
+            index = child
+
+        heap[index] = entry
+        self._positions[entry[1].job_id] = index
+        return index
+
+
+class ShardedQueue:
+    PARTITIONS = ("user", "priority")
+
+    def __init__(self, capacity: int = 100, shards: int = 4, partition: str = "user",
+                 strict: bool = True, priority_band_width: int = 1,
+                 policy: Union[str, SchedulingPolicy, None] = None):
+        if partition not in self.PARTITIONS:
+            raise ValueError(f"Unknown partition '{partition}', expected one of {self.PARTITIONS}")
+
+        self._capacity = capacity
+        self._sequence = itertools.count()
+        self.policy = create_policy(policy)
+        self._shards = [HeapPriorityQueue(capacity, self._sequence, self.policy) for _ in range(max(1, shards))]
+        self._shard_of: Dict[str, int] = {}
+        self._shard_of_lock = threading.Lock()
+        self._size = 0
+        self._size_lock = threading.Lock()
+        self._view = QueueView(0)
+        self._publishing = False
+        self._publish_lock = threading.Lock()
+        self.partition = partition
+        self.strict = strict
+        self.priority_band_width = max(1, priority_band_width)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._shard_of
+
+    @property
+    def total_jobs_submitted(self) -> int:
+        return sum(shard.total_jobs_submitted for shard in self._shards)
+
+    @property
+    def total_jobs_printed(self) -> int:
+        return sum(shard.total_jobs_printed for shard in self._shards)
+
+    def is_empty(self) -> bool:
+        return self._size == 0
+
+    def is_full(self) -> bool:
+        return self._size >= self._capacity
+
+    def _shard_index(self, job: PrintJob) -> int:
+        if self.partition == "priority":
+            band = max(job.priority - 1, 0) // self.priority_band_width
+            return min(band, len(self._shards) - 1)
+        return zlib.crc32(str(job.user_id).encode()) % len(self._shards)
+
+    def _reserve(self, count: int) -> int:
+        with self._size_lock:
+            granted = max(0, min(count, self._capacity - self._size))
+            self._size += granted
+            return granted
+
+    def _release(self, count: int):
+        if count:
+            with self._size_lock:
+                self._size -= count
+
+    def _claim(self, job_id: str, shard_index: int) -> bool:
+        with self._shard_of_lock:
+            if job_id in self._shard_of:
+                return False
+            self._shard_of[job_id] = shard_index
+            return True
+
+    def _unclaim(self, job_ids: Iterable[str]):
+        with self._shard_of_lock:
+            for job_id in job_ids:
+                self._shard_of.pop(job_id, None)
+
+    def enqueue_job(self, job: PrintJob) -> bool:
+        shard_index = self._shard_index(job)
+        if not self._claim(job.job_id, shard_index):
+            return False
+        if not self._reserve(1):
+            self._unclaim((job.job_id,))
+            return False
+
+        if not self._shards[shard_index].enqueue_job(job):
+            self._unclaim((job.job_id,))
+            self._release(1)
+            return False
+        self._publish_view()
+        return True
+
+    def enqueue_many(self, jobs: List[PrintJob]) -> List[bool]:
+        results = [False] * len(jobs)
+        candidates = []
+        shard_indices: Dict[int, int] = {}
+        with self._shard_of_lock:
+            for index, job in enumerate(jobs):
+                if job.job_id not in self._shard_of:
+                    shard_indices[index] = self._shard_of[job.job_id] = self._shard_index(job)
+                    candidates.append(index)
+
+        granted = self._reserve(len(candidates))
+        self._unclaim(jobs[index].job_id for index in candidates[granted:])
+        groups: Dict[int, List[int]] = defaultdict(list)
+        sequences: Dict[int, int] = {}
+        for index in candidates[:granted]:
+            groups[shard_indices[index]].append(index)
+            sequences[index] = next(self._sequence)
+
+        rejected = []
+        for shard_index, indices in groups.items():
+            accepted = self._shards[shard_index].enqueue_many(
+                [jobs[index] for index in indices], [sequences[index] for index in indices]
+            )
+            for index, success in zip(indices, accepted):
+                if success:
+                    results[index] = True
+                else:
+                    rejected.append(jobs[index].job_id)
+
+        self._unclaim(rejected)
+        self._release(len(rejected))
+        if groups:
+            self._publish_view()
+        return results
+
+    def dequeue_job(self) -> Optional[PrintJob]:
+        while True:
+            shard, job = self._select_shard()
+            if shard is None:
+                return None
+            if shard.dequeue_if_head(job):
+                self._unclaim((job.job_id,))
+                self._release(1)
+                self._publish_view()
+                return job
+
+    def _select_shard(self) -> Tuple[Optional[HeapPriorityQueue], Optional[PrintJob]]:
+        if not self.strict and len(self._shards) > 2:
+            shard, job = self._select_from(random.sample(self._shards, 2))
+            if shard is not None:
+                return shard, job
+        return self._select_from(self._shards)
+
+    @staticmethod
+    def _select_from(shards: List[HeapPriorityQueue]) -> Tuple[Optional[HeapPriorityQueue], Optional[PrintJob]]:
+        best_shard, best_entry = None, None
+        for shard in shards:
+            entry = shard.peek_entry()
+            if entry is not None and (best_entry is None or entry[0] < best_entry[0]):
+                best_shard, best_entry = shard, entry
+        return best_shard, best_entry[1] if best_entry is not None else None
+
+    def peek_job(self) -> Optional[PrintJob]:
+        return self._select_from(self._shards)[1]
+
+    def get_all_jobs(self) -> List[PrintJob]:
+        merged = heapq.merge(*(shard.sorted_entries() for shard in self._shards), key=itemgetter(0))
+        return [job for _, job in merged]
+
+    def top_jobs(self, count: int) -> List[PrintJob]:
+        merged = heapq.merge(*(shard.top_entries(count) for shard in self._shards), key=itemgetter(0))
+        return [job for _, job in itertools.islice(merged, count)]
+
+    def view(self) -> QueueView:
+        if not self._publishing:
+            with self._publish_lock:
+                for shard in self._shards:
+                    shard.view()
+                self._publishing = True
+            self._publish_view()
+        return self._view
+
+    def publish_view(self):
+        for shard in self._shards:
+            shard.publish_view()
+        self._publish_view()
+
+    def _publish_view(self):
+        if not self._publishing:
+            return
+
+        with self._publish_lock:
+            shard_views = [shard.view() for shard in self._shards]
+            version = sum(shard_view.version for shard_view in shard_views)
+            merged = list(heapq.merge(*(zip(shard_view.keys, shard_view.jobs) for shard_view in shard_views),
+                                      key=itemgetter(0)))
+            keys, jobs = zip(*merged) if merged else ((), ())
+            self._view = QueueView(version, jobs, keys)
+
+    def remove_job(self, job_id: str) -> bool:
+        shard_index = self._shard_of.get(job_id)
+        if shard_index is None or not self._shards[shard_index].remove_job(job_id):
+            return False
+
+        self._unclaim((job_id,))
+        self._release(1)
+        self._publish_view()
+        return True
+
+    def reposition_job(self, job: PrintJob) -> bool:
+        if not self._move_job(job):
+            return False
+        self._publish_view()
+        return True
+
+    def _move_job(self, job: PrintJob) -> bool:
+        with self._shard_of_lock:
+            shard_index = self._shard_of.get(job.job_id)
+            if shard_index is None:
+                return False
+
+            new_index = self._shard_index(job)
+            if new_index == shard_index:
+                return self._shards[shard_index].reposition_job(job)
+
+            entry = self._shards[shard_index].take_entry(job.job_id)
+            if entry is None:
+                return False
+            self._shards[new_index].enqueue_many([job], [entry[0][-1]])
+            self._shard_of[job.job_id] = new_index
+            return True
+
+
+@dataclass
+class UserShareStats:
+    submitted: int = 0
+    rejected: int = 0
+    dispatched: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.dispatched if self.dispatched else 0.0
+
+
+class FairShareQueue:
+    def __init__(self, capacity: int = 100, weights: Optional[Dict[str, float]] = None,
+                 default_weight: float = 1.0, quotas: Optional[Dict[str, int]] = None,
+                 default_quota: Optional[int] = None, priority_first: bool = True,
+                 policy: Union[str, SchedulingPolicy, None] = None):
+        self._capacity = capacity
+        self.policy = create_policy(policy)
+        self._sequence = itertools.count()
+        self._users: Dict[str, HeapPriorityQueue] = {}
+        self._user_of: Dict[str, str] = {}
+        self.clock = FairShareClock(weights, default_weight)
+        self._user_keys: Dict[str, Tuple] = {}
+        self._user_heap: List[Tuple[Tuple, str]] = []
+        self._size = 0
+        self._lock = threading.RLock()
+        self._version = 0
+        self._view = QueueView(0)
+        self._publishing = False
+        self.quotas = dict(quotas or {})
+        self.default_quota = default_quota
+        self.priority_first = priority_first
+        self.user_stats: Dict[str, UserShareStats] = defaultdict(UserShareStats)
+        self.total_jobs_submitted = 0
+        self.total_jobs_printed = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._user_of
+
+    def is_empty(self) -> bool:
+        return self._size == 0
+
+    def is_full(self) -> bool:
+        return self._size >= self._capacity
+
+    @property
+    def virtual_time(self) -> float:
+        return self.clock.virtual_time
+
+    def weight_of(self, user_id: str) -> float:
+        return self.clock.weight_of(user_id)
+
+    def quota_of(self, user_id: str) -> Optional[int]:
+        return self.quotas.get(user_id, self.default_quota)
+
+    def set_weight(self, user_id: str, weight: float):
+        self.clock.set_weight(user_id, weight)
+
+    def set_quota(self, user_id: str, quota: Optional[int]):
+        self.quotas[user_id] = quota
+
+    def pending_jobs(self, user_id: str) -> int:
+        user_queue = self._users.get(user_id)
+        return len(user_queue) if user_queue is not None else 0
+
+    def enqueue_job(self, job: PrintJob) -> bool:
+        with self._lock:
+            if not self._enqueue(job):
+                return False
+            self._publish_view()
+            return True
+
+    def enqueue_many(self, jobs: List[PrintJob]) -> List[bool]:
+        with self._lock:
+            results = [self._enqueue(job) for job in jobs]
+            if any(results):
+                self._publish_view()
+            return results
+
+    def _enqueue(self, job: PrintJob) -> bool:
+        if self.is_full() or job.job_id in self._user_of:
             return False
 
+        user_id = job.user_id
+        quota = self.quota_of(user_id)
+        if quota is not None and self.pending_jobs(user_id) >= quota:
+            self.user_stats[user_id].rejected += 1
+            return False
+
+        user_queue = self._users.get(user_id)
+        if user_queue is None:
+            user_queue = self._users[user_id] = HeapPriorityQueue(self._capacity, self._sequence, self.policy)
+        if user_queue.is_empty():
+            self.clock.activate(user_id)
+
+        user_queue.enqueue_job(job)
+        self._user_of[job.job_id] = user_id
+        self._size += 1
+        self._version += 1
+        self.total_jobs_submitted += 1
+        self.user_stats[user_id].submitted += 1
+        self._refresh_user(user_id)
+        return True
+
+    def dequeue_job(self) -> Optional[PrintJob]:
+        with self._lock:
+            user_id = self._next_user()
+            if user_id is None:
+                return None
+
+            job = self._users[user_id].dequeue_job()
+            del self._user_of[job.job_id]
+            pass_value = self.clock.tags[user_id]
+            self.clock.advance(pass_value)
+            self.clock.charge(user_id, pass_value)
+            self._size -= 1
+            self._version += 1
+            self.total_jobs_printed += 1
+            self.user_stats[user_id].dispatched += 1
+            self._refresh_user(user_id)
+            self._publish_view()
+            return job
+
+    def peek_job(self) -> Optional[PrintJob]:
+        with self._lock:
+            user_id = self._next_user()
+            return self._users[user_id].peek_job() if user_id is not None else None
+
+    def get_all_jobs(self) -> List[PrintJob]:
+        return self._dispatch_order()
+
+    def top_jobs(self, count: int) -> List[PrintJob]:
+        return self._dispatch_order(count)
+
+    def view(self) -> QueueView:
+        if not self._publishing:
+            with self._lock:
+                self._publishing = True
+                self._publish_view()
+        return self._view
+
+    def publish_view(self):
+        with self._lock:
+            self._version += 1
+            self._publish_view()
+
+    def _publish_view(self):
+        if self._publishing:
+            self._view = QueueView(self._version, tuple(job.freeze() for job in self._dispatch_order()))
+
+    def remove_job(self, job_id: str) -> bool:
+        with self._lock:
+            user_id = self._user_of.get(job_id)
+            if user_id is None or not self._users[user_id].remove_job(job_id):
+                return False
+
+            del self._user_of[job_id]
+            self._size -= 1
+            self._version += 1
+            self._refresh_user(user_id)
+            self._publish_view()
+            return True
+
+    def reposition_job(self, job: PrintJob) -> bool:
+        with self._lock:
+            user_id = self._user_of.get(job.job_id)
+            if user_id is None or not self._users[user_id].reposition_job(job):
+                return False
+
+            self._version += 1
+            self._refresh_user(user_id)
+            self._publish_view()
+            return True
+
+    def record_wait(self, job: PrintJob):
+        stats = self.user_stats[job.user_id]
+        stats.total_wait += job.waiting_time
+        stats.max_wait = max(stats.max_wait, job.waiting_time)
+
+    def share_report(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                user_id: {
+                    'weight': self.weight_of(user_id),
+                    'quota': self.quota_of(user_id),
+                    'pending': self.pending_jobs(user_id),
+                    'pass': self.clock.tags.get(user_id, 0.0),
+                    'submitted': stats.submitted,
+                    'rejected': stats.rejected,
+                    'dispatched': stats.dispatched,
+                    'mean_wait': stats.mean_wait,
+                    'max_wait': stats.max_wait
+                }
+                for user_id, stats in self.user_stats.items()
+            }
+
+    def _user_key(self, pass_value: float, head_key: Tuple[int, float, int]) -> Tuple:
+        return (head_key[0] if self.priority_first else 0, pass_value, head_key)
+
+    def _refresh_user(self, user_id: str):
+        entry = self._users[user_id].peek_entry()
+        if entry is None:
+            self._user_keys.pop(user_id, None)
+            return
+
+        key = self._user_key(self.clock.tags[user_id], entry[0])
+        if self._user_keys.get(user_id) != key:
+            self._user_keys[user_id] = key
+            heapq.heappush(self._user_heap, (key, user_id))
+            if len(self._user_heap) > 2 * len(self._user_keys) + 64:
+                self._user_heap = [(key, user_id) for user_id, key in self._user_keys.items()]
+                heapq.heapify(self._user_heap)
+
+    def _next_user(self) -> Optional[str]:
+        user_heap = self._user_heap
+        while user_heap:
+            key, user_id = user_heap[0]
+            if self._user_keys.get(user_id) == key:
+                return user_id
+            heapq.heappop(user_heap)
+        return None
+
+    def _dispatch_order(self, limit: Optional[int] = None) -> List[PrintJob]:
+        with self._lock:
+            user_entries = {
+                user_id: self._users[user_id].top_entries(limit) if limit is not None
+                else list(self._users[user_id]._heap)
+                for user_id in self._user_keys
+            }
+            passes = dict(self.clock.tags)
+        if limit is None:
+            for entries in user_entries.values():
+                entries.sort(key=itemgetter(0))
+
+        order: List[PrintJob] = []
+        frontier = [(self._user_key(passes[user_id], entries[0][0]), user_id, 0)
+                    for user_id, entries in user_entries.items()]
+        heapq.heapify(frontier)
+        while frontier and (limit is None or len(order) < limit):
+            _, user_id, index = heapq.heappop(frontier)
+            entries = user_entries[user_id]
+            order.append(entries[index][1])
+            passes[user_id] += 1.0 / self.weight_of(user_id)
+            if index + 1 < len(entries):
+                heapq.heappush(frontier, (self._user_key(passes[user_id], entries[index + 1][0]),
+                                          user_id, index + 1))
+        return order
+
+
+PrintQueue = Union[CircularQueue, HeapPriorityQueue, ShardedQueue, FairShareQueue]
+
+QUEUE_ENGINES = {
+    "circular": CircularQueue,
+    "heap": HeapPriorityQueue,
+    "sharded": ShardedQueue,
+    "fairshare": FairShareQueue
+}
+
+
+def create_queue(engine: str = "circular", capacity: int = 100, **engine_options: Any) -> PrintQueue:
+    if engine not in QUEUE_ENGINES:
+        raise ValueError(f"Unknown queue engine '{engine}', expected one of {sorted(QUEUE_ENGINES)}")
+    return QUEUE_ENGINES[engine](capacity, **engine_options)
+
+
+class JobRegistry:
+    """Index of jobs by ID.
+
+    Finished jobs (completed, expired, cancelled) are retained for lookups up to
+    ``max_finished_jobs``, oldest evicted first. The default is bounded at
+    DEFAULT_MAX_FINISHED_JOBS; pass ``None`` to keep every finished job.
+    """
+
+    ACTIVE_STATUSES = (JobStatus.PENDING, JobStatus.PRINTING)
+    DEFAULT_MAX_FINISHED_JOBS = 10000
+
+    def __init__(self, max_finished_jobs: Optional[int] = DEFAULT_MAX_FINISHED_JOBS):
+        self.max_finished_jobs = max_finished_jobs
+        self._jobs: Dict[str, PrintJob] = {}
+        self._finished: Deque[PrintJob] = deque()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._jobs
+
+    def get(self, job_id: str) -> Optional[PrintJob]:
+        return self._jobs.get(job_id)
+
+    def is_active(self, job_id: str) -> bool:
+        job = self._jobs.get(job_id)
+        return job is not None and job.status in self.ACTIVE_STATUSES
+
+    def register(self, job: PrintJob) -> bool:
+        with self._lock:
+            if self.is_active(job.job_id):
+                return False
+            self._jobs[job.job_id] = job
+            return True
+
+    def register_many(self, jobs: Iterable[PrintJob]):
+        with self._lock:
+            for job in jobs:
+                if not self.is_active(job.job_id):
+                    self._jobs[job.job_id] = job
+
+    def set_status(self, job: PrintJob, status: JobStatus):
+        with self._lock:
+            job.status = status
+            if status not in self.ACTIVE_STATUSES:
+                self._finished.append(job)
+                self._apply_retention()
+
+    def _apply_retention(self):
+        if self.max_finished_jobs is None:
+            return
+
+        while len(self._finished) > self.max_finished_jobs:
+            job = self._finished.popleft()
+            if self._jobs.get(job.job_id) is job:
+                del self._jobs[job.job_id]
+
 
 class PriorityAgingSystem:
-    def __init__(self, aging_interval: float = 5.0, aging_increment: int = 1):
+    def __init__(self, aging_interval: float = 5.0, aging_increment: int = 1,
+                 incremental: bool = False):
         self.aging_interval = aging_interval
         self.aging_increment = aging_increment
+        self.incremental = incremental
+        self._aging_deadlines: List[Tuple[float, int, PrintJob]] = []
+        self._deadline_sequence = itertools.count()
+
+    def track_job(self, job: PrintJob):
+        if self.incremental:
+            deadline = job.last_aged + self.aging_interval
+            heapq.heappush(self._aging_deadlines, (deadline, next(self._deadline_sequence), job))
+
+    def track_jobs(self, jobs: List[PrintJob]):
+        if self.incremental:
+            interval, sequence = self.aging_interval, self._deadline_sequence
+            self._aging_deadlines.extend((job.last_aged + interval, next(sequence), job) for job in jobs)
+            heapq.heapify(self._aging_deadlines)
+
+    def next_aging_time(self) -> Optional[float]:
+        deadlines = self._aging_deadlines
+        while deadlines:
+            deadline, _, job = deadlines[0]
+            if job.status == JobStatus.PENDING and deadline == job.last_aged + self.aging_interval:
+                return deadline
+            heapq.heappop(deadlines)
+        return None
+
+    def apply_priority_aging(self, queue: PrintQueue, current_time: float,
+                             on_aged: Optional[Callable[[PrintJob], None]] = None) -> int:
+        if self.incremental:
+            return self._apply_due_aging(queue, current_time, on_aged)
 
-    def apply_priority_aging(self, queue: CircularQueue, current_time: float) -> int:
         aged_count = 0
         jobs_to_reorder = []
 
@@ -165,80 +1321,265 @@ class PriorityAgingSystem:
                     jobs_to_reorder.append(job)
 
         if jobs_to_reorder:
+            self.reposition_jobs(queue, jobs_to_reorder)
+            if on_aged is not None:
+                for job in jobs_to_reorder:
+                    on_aged(job)
+
+        return aged_count
+
+    def reposition_jobs(self, queue: PrintQueue, jobs: List[PrintJob]):
+        if isinstance(queue, CircularQueue):
             self._reorder_queue(queue)
+        else:
+            for job in jobs:
+                queue.reposition_job(job)
+
+    def _apply_due_aging(self, queue: PrintQueue, current_time: float,
+                         on_aged: Optional[Callable[[PrintJob], None]] = None) -> int:
+        aged_count = 0
+        aged_jobs = []
+
+        while self._aging_deadlines and self._aging_deadlines[0][0] <= current_time:
+            deadline, _, job = heapq.heappop(self._aging_deadlines)
+            if job.status != JobStatus.PENDING or deadline != job.last_aged + self.aging_interval:
+                continue
+
+            if job.apply_aging(current_time, self.aging_increment) and queue.reposition_job(job):
+                aged_count += 1
+                aged_jobs.append(job)
+
+        for job in aged_jobs:
+            self.track_job(job)
+            if on_aged is not None:
+                on_aged(job)
 
         return aged_count
 
     @staticmethod
     def _reorder_queue(queue: CircularQueue):
-        all_jobs = queue.get_all_jobs()
-        queue._size = 0
-        queue._front = 0
-
-        for job in all_jobs:
-            queue.enqueue_job(job)
+        queue.resort()
 
 
 class JobExpiryHandler:
-    def __init__(self, default_expiry: float = 30.0):
-        self.default_expiry = default_expiry
-        self.expired_jobs: List[PrintJob] = []
+    """Removes jobs from the queue once they outlive their expiry time.
 
-    def remove_expired_jobs(self, queue: CircularQueue, current_time: float) -> int:
-        expired_count = 0
-        expired_job_ids = []
+    Expired jobs are kept in ``expired_jobs`` up to ``max_expired_records``,
+    oldest evicted first. The default is bounded at DEFAULT_MAX_EXPIRED_RECORDS;
+    pass ``None`` to keep every expired job.
+    """
 
-        for job in queue.get_all_jobs():
-            if job.is_expired(current_time):
-                expired_job_ids.append(job.job_id)
+    DEFAULT_MAX_EXPIRED_RECORDS = 10000
 
-        for job_id in expired_job_ids:
-            if queue.remove_job(job_id):
-                for job in queue.get_all_jobs() + self.expired_jobs:
-                    if job.job_id == job_id:
-                        job.status = JobStatus.EXPIRED
-                        self.expired_jobs.append(job)
-                        break
+    def __init__(self, default_expiry: float = 30.0, indexed: bool = False,
+                 max_expired_records: Optional[int] = DEFAULT_MAX_EXPIRED_RECORDS):
+        self.default_expiry = default_expiry
+        self.indexed = indexed
+        self.expired_jobs: Deque[PrintJob] = deque(maxlen=max_expired_records)
+        self._expiry_deadlines: List[Tuple[float, int, PrintJob]] = []
+        self._deadline_sequence = itertools.count()
+
+    def track_job(self, job: PrintJob):
+        if self.indexed:
+            deadline = job.submission_time + job.expiry_time
+            heapq.heappush(self._expiry_deadlines, (deadline, next(self._deadline_sequence), job))
+
+    def track_jobs(self, jobs: List[PrintJob]):
+        if self.indexed:
+            sequence = self._deadline_sequence
+            self._expiry_deadlines.extend(
+                (job.submission_time + job.expiry_time, next(sequence), job) for job in jobs
+            )
+            heapq.heapify(self._expiry_deadlines)
+
+    def next_expiry_time(self) -> Optional[float]:
+        deadlines = self._expiry_deadlines
+        while deadlines:
+            if deadlines[0][2].status == JobStatus.PENDING:
+                return deadlines[0][0]
+            heapq.heappop(deadlines)
+        return None
+
+    def remove_expired_jobs(self, queue: PrintQueue, current_time: float,
+                            on_expired: Optional[Callable[[PrintJob], None]] = None) -> int:
+        if self.indexed:
+            expired_candidates = self._pop_due_jobs(current_time)
+        else:
+            expired_candidates = [job for job in queue.get_all_jobs() if job.is_expired(current_time)]
 
+        return self.expire_jobs(queue, expired_candidates, on_expired)
+
+    def expire_jobs(self, queue: PrintQueue, jobs: Iterable[PrintJob],
+                    on_expired: Optional[Callable[[PrintJob], None]] = None) -> int:
+        expired_count = 0
+        for job in jobs:
+            if queue.remove_job(job.job_id):
+                job.status = JobStatus.EXPIRED
+                self.expired_jobs.append(job)
                 expired_count += 1
+                if on_expired is not None:
+                    on_expired(job)
 
         return expired_count
 
+    def _pop_due_jobs(self, current_time: float) -> List[PrintJob]:
+        due_jobs = []
+        while self._expiry_deadlines and self._expiry_deadlines[0][0] <= current_time:
+            _, _, job = heapq.heappop(self._expiry_deadlines)
+            if job.status == JobStatus.PENDING:
+                due_jobs.append(job)
+        return due_jobs
+
+
+class BatchTickEngine:
+    def __init__(self, aging_interval: float = 5.0, aging_increment: int = 1):
+        self.aging_interval = aging_interval
+        self.aging_increment = aging_increment
+        self.table = JobTable()
+        self._jobs: List[Optional[PrintJob]] = []
+        self._oldest_aged = JobTable.IDLE
+        self._next_expiry = JobTable.IDLE
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def track_job(self, job: PrintJob):
+        row = self.table.add_job(job)
+        if row == len(self._jobs):
+            self._jobs.append(job)
+        else:
+            self._jobs[row] = job
+        self._oldest_aged = min(self._oldest_aged, self.table.last_aged[row])
+        self._next_expiry = min(self._next_expiry, job.submission_time + job.expiry_time)
+
+    def untrack_job(self, job: PrintJob):
+        row = self.table.row_of(job.job_id)
+        if row is not None and self._jobs[row] is job:
+            self.table.release(job.job_id)
+            self._jobs[row] = None
+
+    def tick(self, current_time: float) -> Tuple[List[PrintJob], List[PrintJob]]:
+        if not self._may_be_due(current_time):
+            return [], []
+        if np is not None:
+            aged_rows, expired_rows = self._scan_vectorized(current_time)
+        else:
+            aged_rows, expired_rows = self._scan_rows(current_time)
+
+        priority = self.table.priority
+        jobs = self._jobs
+        aged_jobs = []
+        for row in aged_rows:
+            job = jobs[row]
+            job.priority = priority[row]
+            job.last_aged = current_time
+            job.update_waiting_time(current_time)
+            aged_jobs.append(job)
+
+        expired_jobs = []
+        for row in expired_rows:
+            job = jobs[row]
+            job.update_waiting_time(current_time)
+            expired_jobs.append(job)
+
+        return aged_jobs, expired_jobs
+
+    def _may_be_due(self, current_time: float) -> bool:
+        if current_time - self._oldest_aged >= self.aging_interval:
+            return True
+        # deadlines are summed here but compared as differences in the scan; leave room for rounding
+        next_expiry = self._next_expiry
+        return current_time >= next_expiry - (abs(next_expiry) * 1e-12 + 1e-9)
+
+    def _scan_vectorized(self, current_time: float) -> Tuple[List[int], List[int]]:
+        table = self.table
+        if not table.row_count:
+            return [], []
+
+        priority = np.frombuffer(table.priority, dtype=np.int32)
+        submission_time = np.frombuffer(table.submission_time, dtype=np.float64)
+        last_aged = np.frombuffer(table.last_aged, dtype=np.float64)
+        expiry_time = np.frombuffer(table.expiry_time, dtype=np.float64)
+
+        aging_rows = np.flatnonzero(current_time - last_aged >= self.aging_interval)
+        priority[aging_rows] -= self.aging_increment
+        last_aged[aging_rows] = np.where(priority[aging_rows] > 1, current_time, JobTable.IDLE)
+
+        expired_rows = np.flatnonzero(current_time - submission_time >= expiry_time)
+        self._oldest_aged = float(last_aged.min())
+        self._next_expiry = float((submission_time + expiry_time).min())
+        return aging_rows.tolist(), expired_rows.tolist()
+
+    def _scan_rows(self, current_time: float) -> Tuple[List[int], List[int]]:
+        table = self.table
+        rows = range(table.row_count)
+        priority = table.priority
+        last_aged = table.last_aged
+
+        aging_rows = list(itertools.compress(rows, map(
+            operator.ge, map(operator.sub, itertools.repeat(current_time), last_aged),
+            itertools.repeat(self.aging_interval)
+        )))
+        for row in aging_rows:
+            priority[row] -= self.aging_increment
+            last_aged[row] = current_time if priority[row] > 1 else JobTable.IDLE
+
+        expired_rows = list(itertools.compress(rows, map(
+            operator.ge, map(operator.sub, itertools.repeat(current_time), table.submission_time),
+            table.expiry_time
+        )))
+        self._oldest_aged = min(last_aged, default=JobTable.IDLE)
+        self._next_expiry = min(map(operator.add, table.submission_time, table.expiry_time), default=JobTable.IDLE)
+        return aging_rows, expired_rows
+
 
 class ConcurrentSubmissionHandler:
-    def __init__(self):
+    def __init__(self, max_workers: Optional[int] = None):
         self.submission_lock = threading.Lock()
+        self.max_workers = max_workers
 
-    def handle_simultaneous_submissions(self, queue: CircularQueue,
-                                        job_specs: List[Tuple[str, str, int, str]]) -> Dict[str, bool]:
-        results: Dict[str, bool] = {}
-        threads = []
-
-        def submit_job(user_id: str, job_id: str, priority: int, content: str):
-            with self.submission_lock:
-                job = PrintJob(
-                    user_id=user_id,
-                    job_id=job_id,
-                    priority=priority,
-                    content=content
-                )
-                success = queue.enqueue_job(job)
-                results[job_id] = success
-
-        for user_id, job_id, priority, content in job_specs:
-            thread = threading.Thread(
-                target=submit_job,
-                args=(user_id, job_id, priority, content),
-                name=f"SubmissionThread-{job_id}"
-            )
-            threads.append(thread)
-            thread.start()
+    def handle_simultaneous_submissions(self, queue: PrintQueue,
+                                        job_specs: List[Tuple[str, str, int, str]],
+                                        on_submitted: Optional[Callable[[PrintJob], None]] = None,
+                                        current_time: Optional[float] = None) -> Dict[str, bool]:
+        jobs = self._build_jobs(job_specs, current_time)
+
+        with self.submission_lock:
+            accepted = queue.enqueue_many(jobs)
 
-        for thread in threads:
-            thread.join()
+        results: Dict[str, bool] = {}
+        for job, success in zip(jobs, accepted):
+            results[job.job_id] = success
+            if success and on_submitted is not None:
+                on_submitted(job)
 
         return results
 
+    def _build_jobs(self, job_specs: List[Tuple[str, str, int, str]],
+                    current_time: Optional[float] = None) -> List[PrintJob]:
+        build_job = partial(self._build_job, current_time=current_time)
+        if self.max_workers is None or len(job_specs) <= 1:
+            return [build_job(spec) for spec in job_specs]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix="SubmissionWorker") as pool:
+            return list(pool.map(build_job, job_specs))
+
+    @staticmethod
+    def _build_job(job_spec: Tuple[str, str, int, str], current_time: Optional[float] = None) -> PrintJob:
+        user_id, job_id, priority, content = job_spec
+        if current_time is None:
+            return PrintJob(user_id=user_id, job_id=job_id, priority=priority, content=content)
+
+        return PrintJob(
+            user_id=user_id,
+            job_id=job_id,
+            priority=priority,
+            content=content,
+            submission_time=current_time,
+            last_aged=current_time
+        )
+
 
 class TimeManager:
     def __init__(self):
@@ -250,24 +1591,32 @@ class TimeManager:
             self.current_time += time_increment
             return self.current_time
 
-    def update_waiting_times(self, queue: CircularQueue):
+    def advance_to(self, timestamp: float) -> float:
+        with self.time_lock:
+            self.current_time = max(self.current_time, timestamp)
+            return self.current_time
+
+    def update_waiting_times(self, queue: PrintQueue):
         with self.time_lock:
             for job in queue.get_all_jobs():
                 job.update_waiting_time(self.current_time)
+        queue.publish_view()
 
 
 class QueueVisualizer:
     @staticmethod
-    def show_status(queue: CircularQueue, current_time: float, stats: Dict[str, int]):
+    def show_status(queue: PrintQueue, current_time: float, stats: Dict[str, int],
+                    top_k: Optional[int] = None):
         print(f"\n{'=' * 60}")
         print(f"PRINT QUEUE STATUS - Time: {current_time:.1f}s")
         print(f"{'=' * 60}")
 
-        jobs = queue.get_all_jobs()
+        jobs = queue.view().jobs if top_k is None else queue.top_jobs(top_k)
+        queue_size = len(jobs) if top_k is None else len(queue)
         if not jobs:
             print("Queue is EMPTY")
         else:
-            print(f"Queue Size: {len(jobs)}/{queue._capacity}")
+            print(f"Queue Size: {queue_size}/{queue._capacity}")
             print(f"{'Rank':<4} {'User-Job':<15} {'Priority':<8} {'Waiting':<8} {'Expires In':<10}")
             print("-" * 60)
 
@@ -275,152 +1624,466 @@ class QueueVisualizer:
                 expires_in = max(0, job.expiry_time - job.waiting_time)
                 print(f"{i:<4} {job.user_id}-{job.job_id:<15} "
                       f"{job.priority:<8} {job.waiting_time:.1f}s{'':<3} {expires_in:.1f}s")
+            if queue_size > len(jobs):
+                print(f"... and {queue_size - len(jobs)} more jobs")
 
         print(f"\nSTATISTICS:")
         print(f"  Submitted: {stats['total_submitted']}")
         print(f"  Printed: {stats['total_printed']}")
         print(f"  Expired: {stats['total_expired']}")
+        print(f"  Cancelled: {stats['total_cancelled']}")
         print(f"  Jobs Aged: {stats['jobs_aged']}")
         print(f"  Simultaneous Submissions: {stats['simultaneous_submissions']}")
         print(f"{'=' * 60}\n")
 
     @staticmethod
-    def get_job_info(queue: CircularQueue, job_id: str,
-                     completed_jobs: List[PrintJob], expired_jobs: List[PrintJob]) -> Optional[Dict[str, Any]]:
-        for job in queue.get_all_jobs():
-            if job.job_id == job_id:
-                return {
-                    'id': job.job_id,
-                    'user_id': job.user_id,
-                    'status': job.status.value,
-                    'current_priority': job.priority,
-                    'original_priority': job.original_priority,
-                    'content': job.content,
-                    'submission_time': job.submission_time,
-                    'waiting_time': job.waiting_time,
-                    'expires_in': max(0, job.expiry_time - job.waiting_time),
-                    'times_aged': job.original_priority - job.priority
-                }
-
-        for job in completed_jobs:
-            if job.job_id == job_id:
-                return {
-                    'id': job.job_id,
-                    'user_id': job.user_id,
-                    'status': job.status.value,
-                    'final_priority': job.priority,
-                    'original_priority': job.original_priority,
-                    'content': job.content,
-                    'total_waiting_time': job.waiting_time
-                }
+    def snapshot(queue: PrintQueue, current_time: float, stats: Dict[str, int],
+                 top_k: int = 20, version: int = 0) -> QueueSnapshot:
+        rows = tuple(
+            SnapshotRow(job.job_id, job.user_id, job.priority, job.submission_time,
+                        job.submission_time + job.expiry_time)
+            for job in queue.top_jobs(top_k)
+        )
+        return QueueSnapshot(version, current_time, len(queue), queue._capacity, rows, dict(stats))
 
-        for job in expired_jobs:
-            if job.job_id == job_id:
-                return {
-                    'id': job.job_id,
-                    'user_id': job.user_id,
-                    'status': job.status.value,
-                    'reason': 'Expired due to timeout'
-                }
+    @staticmethod
+    def get_job_info(queue: PrintQueue, job_id: str,
+                     completed_jobs: Iterable[PrintJob], expired_jobs: Iterable[PrintJob]) -> Optional[Dict[str, Any]]:
+        for jobs in (queue.view(), completed_jobs, expired_jobs):
+            for job in jobs:
+                if job.job_id == job_id:
+                    return QueueVisualizer.describe_job(job)
 
         return None
 
+    @staticmethod
+    def describe_job(job: PrintJob) -> Dict[str, Any]:
+        if job.status == JobStatus.COMPLETED:
+            return {
+                'id': job.job_id,
+                'user_id': job.user_id,
+                'status': job.status.value,
+                'final_priority': job.priority,
+                'original_priority': job.original_priority,
+                'content': job.content,
+                'total_waiting_time': job.waiting_time
+            }
+
+        if job.status == JobStatus.EXPIRED:
+            return {
+                'id': job.job_id,
+                'user_id': job.user_id,
+                'status': job.status.value,
+                'reason': 'Expired due to timeout'
+            }
+
+        if job.status == JobStatus.CANCELLED:
+            return {
+                'id': job.job_id,
+                'user_id': job.user_id,
+                'status': job.status.value,
+                'reason': 'Cancelled before printing'
+            }
+
+        return {
+            'id': job.job_id,
+            'user_id': job.user_id,
+            'status': job.status.value,
+            'current_priority': job.priority,
+            'original_priority': job.original_priority,
+            'content': job.content,
+            'submission_time': job.submission_time,
+            'waiting_time': job.waiting_time,
+            'expires_in': max(0, job.expiry_time - job.waiting_time),
+            'times_aged': job.original_priority - job.priority
+        }
+
+
+def _journaled(method: Callable) -> Callable:
+    @wraps(method)
+    def wrapper(self: "PrintQueueManager", *args: Any, **kwargs: Any) -> Any:
+        journal = self.journal
+        if journal is None:
+            return method(self, *args, **kwargs)
+        with self._state_lock:
+            result = method(self, *args, **kwargs)
+            journal.maybe_checkpoint(self)
+        return result
+    return wrapper
+
 
 class PrintQueueManager:
     def __init__(self, capacity: int = 100, aging_interval: float = 5.0,
-                 aging_increment: int = 1, default_expiry: float = 30.0):
-        self.queue = CircularQueue(capacity)
-        self.priority_system = PriorityAgingSystem(aging_interval, aging_increment)
-        self.expiry_handler = JobExpiryHandler(default_expiry)
-        self.concurrent_handler = ConcurrentSubmissionHandler()
+                 aging_increment: int = 1, default_expiry: float = 30.0,
+                 engine: str = "circular", incremental_aging: bool = False,
+                 indexed_expiry: bool = False,
+                 max_expired_records: Optional[int] = JobExpiryHandler.DEFAULT_MAX_EXPIRED_RECORDS,
+                 max_finished_jobs: Optional[int] = JobRegistry.DEFAULT_MAX_FINISHED_JOBS,
+                 submission_workers: Optional[int] = None,
+                 engine_options: Optional[Dict[str, Any]] = None, batch_tick: bool = False,
+                 verbose: bool = False, log_capacity: Optional[int] = 10000,
+                 log_level: LogLevel = LogLevel.INFO, log_sink: Optional[TextIO] = None,
+                 journal: Optional[Any] = None, policy: Union[str, SchedulingPolicy, None] = None,
+                 metrics: Optional[QueueMetrics] = None):
+        if batch_tick and (incremental_aging or indexed_expiry):
+            raise ValueError("batch_tick replaces incremental_aging and indexed_expiry; enable one or the other")
+        engine_options = dict(engine_options or {})
+        if policy is not None:
+            engine_options['policy'] = policy
+        self.queue = create_queue(engine, capacity, **engine_options)
+        self.priority_system = PriorityAgingSystem(aging_interval, aging_increment, incremental_aging)
+        self.expiry_handler = JobExpiryHandler(default_expiry, indexed_expiry, max_expired_records)
+        self.concurrent_handler = ConcurrentSubmissionHandler(submission_workers)
         self.time_manager = TimeManager()
         self.visualizer = QueueVisualizer()
+        self.registry = JobRegistry(max_finished_jobs)
+        self.tick_engine = BatchTickEngine(aging_interval, aging_increment) if batch_tick else None
+        self.lazy_waiting_times = batch_tick or (incremental_aging and indexed_expiry)
+        self._state_lock = threading.RLock()
+        self._queue_listeners: List[Callable[[str], None]] = []
+        self.journal = journal
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.instrument_lock(self.queue)
 
         self.completed_jobs: List[PrintJob] = []
-        self.event_log: List[str] = []
+        self._snapshot_version = 0
+        self._last_snapshot: Optional[QueueSnapshot] = None
+        self.event_log = EventLog(log_capacity, log_level, sink=log_sink, echo=verbose)
         self.stats = {
             'total_submitted': 0,
             'total_printed': 0,
             'total_expired': 0,
+            'total_cancelled': 0,
             'jobs_aged': 0,
             'simultaneous_submissions': 0
         }
 
+    @_journaled
     def enqueue_job(self, user_id: str, job_id: str, priority: int,
                     content: str = "Document", expiry_time: Optional[float] = None) -> bool:
-        for job in self.queue.get_all_jobs():
-            if job.job_id == job_id:
-                self._log_event(f"ERROR: Job {job_id} already exists!")
-                return False
+        if self.registry.is_active(job_id):
+            self._log_event(LogLevel.ERROR, "duplicate_job", job_id=job_id)
+            return False
 
+        started = self.metrics.start() if self.metrics is not None else None
+        current_time = self.time_manager.current_time
         job = PrintJob(
             user_id=user_id,
             job_id=job_id,
             priority=priority,
             content=content,
+            submission_time=current_time,
+            last_aged=current_time,
             expiry_time=expiry_time or self.expiry_handler.default_expiry
         )
 
         if self.queue.enqueue_job(job):
             self.stats['total_submitted'] += 1
-            self._log_event(f"Job {user_id}-{job_id} added (Priority: {priority})")
+            self._track_job(job)
+            if started is not None:
+                self.metrics.stop("enqueue", started)
+            self._log_event(LogLevel.INFO, "job_added", user_id=user_id, job_id=job_id, priority=priority)
+            self._notify_queue_listeners("enqueued")
             return True
         else:
-            self._log_event(f"ERROR: Queue full! Cannot add job {user_id}-{job_id}")
+            self._log_event(LogLevel.ERROR, "queue_full", user_id=user_id, job_id=job_id)
             return False
 
     def print_job(self) -> Optional[PrintJob]:
+        job = self.claim_job()
+        if job:
+            self.complete_job(job)
+            return job
+        else:
+            self._log_event(LogLevel.WARNING, "queue_empty")
+            return None
+
+    @_journaled
+    def claim_job(self) -> Optional[PrintJob]:
+        started = self.metrics.start() if self.metrics is not None else None
         job = self.queue.dequeue_job()
         if job:
-            job.status = JobStatus.COMPLETED
             job.update_waiting_time(self.time_manager.current_time)
+            self.registry.set_status(job, JobStatus.PRINTING)
+            self._untrack_job(job)
+            if isinstance(self.queue, FairShareQueue):
+                self.queue.record_wait(job)
+            self._journal("claim", job.job_id)
+            if self.metrics is not None:
+                self.metrics.record_job_wait(job.waiting_time)
+                self.metrics.stop("dequeue", started)
+            self._notify_queue_listeners("claimed")
+        return job
+
+    @_journaled
+    def complete_job(self, job: PrintJob):
+        started = self.metrics.start() if self.metrics is not None else None
+        self.registry.set_status(job, JobStatus.COMPLETED)
+        with self._state_lock:
             self.completed_jobs.append(job)
             self.stats['total_printed'] += 1
-            self._log_event(f"PRINTED: {job.user_id}-{job.job_id} "
-                            f"(Priority: {job.priority}, Waited: {job.waiting_time:.1f}s)")
-            return job
-        else:
-            self._log_event("No jobs to print - queue is empty!")
-            return None
+        self._journal("complete", job.job_id)
+        if started is not None:
+            self.metrics.stop("complete", started)
+        self._log_event(LogLevel.INFO, "job_printed", user_id=job.user_id, job_id=job.job_id,
+                        priority=job.priority, waiting_time=job.waiting_time)
+
+    @_journaled
+    def fail_job(self, job: PrintJob):
+        self.registry.set_status(job, JobStatus.FAILED)
+        self._journal("fail", job.job_id)
+        self._log_event(LogLevel.ERROR, "job_failed", user_id=job.user_id, job_id=job.job_id)
+
+    @_journaled
+    def enqueue_batch(self, job_specs: Iterable[Tuple]) -> Dict[str, bool]:
+        started = self.metrics.start() if self.metrics is not None else None
+        current_time = self.time_manager.current_time
+        results: Dict[str, bool] = {}
+        jobs: List[PrintJob] = []
+
+        for user_id, job_id, priority, *extra in job_specs:
+            if self.registry.is_active(job_id) or job_id in results:
+                results[job_id] = False
+                continue
+
+            content = extra[0] if extra else "Document"
+            expiry_time = extra[1] if len(extra) > 1 else None
+            results[job_id] = False
+            jobs.append(PrintJob(
+                user_id=user_id,
+                job_id=job_id,
+                priority=priority,
+                content=content,
+                submission_time=current_time,
+                last_aged=current_time,
+                expiry_time=expiry_time or self.expiry_handler.default_expiry
+            ))
+
+        accepted_jobs = [job for job, success in zip(jobs, self.queue.enqueue_many(jobs)) if success]
+        for job in accepted_jobs:
+            results[job.job_id] = True
+        successful = len(accepted_jobs)
+        self.stats['total_submitted'] += successful
+        self._track_jobs(accepted_jobs)
+
+        if started is not None:
+            self.metrics.stop("enqueue_batch", started)
+        self._log_event(LogLevel.INFO, "batch_submitted", successful=successful, total=len(results))
+        if successful:
+            self._notify_queue_listeners("enqueued")
+        return results
 
+    @_journaled
     def handle_simultaneous_submissions(self, job_specs: List[Tuple[str, str, int, str]]) -> Dict[str, bool]:
         self.stats['simultaneous_submissions'] += 1
-        self._log_event(f"SIMULTANEOUS SUBMISSION: {len(job_specs)} jobs")
-
-        results = self.concurrent_handler.handle_simultaneous_submissions(self.queue, job_specs)
+        self._journal("simultaneous")
+        self._log_event(LogLevel.INFO, "simultaneous_started", total=len(job_specs))
+
+        new_specs = []
+        batch_ids = set()
+        for job_spec in job_specs:
+            job_id = job_spec[1]
+            if not self.registry.is_active(job_id) and job_id not in batch_ids:
+                batch_ids.add(job_id)
+                new_specs.append(job_spec)
+
+        submitted = self.concurrent_handler.handle_simultaneous_submissions(
+            self.queue, new_specs, on_submitted=partial(self._track_job, journal_operation="submit_simultaneous"),
+            current_time=self.time_manager.current_time
+        )
+        results = {job_spec[1]: submitted.get(job_spec[1], False) for job_spec in job_specs}
         successful = sum(1 for success in results.values() if success)
-        self._log_event(f"Simultaneous submission completed: {successful}/{len(job_specs)} successful")
+        self._log_event(LogLevel.INFO, "simultaneous_completed", successful=successful, total=len(job_specs))
+        if successful:
+            self._notify_queue_listeners("enqueued")
 
         return results
 
+    @_journaled
     def tick(self, time_increment: float = 1.0):
-        current_time = self.time_manager.tick(time_increment)
-        self.time_manager.update_waiting_times(self.queue)
-        aged_count = self.priority_system.apply_priority_aging(self.queue, current_time)
-        self.stats['jobs_aged'] += aged_count
-        expired_count = self.expiry_handler.remove_expired_jobs(self.queue, current_time)
-        self.stats['total_expired'] += expired_count
-
-    def show_status(self):
+        self._run_tick(self.time_manager.tick(time_increment))
+
+    @_journaled
+    def advance_to(self, timestamp: float):
+        self._run_tick(self.time_manager.advance_to(timestamp))
+
+    def _run_tick(self, current_time: float):
+        self._journal("tick", current_time)
+        metrics = self.metrics
+        started = metrics.start(sampled=False) if metrics is not None else None
+        if self.tick_engine is not None:
+            self._batched_tick(current_time, started)
+        else:
+            self._standard_tick(current_time, started)
+
+        if metrics is not None:
+            metrics.record_depth(current_time, len(self.queue))
+            if started is not None:
+                metrics.stop("tick", started)
+        self._notify_queue_listeners("ticked")
+
+    def _standard_tick(self, current_time: float, started: Optional[float] = None):
+        phase = started
+        if not self.lazy_waiting_times:
+            self.time_manager.update_waiting_times(self.queue)
+            phase = self._end_phase("tick_waiting_update", phase)
+        self.priority_system.apply_priority_aging(self.queue, current_time, on_aged=self._on_job_aged)
+        phase = self._end_phase("tick_aging", phase)
+        self.expiry_handler.remove_expired_jobs(self.queue, current_time, on_expired=self._on_job_expired)
+        self._end_phase("tick_expiry", phase)
+
+    def _batched_tick(self, current_time: float, started: Optional[float] = None):
+        aged_jobs, expired_jobs = self.tick_engine.tick(current_time)
+        phase = self._end_phase("tick_scan", started)
+        if aged_jobs:
+            self.priority_system.reposition_jobs(self.queue, aged_jobs)
+            for job in aged_jobs:
+                self._on_job_aged(job)
+        phase = self._end_phase("tick_aging", phase)
+        self.expiry_handler.expire_jobs(self.queue, expired_jobs, on_expired=self._on_job_expired)
+        self._end_phase("tick_expiry", phase)
+
+    def _end_phase(self, phase: str, started: Optional[float]) -> Optional[float]:
+        if started is None:
+            return None
+        return self.metrics.stop(phase, started)
+
+    def show_status(self, top_k: Optional[int] = None):
+        if self.lazy_waiting_times:
+            if top_k is None:
+                self.time_manager.update_waiting_times(self.queue)
+            else:
+                for job in self.queue.top_jobs(top_k):
+                    job.update_waiting_time(self.time_manager.current_time)
         self.visualizer.show_status(
             self.queue,
             self.time_manager.current_time,
-            self.stats
+            self.stats,
+            top_k
         )
 
-    def get_job_info(self, job_id: str) -> Optional[Dict[str, Any]]:
-        return self.visualizer.get_job_info(
-            self.queue,
-            job_id,
-            self.completed_jobs,
-            self.expiry_handler.expired_jobs
+    def view(self) -> QueueView:
+        return self.queue.view()
+
+    def snapshot(self, top_k: int = 20) -> QueueSnapshot:
+        self._snapshot_version += 1
+        return self.visualizer.snapshot(
+            self.queue, self.time_manager.current_time, self.stats, top_k, self._snapshot_version
         )
 
-    def _log_event(self, message: str):
-        timestamp = f"[{self.time_manager.current_time:.1f}s]"
-        log_entry = f"{timestamp} {message}"
-        self.event_log.append(log_entry)
-        print(log_entry)
+    def snapshot_delta(self, top_k: int = 20) -> SnapshotDiff:
+        current = self.snapshot(top_k)
+        delta = diff_snapshots(self._last_snapshot, current)
+        self._last_snapshot = current
+        return delta
+
+    @_journaled
+    def cancel_job(self, job_id: str) -> bool:
+        started = self.metrics.start() if self.metrics is not None else None
+        job = self.registry.get(job_id)
+        if job is None or job.status != JobStatus.PENDING or not self.queue.remove_job(job_id):
+            self._log_event(LogLevel.ERROR, "cancel_failed", job_id=job_id)
+            return False
+
+        self.registry.set_status(job, JobStatus.CANCELLED)
+        self._untrack_job(job)
+        self.stats['total_cancelled'] += 1
+        self._journal("cancel", job.job_id)
+        if started is not None:
+            self.metrics.stop("cancel", started)
+        self._log_event(LogLevel.INFO, "job_cancelled", user_id=job.user_id, job_id=job.job_id)
+        self._notify_queue_listeners("cancelled")
+        return True
+
+    def get_job_info(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.registry.get(job_id)
+        if job is None:
+            return None
+        if self.lazy_waiting_times and job.status == JobStatus.PENDING:
+            job.update_waiting_time(self.time_manager.current_time)
+        return self.visualizer.describe_job(job)
+
+    def _track_job(self, job: PrintJob, journal_operation: str = "submit"):
+        self.registry.register(job)
+        self.priority_system.track_job(job)
+        self.expiry_handler.track_job(job)
+        if self.tick_engine is not None:
+            self.tick_engine.track_job(job)
+        self._journal(journal_operation, job.user_id, job.job_id, job.priority, job.content,
+                      job.expiry_time, job.submission_time)
+
+    def _track_jobs(self, jobs: List[PrintJob], journal_operation: str = "submit"):
+        if len(jobs) < 64:
+            for job in jobs:
+                self._track_job(job, journal_operation)
+            return
+
+        self.registry.register_many(jobs)
+        self.priority_system.track_jobs(jobs)
+        self.expiry_handler.track_jobs(jobs)
+        if self.tick_engine is not None:
+            for job in jobs:
+                self.tick_engine.track_job(job)
+        if self.journal is not None:
+            self.journal.append_many(journal_operation, [
+                (job.user_id, job.job_id, job.priority, job.content, job.expiry_time, job.submission_time)
+                for job in jobs
+            ])
+
+    def _untrack_job(self, job: PrintJob):
+        if self.tick_engine is not None:
+            self.tick_engine.untrack_job(job)
+
+    def _on_job_expired(self, job: PrintJob):
+        self.registry.set_status(job, JobStatus.EXPIRED)
+        self._untrack_job(job)
+        self.stats['total_expired'] += 1
+        self._journal("expire", job.job_id)
+
+    def _on_job_aged(self, job: PrintJob):
+        self.stats['jobs_aged'] += 1
+        self._journal("age", job.job_id, job.priority, job.last_aged)
+
+    def export_metrics(self, export_format: str = "prometheus") -> str:
+        if self.metrics is None:
+            raise ValueError("Metrics are disabled; pass metrics=QueueMetrics() to PrintQueueManager")
+        if export_format == "prometheus":
+            return self.metrics.to_prometheus(self.stats)
+        if export_format == "json":
+            return self.metrics.to_json(self.stats)
+        raise ValueError(f"Unknown metrics format '{export_format}', expected 'prometheus' or 'json'")
+
+    def add_queue_listener(self, listener: Callable[[str], None]):
+        self._queue_listeners.append(listener)
+
+    def remove_queue_listener(self, listener: Callable[[str], None]):
+        if listener in self._queue_listeners:
+            self._queue_listeners.remove(listener)
+
+    def _notify_queue_listeners(self, change: str):
+        for listener in self._queue_listeners:
+            listener(change)
+
+    def add_event_listener(self, listener: Callable[[EventRecord], None]):
+        self.event_log.add_listener(listener)
+
+    def remove_event_listener(self, listener: Callable[[EventRecord], None]):
+        self.event_log.remove_listener(listener)
+
+    def close(self):
+        if self.journal is not None:
+            self.journal.close()
+        self.event_log.close()
+
+    def _journal(self, operation: str, *arguments: Any):
+        if self.journal is not None:
+            self.journal.append(operation, *arguments)
+
+    def _log_event(self, level: LogLevel, kind: str, **fields: Any):
+        event_log = self.event_log
+        if level >= event_log.level or event_log.listeners:
+            event_log.log(self.time_manager.current_time, level, kind, **fields)
 
 
 def run_simulation():
@@ -431,7 +2094,8 @@ def run_simulation():
         capacity=20,
         aging_interval=3.0,
         aging_increment=1,
-        default_expiry=15.0
+        default_expiry=15.0,
+        verbose=True
     )
 
     print("\n1. Adding initial jobs...")
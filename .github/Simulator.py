@@ -0,0 +1,191 @@
+import argparse
+import heapq
+import itertools
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from EventLog import LogLevel
+from Project import QUEUE_ENGINES, PrintJob, PrintQueueManager
+
+SUBMIT = "submit"
+CANCEL = "cancel"
+PRINT_COMPLETE = "print_complete"
+
+TraceEvent = Tuple[float, str, Any]
+
+
+@dataclass
+class SimulationReport:
+    events_processed: int = 0
+    submissions: int = 0
+    cancellations: int = 0
+    jobs_printed: int = 0
+    simulated_time: float = 0.0
+    wall_time: float = 0.0
+    total_wait: float = 0.0
+    manager_stats: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events_processed / self.wall_time if self.wall_time else 0.0
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.jobs_printed if self.jobs_printed else 0.0
+
+
+class DiscreteEventSimulator:
+    def __init__(self, manager: Optional[PrintQueueManager] = None, printers: int = 1,
+                 print_time: Union[float, Callable[[PrintJob], float]] = 1.0, **manager_options: Any):
+        if manager is None:
+            manager_options.setdefault("engine", "heap")
+            manager_options.setdefault("verbose", False)
+            manager_options.setdefault("log_level", LogLevel.OFF)
+            manager = PrintQueueManager(incremental_aging=True, indexed_expiry=True, **manager_options)
+
+        if not (manager.priority_system.incremental and manager.expiry_handler.indexed):
+            raise ValueError("DiscreteEventSimulator needs a manager with incremental_aging and indexed_expiry")
+
+        self.manager = manager
+        self.printers = printers
+        self.print_time = print_time
+        self.free_printers = printers
+        self._calendar: List[Tuple[float, int, str, Any]] = []
+        self._sequence = itertools.count()
+
+    @property
+    def current_time(self) -> float:
+        return self.manager.time_manager.current_time
+
+    def schedule(self, timestamp: float, kind: str, payload: Any = None):
+        heapq.heappush(self._calendar, (timestamp, next(self._sequence), kind, payload))
+
+    def next_event_time(self, next_trace_time: Optional[float] = None) -> Optional[float]:
+        return _earliest(_earliest(next_trace_time, self._calendar[0][0] if self._calendar else None),
+                         self.next_deadline())
+
+    def next_deadline(self) -> Optional[float]:
+        return _earliest(self.manager.priority_system.next_aging_time(), self.manager.expiry_handler.next_expiry_time())
+
+    def run(self, trace: Iterable[TraceEvent], until: Optional[float] = None) -> SimulationReport:
+        report = SimulationReport()
+        started = time.perf_counter()
+        trace_events = iter(trace)
+        next_trace = next(trace_events, None)
+        calendar = self._calendar
+        manager = self.manager
+        queue = manager.queue
+        clock = manager.time_manager
+
+        while True:
+            deadline = self.next_deadline()
+            timestamp = _earliest(_earliest(next_trace[0] if next_trace is not None else None,
+                                            calendar[0][0] if calendar else None), deadline)
+            if timestamp is None or (until is not None and timestamp > until):
+                break
+
+            if timestamp > clock.current_time:
+                # a tick with no aging or expiry due only moves the clock; journaled managers still record it
+                if (deadline is not None and deadline <= timestamp) or manager.journal is not None:
+                    manager.advance_to(timestamp)
+                else:
+                    clock.advance_to(timestamp)
+
+            while calendar and calendar[0][0] <= timestamp:
+                _, _, kind, payload = heapq.heappop(calendar)
+                self._handle_calendar_event(kind, payload, report)
+                report.events_processed += 1
+
+            while next_trace is not None and next_trace[0] <= timestamp:
+                self._handle_trace_event(next_trace, report)
+                report.events_processed += 1
+                next_trace = next(trace_events, None)
+
+            if self.free_printers and not queue.is_empty():
+                self._dispatch()
+
+        report.simulated_time = self.current_time
+        report.wall_time = time.perf_counter() - started
+        report.manager_stats = dict(self.manager.stats)
+        return report
+
+    def _handle_trace_event(self, event: TraceEvent, report: SimulationReport):
+        _, kind, payload = event
+        if kind == SUBMIT:
+            self.manager.enqueue_job(*payload)
+            report.submissions += 1
+        elif kind == CANCEL:
+            self.manager.cancel_job(payload)
+            report.cancellations += 1
+        else:
+            raise ValueError(f"Unknown trace event kind '{kind}'")
+
+    def _handle_calendar_event(self, kind: str, payload: Any, report: SimulationReport):
+        if kind == PRINT_COMPLETE:
+            self.manager.complete_job(payload)
+            self.free_printers += 1
+            report.jobs_printed += 1
+            report.total_wait += payload.waiting_time
+
+    def _dispatch(self):
+        while self.free_printers > 0:
+            job = self.manager.claim_job()
+            if job is None:
+                return
+
+            self.free_printers -= 1
+            duration = self.print_time(job) if callable(self.print_time) else self.print_time
+            self.schedule(self.current_time + duration, PRINT_COMPLETE, job)
+
+
+def _earliest(first: Optional[float], second: Optional[float]) -> Optional[float]:
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return first if first <= second else second
+
+
+def synthetic_trace(events: int, arrival_rate: float = 1.0, users: int = 10,
+                    priorities: Tuple[int, int] = (1, 5), cancel_ratio: float = 0.0,
+                    seed: Optional[int] = None) -> Iterator[TraceEvent]:
+    rng = random.Random(seed)
+    timestamp = 0.0
+    submitted: List[str] = []
+    for index in range(events):
+        timestamp += rng.expovariate(arrival_rate)
+        if submitted and rng.random() < cancel_ratio:
+            yield timestamp, CANCEL, submitted[rng.randrange(len(submitted))]
+            continue
+
+        job_id = f"job{index}"
+        submitted.append(job_id)
+        yield timestamp, SUBMIT, (f"user{rng.randrange(users)}", job_id, rng.randint(*priorities))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure discrete-event replay throughput on a synthetic trace")
+    parser.add_argument("--events", type=int, default=1000000)
+    parser.add_argument("--engine", choices=sorted(QUEUE_ENGINES), default="heap")
+    parser.add_argument("--printers", type=int, default=2)
+    parser.add_argument("--print-time", type=float, default=0.45)
+    parser.add_argument("--arrival-rate", type=float, default=4.0)
+    parser.add_argument("--cancel-ratio", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    simulator = DiscreteEventSimulator(printers=args.printers, print_time=args.print_time,
+                                       engine=args.engine, capacity=args.events)
+    report = simulator.run(synthetic_trace(args.events, args.arrival_rate, cancel_ratio=args.cancel_ratio,
+                                           seed=args.seed))
+    print(f"Replayed {report.events_processed} events in {report.wall_time:.2f}s "
+          f"({report.events_per_second:,.0f} events/s, {report.simulated_time:,.0f}s simulated)")
+    print(f"Final statistics: {report.manager_stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
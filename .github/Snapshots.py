@@ -0,0 +1,134 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+
+class SnapshotRow(NamedTuple):
+    job_id: str
+    user_id: str
+    priority: int
+    submission_time: float
+    expires_at: float
+
+    def waiting_time(self, current_time: float) -> float:
+        return current_time - self.submission_time
+
+    def expires_in(self, current_time: float) -> float:
+        return max(0.0, self.expires_at - current_time)
+
+
+@dataclass(frozen=True)
+class QueueSnapshot:
+    version: int
+    current_time: float
+    size: int
+    capacity: int
+    rows: Tuple[SnapshotRow, ...]
+    stats: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def hidden_jobs(self) -> int:
+        return self.size - len(self.rows)
+
+    def ranks(self) -> Dict[str, int]:
+        return {row.job_id: rank for rank, row in enumerate(self.rows, 1)}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'v': self.version,
+            't': self.current_time,
+            'size': self.size,
+            'capacity': self.capacity,
+            'rows': [list(row) for row in self.rows],
+            'stats': dict(self.stats)
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+
+@dataclass(frozen=True)
+class SnapshotDiff:
+    base_version: int
+    version: int
+    current_time: float
+    size: int
+    added: Tuple[Tuple[int, SnapshotRow], ...]
+    removed: Tuple[str, ...]
+    moved: Tuple[Tuple[str, int], ...]
+    updated: Tuple[Tuple[str, int], ...]
+    stats: Dict[str, int]
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.moved or self.updated or self.stats)
+
+    def to_dict(self) -> Dict[str, Any]:
+        delta: Dict[str, Any] = {'base': self.base_version, 'v': self.version, 't': self.current_time,
+                                 'size': self.size}
+        if self.added:
+            delta['add'] = [[rank, *row] for rank, row in self.added]
+        if self.removed:
+            delta['del'] = list(self.removed)
+        if self.moved:
+            delta['mov'] = [list(move) for move in self.moved]
+        if self.updated:
+            delta['upd'] = [list(update) for update in self.updated]
+        if self.stats:
+            delta['stats'] = dict(self.stats)
+        return delta
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+
+def diff_snapshots(previous: Optional[QueueSnapshot], current: QueueSnapshot) -> SnapshotDiff:
+    if previous is None:
+        return SnapshotDiff(
+            base_version=0, version=current.version, current_time=current.current_time, size=current.size,
+            added=tuple(enumerate(current.rows, 1)), removed=(), moved=(), updated=(), stats=dict(current.stats)
+        )
+
+    old_rows = {row.job_id: (rank, row) for rank, row in enumerate(previous.rows, 1)}
+    added: List[Tuple[int, SnapshotRow]] = []
+    moved: List[Tuple[str, int]] = []
+    updated: List[Tuple[str, int]] = []
+
+    for rank, row in enumerate(current.rows, 1):
+        old = old_rows.pop(row.job_id, None)
+        if old is None:
+            added.append((rank, row))
+            continue
+
+        old_rank, old_row = old
+        if old_rank != rank:
+            moved.append((row.job_id, rank))
+        if old_row.priority != row.priority:
+            updated.append((row.job_id, row.priority))
+
+    stats = {name: value for name, value in current.stats.items() if previous.stats.get(name) != value}
+    return SnapshotDiff(
+        base_version=previous.version, version=current.version, current_time=current.current_time,
+        size=current.size, added=tuple(added), removed=tuple(old_rows), moved=tuple(moved),
+        updated=tuple(updated), stats=stats
+    )
+
+
+def apply_diff(snapshot: QueueSnapshot, diff: SnapshotDiff) -> QueueSnapshot:
+    removed = set(diff.removed)
+    priorities = dict(diff.updated)
+    ranks = dict(diff.moved)
+    rows: Dict[int, SnapshotRow] = {}
+
+    for rank, row in enumerate(snapshot.rows, 1):
+        if row.job_id in removed:
+            continue
+        if row.job_id in priorities:
+            row = row._replace(priority=priorities[row.job_id])
+        rows[ranks.get(row.job_id, rank)] = row
+    for rank, row in diff.added:
+        rows[rank] = row
+
+    return QueueSnapshot(
+        version=diff.version, current_time=diff.current_time, size=diff.size, capacity=snapshot.capacity,
+        rows=tuple(rows[rank] for rank in sorted(rows)), stats={**snapshot.stats, **diff.stats}
+    )
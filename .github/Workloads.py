@@ -0,0 +1,94 @@
+import math
+import random
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from Simulator import CANCEL, SUBMIT, TraceEvent
+
+JobSpec = Tuple[str, str, int, str, Optional[float]]
+
+PRIORITY_DISTRIBUTIONS = {
+    "uniform": (1.0, 1.0, 1.0, 1.0, 1.0),
+    "skewed": (0.05, 0.1, 0.2, 0.3, 0.35),
+    "urgent": (0.4, 0.3, 0.15, 0.1, 0.05)
+}
+
+CONTENT_SIZE_BUCKETS = 32
+
+
+@dataclass
+class WorkloadSpec:
+    jobs: int = 10000
+    arrival_rate: float = 1.0
+    users: int = 10
+    priority_weights: Tuple[float, ...] = PRIORITY_DISTRIBUTIONS["uniform"]
+    burst_size: int = 1
+    content_sizes: Tuple[int, int] = (1024, 65536)
+    expiry: Optional[float] = None
+    heavy_user_share: float = 0.0
+    cancel_ratio: float = 0.0
+    seed: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class _ContentPool:
+    def __init__(self, sizes: Tuple[int, int], buckets: int = CONTENT_SIZE_BUCKETS):
+        low, high = sizes
+        ratio = (high / low) ** (1.0 / max(1, buckets - 1)) if high > low else 1.0
+        self.contents = [
+            "x" * size for size in sorted({int(low * ratio ** bucket) for bucket in range(buckets)})
+        ]
+
+    def draw(self, rng: random.Random) -> str:
+        return self.contents[rng.randrange(len(self.contents))]
+
+
+def generate_jobs(spec: WorkloadSpec) -> Iterator[JobSpec]:
+    rng = random.Random(spec.seed)
+    contents = _ContentPool(spec.content_sizes)
+    priorities = list(range(1, len(spec.priority_weights) + 1))
+    users = [f"user{index}" for index in range(spec.users)]
+
+    for index in range(spec.jobs):
+        if spec.heavy_user_share and rng.random() < spec.heavy_user_share:
+            user_id = users[0]
+        else:
+            user_id = users[rng.randrange(len(users))]
+        priority = rng.choices(priorities, spec.priority_weights)[0]
+        yield user_id, f"job{index}", priority, contents.draw(rng), spec.expiry
+
+
+def generate_trace(spec: WorkloadSpec) -> Iterator[TraceEvent]:
+    rng = random.Random(spec.seed + 1)
+    burst_size = max(1, spec.burst_size)
+    timestamp = 0.0
+    submitted: List[str] = []
+
+    for index, job_spec in enumerate(generate_jobs(spec)):
+        if index % burst_size == 0:
+            timestamp += rng.expovariate(spec.arrival_rate / burst_size)
+        if submitted and spec.cancel_ratio and rng.random() < spec.cancel_ratio:
+            yield timestamp, CANCEL, submitted[rng.randrange(len(submitted))]
+
+        submitted.append(job_spec[1])
+        yield timestamp, SUBMIT, job_spec
+
+
+def generate_bursts(spec: WorkloadSpec) -> Iterator[List[JobSpec]]:
+    burst: List[JobSpec] = []
+    for job_spec in generate_jobs(spec):
+        burst.append(job_spec)
+        if len(burst) == max(1, spec.burst_size):
+            yield burst
+            burst = []
+    if burst:
+        yield burst
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
@@ -0,0 +1,361 @@
+import gc
+import json
+import os
+from contextlib import contextmanager
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from Project import JobStatus, PrintJob, PrintQueueManager
+
+SNAPSHOT_SUFFIX = ".snapshot"
+ROTATED_SUFFIX = ".old"
+
+_encoder = json.JSONEncoder(separators=(",", ":"))
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+@dataclass
+class RecoveryReport:
+    snapshot_lsn: int = 0
+    last_lsn: int = 0
+    records_replayed: int = 0
+    pending_jobs: int = 0
+    requeued_jobs: int = 0
+    torn_records: int = 0
+
+
+@dataclass
+class _RecoveredState:
+    current_time: float = 0.0
+    stats: Dict[str, int] = field(default_factory=dict)
+    pending: Dict[str, PrintJob] = field(default_factory=dict)
+    printing: Dict[str, PrintJob] = field(default_factory=dict)
+    completed: List[PrintJob] = field(default_factory=list)
+    expired: List[PrintJob] = field(default_factory=list)
+    cancelled: List[PrintJob] = field(default_factory=list)
+
+
+class WriteAheadLog:
+    def __init__(self, path: str, fsync: bool = True, synchronous: bool = False,
+                 batch_size: int = 1024, checkpoint_every: Optional[int] = None):
+        self.path = path
+        self.snapshot_path = path + SNAPSHOT_SUFFIX
+        self.fsync = fsync
+        self.synchronous = synchronous
+        self.batch_size = batch_size
+        self.checkpoint_every = checkpoint_every
+        self.commits = 0
+        self._lsn = 0
+        self._durable_lsn = 0
+        self._records_since_checkpoint = 0
+        self._append_lock = threading.Lock()
+        self._durable = threading.Condition()
+        self._pending: "queue.SimpleQueue[Optional[Tuple[int, str, Tuple[Any, ...]]]]" = queue.SimpleQueue()
+        self._file = None
+        self._writer: Optional[threading.Thread] = None
+
+    @property
+    def lsn(self) -> int:
+        return self._lsn
+
+    @property
+    def durable_lsn(self) -> int:
+        return self._durable_lsn
+
+    def open(self, manager: Optional[PrintQueueManager] = None, **manager_options: Any) -> PrintQueueManager:
+        if manager is None:
+            manager = PrintQueueManager(**manager_options)
+        self.recover(manager)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._writer = threading.Thread(target=self._write_loop, name="WriteAheadLogWriter", daemon=True)
+        self._writer.start()
+        manager.journal = self
+        return manager
+
+    def append(self, operation: str, *arguments: Any) -> int:
+        with self._append_lock:
+            self._lsn += 1
+            lsn = self._lsn
+            self._pending.put((lsn, operation, arguments))
+            self._records_since_checkpoint += 1
+
+        if self.synchronous:
+            self.wait_durable(lsn)
+        return lsn
+
+    def append_many(self, operation: str, rows: List[Tuple[Any, ...]]) -> int:
+        with self._append_lock:
+            put = self._pending.put
+            for arguments in rows:
+                self._lsn += 1
+                put((self._lsn, operation, arguments))
+            lsn = self._lsn
+            self._records_since_checkpoint += len(rows)
+
+        if self.synchronous:
+            self.wait_durable(lsn)
+        return lsn
+
+    def maybe_checkpoint(self, manager: PrintQueueManager) -> Optional[int]:
+        if self.checkpoint_every is None:
+            return None
+        with self._append_lock:
+            if self._records_since_checkpoint < self.checkpoint_every:
+                return None
+            self._records_since_checkpoint = 0
+        return self.checkpoint(manager)
+
+    def sync(self) -> int:
+        lsn = self._lsn
+        self.wait_durable(lsn)
+        return lsn
+
+    def wait_durable(self, lsn: int):
+        with self._durable:
+            while self._durable_lsn < lsn:
+                self._durable.wait()
+
+    def checkpoint(self, manager: PrintQueueManager) -> int:
+        with manager._state_lock, self._append_lock, _gc_paused():
+            lsn = self._lsn
+            state = self._capture(manager, lsn)
+            self._records_since_checkpoint = 0
+            self.wait_durable(lsn)
+            self._file.close()
+            self._rotate()
+            self._file = open(self.path, "a", encoding="utf-8")
+
+        temporary_path = self.snapshot_path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as snapshot_file, _gc_paused():
+            snapshot_file.write(_encoder.encode(state))
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(temporary_path, self.snapshot_path)
+        os.remove(self.path + ROTATED_SUFFIX)
+        return lsn
+
+    def _rotate(self):
+        rotated_path = self.path + ROTATED_SUFFIX
+        if not os.path.exists(rotated_path):
+            os.replace(self.path, rotated_path)
+            return
+
+        # a previous checkpoint died before its snapshot landed; its records are still needed
+        with open(self.path, "rb") as log_file, open(rotated_path, "ab") as rotated_file:
+            rotated_file.write(log_file.read())
+            rotated_file.flush()
+            os.fsync(rotated_file.fileno())
+        os.remove(self.path)
+
+    def close(self):
+        if self._writer is None:
+            return
+        self._pending.put(None)
+        self._writer.join()
+        self._writer = None
+        self._file.close()
+
+    def recover(self, manager: PrintQueueManager) -> RecoveryReport:
+        with _gc_paused():
+            return self._recover(manager)
+
+    def _recover(self, manager: PrintQueueManager) -> RecoveryReport:
+        report = RecoveryReport()
+        state = _RecoveredState(stats=dict(manager.stats))
+
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as snapshot_file:
+                report.snapshot_lsn = self._load_snapshot(json.load(snapshot_file), state)
+        report.last_lsn = report.snapshot_lsn
+
+        for path in (self.path + ROTATED_SUFFIX, self.path):
+            for record in self._read_records(path, report):
+                if record[0] <= report.last_lsn:
+                    continue
+                self._replay(record, state)
+                report.last_lsn = record[0]
+                report.records_replayed += 1
+
+        report.requeued_jobs = len(state.printing)
+        for job in state.printing.values():
+            job.status = JobStatus.PENDING
+            state.pending[job.job_id] = job
+        report.pending_jobs = self._restore(manager, state)
+        self._lsn = self._durable_lsn = report.last_lsn
+        return report
+
+    def _write_loop(self):
+        while True:
+            record = self._pending.get()
+            batch = [] if record is None else [record]
+            closing = record is None
+            while not closing and len(batch) < self.batch_size:
+                try:
+                    record = self._pending.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    closing = True
+                else:
+                    batch.append(record)
+
+            if batch:
+                encode = _encoder.encode
+                self._file.write("".join(
+                    encode([lsn, operation, *arguments]) + "\n" for lsn, operation, arguments in batch
+                ))
+                self._file.flush()
+                if self.fsync:
+                    os.fsync(self._file.fileno())
+                self.commits += 1
+                with self._durable:
+                    self._durable_lsn = batch[-1][0]
+                    self._durable.notify_all()
+            if closing:
+                return
+
+    @staticmethod
+    def _capture(manager: PrintQueueManager, lsn: int) -> Dict[str, Any]:
+        registry_jobs = list(manager.registry._jobs.values())
+        return {
+            'lsn': lsn,
+            'time': manager.time_manager.current_time,
+            'stats': dict(manager.stats),
+            'pending': [_encode_job(job) for job in manager.queue.get_all_jobs()],
+            'printing': [_encode_job(job) for job in registry_jobs if job.status == JobStatus.PRINTING],
+            'completed': [_encode_job(job) for job in list(manager.completed_jobs)],
+            'expired': [_encode_job(job) for job in list(manager.expiry_handler.expired_jobs)],
+            'cancelled': [_encode_job(job) for job in registry_jobs if job.status == JobStatus.CANCELLED]
+        }
+
+    @staticmethod
+    def _load_snapshot(snapshot: Dict[str, Any], state: _RecoveredState) -> int:
+        state.current_time = snapshot['time']
+        state.stats.update(snapshot['stats'])
+        for name in ('pending', 'printing'):
+            jobs = getattr(state, name)
+            for encoded in snapshot[name]:
+                job = _decode_job(encoded)
+                jobs[job.job_id] = job
+        for name, status in (('completed', JobStatus.COMPLETED), ('expired', JobStatus.EXPIRED),
+                             ('cancelled', JobStatus.CANCELLED)):
+            getattr(state, name).extend(_decode_job(encoded, status) for encoded in snapshot[name])
+        return snapshot['lsn']
+
+    @staticmethod
+    def _read_records(path: str, report: RecoveryReport) -> List[List[Any]]:
+        if not os.path.exists(path):
+            return []
+        with open(path, "rb+") as log_file:
+            data = log_file.read()
+            complete = data[:data.rfind(b"\n") + 1]
+            try:
+                records = json.loads(b"[" + complete.rstrip(b"\n").replace(b"\n", b",") + b"]")
+            except ValueError:
+                records = None
+
+            if records is not None and len(complete) == len(data):
+                return records
+
+            records, offset = [], 0
+            for line in complete.splitlines(keepends=True):
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+                offset += len(line)
+            report.torn_records += 1
+            log_file.truncate(offset)
+            return records
+
+    @staticmethod
+    def _replay(record: List[Any], state: _RecoveredState):
+        operation = record[1]
+        stats = state.stats
+        if operation == "tick":
+            state.current_time = max(state.current_time, record[2])
+        elif operation in ("submit", "submit_simultaneous"):
+            _, _, user_id, job_id, priority, content, expiry_time, submission_time = record
+            if job_id not in state.pending and job_id not in state.printing:
+                state.pending[job_id] = PrintJob(user_id, job_id, priority, content, submission_time,
+                                                 last_aged=submission_time, expiry_time=expiry_time)
+                if operation == "submit":
+                    stats['total_submitted'] += 1
+        elif operation == "age":
+            job = state.pending.get(record[2])
+            if job is not None:
+                job.priority, job.last_aged = record[3], record[4]
+                stats['jobs_aged'] += 1
+        elif operation == "claim":
+            job = state.pending.pop(record[2], None)
+            if job is not None:
+                job.status = JobStatus.PRINTING
+                job.update_waiting_time(state.current_time)
+                state.printing[job.job_id] = job
+        elif operation == "complete":
+            job = state.printing.pop(record[2], None)
+            if job is not None:
+                job.status = JobStatus.COMPLETED
+                state.completed.append(job)
+                stats['total_printed'] += 1
+        elif operation == "fail":
+            job = state.printing.pop(record[2], None)
+            if job is not None:
+                job.status = JobStatus.FAILED
+        elif operation in ("expire", "cancel"):
+            job = state.pending.pop(record[2], None)
+            if job is not None:
+                if operation == "expire":
+                    job.status = JobStatus.EXPIRED
+                    job.update_waiting_time(state.current_time)
+                    state.expired.append(job)
+                    stats['total_expired'] += 1
+                else:
+                    job.status = JobStatus.CANCELLED
+                    state.cancelled.append(job)
+                    stats['total_cancelled'] += 1
+        elif operation == "simultaneous":
+            stats['simultaneous_submissions'] += 1
+
+    @staticmethod
+    def _restore(manager: PrintQueueManager, state: _RecoveredState) -> int:
+        journal, manager.journal = manager.journal, None
+        manager.time_manager.advance_to(state.current_time)
+        manager.stats.update(state.stats)
+
+        for job in state.completed + state.expired + state.cancelled:
+            manager.registry.register(job)
+            manager.registry.set_status(job, job.status)
+        manager.completed_jobs.extend(state.completed)
+        manager.expiry_handler.expired_jobs.extend(state.expired)
+
+        pending = sorted(state.pending.values(), key=lambda job: (job.priority, job.submission_time))
+        restored = [job for job, accepted in zip(pending, manager.queue.enqueue_many(pending)) if accepted]
+        manager._track_jobs(restored)
+        manager.journal = journal
+        return len(restored)
+
+
+def _encode_job(job: PrintJob) -> List[Any]:
+    return [job.user_id, job.job_id, job.priority, job.original_priority, job.content,
+            job.submission_time, job.last_aged, job.expiry_time, job.waiting_time]
+
+
+def _decode_job(encoded: List[Any], status: JobStatus = JobStatus.PENDING) -> PrintJob:
+    user_id, job_id, priority, original_priority, content, submission_time, last_aged, expiry_time, waiting_time = encoded
+    job = PrintJob(user_id, job_id, priority, content, submission_time, waiting_time,
+                   last_aged=last_aged, status=status, expiry_time=expiry_time)
+    job.original_priority = original_priority
+    return job
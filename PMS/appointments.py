@@ -0,0 +1,137 @@
+import heapq
+import time
+from itertools import islice
+from datastructures.queue import Queue
+
+TRIAGE_LEVELS = ("Urgent", "Priority", "Routine")
+
+class Appointment:
+    def __init__(self, appointment_id, patient_id, priority, enqueued_at, label):
+        self.id = appointment_id
+        self.patient_id = patient_id
+        self.priority = priority
+        self.enqueued_at = enqueued_at
+        self.label = label
+        self.removed = False
+
+    def __str__(self):
+        return self.describe(self.priority)
+
+    def describe(self, level):
+        return f"{self.label} [{TRIAGE_LEVELS[level]}]"
+
+class AppointmentQueue:
+    def __init__(self, db, aging_interval=900.0, clock=time.time):
+        self.db = db
+        # every aging_interval seconds of waiting moves a patient up one triage level
+        self.aging_interval = aging_interval
+        self.clock = clock
+        self.levels = [Queue() for _ in TRIAGE_LEVELS]
+        self.entries = {}
+        self.create_table()
+        self.load()
+
+    def create_table(self):
+        with self.db.transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS appointments (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    patient_id INTEGER NOT NULL REFERENCES patients (id) ON DELETE CASCADE,
+                    priority INTEGER NOT NULL,
+                    enqueued_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_appointments_patient ON appointments (patient_id)")
+
+    def load(self):
+        rows = self.db.query("""
+            SELECT appointments.id, patient_id, priority, enqueued_at, name, gender, age
+            FROM appointments JOIN patients ON patients.id = appointments.patient_id
+            ORDER BY appointments.id
+        """)
+        for appointment_id, patient_id, priority, enqueued_at, name, gender, age in rows:
+            self._append(Appointment(appointment_id, patient_id, priority, enqueued_at, f"{name} ({gender}, {age})"))
+
+    def _append(self, appointment):
+        self.entries[appointment.id] = appointment
+        self.levels[appointment.priority].enqueue(appointment)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def is_empty(self):
+        return not self.entries
+
+    def enqueue(self, patient_id, label, priority=len(TRIAGE_LEVELS) - 1):
+        priority = min(max(int(priority), 0), len(TRIAGE_LEVELS) - 1)
+        enqueued_at = self.clock()
+        with self.db.transaction() as conn:
+            appointment_id = conn.execute(
+                "INSERT INTO appointments (patient_id, priority, enqueued_at) VALUES (?, ?, ?)",
+                (int(patient_id), priority, enqueued_at)).lastrowid
+        appointment = Appointment(appointment_id, int(patient_id), priority, enqueued_at, label)
+        self._append(appointment)
+        return appointment
+
+    def level(self, appointment, now=None):
+        # the triage level after aging, which is what the queue is ordered by
+        if now is None:
+            now = self.clock()
+        aged = appointment.priority - int((now - appointment.enqueued_at) // self.aging_interval)
+        return max(aged, 0)
+
+    def _rank(self, appointment, now):
+        # lower is served first: aged triage level, then arrival order
+        return (self.level(appointment, now), appointment.enqueued_at, appointment.id)
+
+    def _head(self, level):
+        # drop entries removed while they were still queued
+        while not level.is_empty() and level.peek().removed:
+            level.dequeue()
+        return level.peek()
+
+    def dequeue(self):
+        # each level is FIFO, so its head is also its most aged entry; compare heads only
+        now = self.clock()
+        best = None
+        for level in self.levels:
+            head = self._head(level)
+            if head is not None and (best is None or self._rank(head, now) < self._rank(best.peek(), now)):
+                best = level
+        if best is None:
+            return None
+
+        appointment = best.dequeue()
+        del self.entries[appointment.id]
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM appointments WHERE id=?", (appointment.id,))
+        return appointment
+
+    def remove_patient(self, patient_id):
+        # rows go with the patient via ON DELETE CASCADE; queued entries are skipped lazily
+        patient_id = int(patient_id)
+        removed = [appointment for appointment in self.entries.values() if appointment.patient_id == patient_id]
+        for appointment in removed:
+            appointment.removed = True
+            del self.entries[appointment.id]
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM appointments WHERE patient_id=?", (patient_id,))
+        return len(removed)
+
+    def snapshot(self, limit=50, now=None):
+        # the first `limit` entries in dequeue order, merging the levels without copying them
+        if now is None:
+            now = self.clock()
+        levels = ((appointment for appointment in level if not appointment.removed) for level in self.levels)
+        return list(islice(heapq.merge(*levels, key=lambda appointment: self._rank(appointment, now)), limit))
+
+    def display(self, limit=None):
+        now = self.clock()
+        return [appointment.describe(self.level(appointment, now)) for appointment in self.snapshot(limit, now)]
+
+    def checkout(self):
+        now = self.clock()
+        appointment = self.dequeue()
+        if appointment is None:
+            return "No patients to checkout."
+        return f"Checked out patient: {appointment.describe(self.level(appointment, now))}"
@@ -1,34 +1,237 @@
 import sqlite3
+import threading
+from contextlib import contextmanager
+
+# bumped when create_table has to migrate databases written by older versions
+SCHEMA_VERSION = 1
 
 class DatabaseManager:
-    def __init__(self, db_name="patients.db"):
-        self.conn = sqlite3.connect(db_name)
-        self.cursor = self.conn.cursor()
+    def __init__(self, db_name="patients.db", timeout=30.0):
+        self.db_name = db_name
+        self.timeout = timeout
+        self.in_memory = db_name == ":memory:" or db_name.startswith("file::memory:")
+
+        # single writer connection, shared by every thread under the write lock
+        self.conn = self._connect()
+        self.write_lock = threading.RLock()
+        self._local = threading.local()
+        self._readers = []
+        self._readers_lock = threading.Lock()
+        self.has_fts = False
         self.create_table()
 
+    def _connect(self):
+        conn = sqlite3.connect(self.db_name, timeout=self.timeout, check_same_thread=False, isolation_level=None)
+        if not self.in_memory:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def reader(self):
+        # one read connection per thread; in-memory databases are private to a connection
+        if self.in_memory:
+            return self.conn
+        conn = getattr(self._local, "reader", None)
+        if conn is None:
+            conn = self._connect()
+            conn.execute("PRAGMA query_only=ON")
+            self._local.reader = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        with self.write_lock:
+            # nested calls join the outer transaction
+            if getattr(self._local, "in_transaction", False):
+                yield self.conn
+                return
+
+            self._local.in_transaction = True
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            else:
+                self.conn.execute("COMMIT")
+            finally:
+                self._local.in_transaction = False
+
+    def query(self, sql, params=()):
+        if self.in_memory:
+            with self.write_lock:
+                return self.conn.execute(sql, params).fetchall()
+        return self.reader().execute(sql, params).fetchall()
+
     def create_table(self):
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS patients (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                age INTEGER NOT NULL,
-                gender TEXT NOT NULL
-            )
-        """)
-        self.conn.commit()
+        with self.transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS patients (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    age INTEGER NOT NULL,
+                    gender TEXT NOT NULL
+                )
+            """)
+            # serves both name prefix lookups and ORDER BY name, age, id
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_patients_name_age_id ON patients (name COLLATE NOCASE, age, id)
+            """)
+            if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                # version 0 databases also carry the single-column name index the one above replaces
+                conn.execute("DROP INDEX IF EXISTS idx_patients_name")
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_patients_age ON patients (age)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_patients_gender ON patients (gender)")
+        self.create_search_index()
+
+    def create_search_index(self):
+        # FTS5 is optional in SQLite builds; without it search falls back to an indexed LIKE prefix match
+        try:
+            with self.transaction() as conn:
+                exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name='patients_fts'").fetchone()
+                conn.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS patients_fts
+                    USING fts5(name, content='patients', content_rowid='id', prefix='2 3')
+                """)
+                conn.execute("""
+                    CREATE TRIGGER IF NOT EXISTS patients_fts_insert AFTER INSERT ON patients BEGIN
+                        INSERT INTO patients_fts (rowid, name) VALUES (new.id, new.name);
+                    END
+                """)
+                conn.execute("""
+                    CREATE TRIGGER IF NOT EXISTS patients_fts_delete AFTER DELETE ON patients BEGIN
+                        INSERT INTO patients_fts (patients_fts, rowid, name) VALUES ('delete', old.id, old.name);
+                    END
+                """)
+                conn.execute("""
+                    CREATE TRIGGER IF NOT EXISTS patients_fts_update AFTER UPDATE OF name ON patients BEGIN
+                        INSERT INTO patients_fts (patients_fts, rowid, name) VALUES ('delete', old.id, old.name);
+                        INSERT INTO patients_fts (rowid, name) VALUES (new.id, new.name);
+                    END
+                """)
+                if not exists:
+                    conn.execute("INSERT INTO patients_fts (patients_fts) VALUES ('rebuild')")
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            self.has_fts = False
 
     def add_patient(self, name, age, gender):
-        self.cursor.execute("INSERT INTO patients (name, age, gender) VALUES (?, ?, ?)", (name, age, gender))
-        self.conn.commit()
+        with self.transaction() as conn:
+            return conn.execute("INSERT INTO patients (name, age, gender) VALUES (?, ?, ?)",
+                                (name, age, gender)).lastrowid
 
     def get_all_patients(self):
-        self.cursor.execute("SELECT * FROM patients")
-        return self.cursor.fetchall()
+        return self.query("SELECT * FROM patients")
+
+    def get_patients_page(self, after_id=0, limit=200):
+        # keyset pagination: cost depends on the page size, not on how deep the page is
+        return self.query("SELECT * FROM patients WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit))
+
+    def get_patients_page_before(self, before_id, limit=200):
+        # the page that ends just before before_id, in ascending id order
+        rows = self.query("SELECT * FROM patients WHERE id < ? ORDER BY id DESC LIMIT ?", (before_id, limit))
+        rows.reverse()
+        return rows
+
+    def get_patients_sorted_page(self, after=None, limit=200):
+        # keyset pagination over (name, age, id); after is the last row of the previous page
+        if after is None:
+            return self.query("SELECT * FROM patients ORDER BY name COLLATE NOCASE, age, id LIMIT ?", (limit,))
+        patient_id, name, age = after[0], after[1], after[2]
+        return self.query("""
+            SELECT * FROM patients
+            WHERE name >= ? COLLATE NOCASE AND (name COLLATE NOCASE, age, id) > (?, ?, ?)
+            ORDER BY name COLLATE NOCASE, age, id LIMIT ?
+        """, (name, name, age, patient_id, limit))
+
+    def get_patients_sorted_page_before(self, before, limit=200):
+        # the (name, age, id) page that ends just before the row before, in ascending order
+        patient_id, name, age = before[0], before[1], before[2]
+        rows = self.query("""
+            SELECT * FROM patients
+            WHERE name <= ? COLLATE NOCASE AND (name COLLATE NOCASE, age, id) < (?, ?, ?)
+            ORDER BY name COLLATE NOCASE DESC, age DESC, id DESC LIMIT ?
+        """, (name, name, age, patient_id, limit))
+        rows.reverse()
+        return rows
+
+    def count_patients(self):
+        return self.query("SELECT COUNT(*) FROM patients")[0][0]
+
+    def search_patients(self, text="", age=None, gender=None, limit=50):
+        conditions = []
+        params = []
+        source = "patients"
+        terms = text.split()
+
+        if terms and self.has_fts:
+            # every term is a quoted prefix query, so user input can't inject FTS syntax
+            source = "patients_fts JOIN patients ON patients.id = patients_fts.rowid"
+            conditions.append("patients_fts MATCH ?")
+            params.append(" ".join('"' + term.replace('"', '""') + '"*' for term in terms))
+        elif terms:
+            conditions.append("name LIKE ? ESCAPE '\\'")
+            prefix = " ".join(terms).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(prefix + "%")
+
+        if age is not None:
+            conditions.append("age = ?")
+            params.append(age)
+        if gender:
+            conditions.append("gender = ?")
+            params.append(gender)
+
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        params.append(limit)
+        return self.query(f"SELECT patients.* FROM {source}{where} LIMIT ?", params)
+
+    def get_patients(self, patient_ids):
+        patient_ids = list(patient_ids)
+        if not patient_ids:
+            return []
+        placeholders = ", ".join("?" * len(patient_ids))
+        rows = {row[0]: row for row in self.query(f"SELECT * FROM patients WHERE id IN ({placeholders})", patient_ids)}
+        return [rows[patient_id] for patient_id in patient_ids if patient_id in rows]
+
+    def get_patient(self, patient_id):
+        rows = self.query("SELECT * FROM patients WHERE id=?", (patient_id,))
+        return rows[0] if rows else None
 
     def update_patient(self, patient_id, name, age, gender):
-        self.cursor.execute("UPDATE patients SET name=?, age=?, gender=? WHERE id=?", (name, age, gender, patient_id))
-        self.conn.commit()
+        with self.transaction() as conn:
+            conn.execute("UPDATE patients SET name=?, age=?, gender=? WHERE id=?", (name, age, gender, patient_id))
 
     def delete_patient(self, patient_id):
-        self.cursor.execute("DELETE FROM patients WHERE id=?", (patient_id,))
-        self.conn.commit()
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM patients WHERE id=?", (patient_id,))
+
+    # Bulk operations: one transaction and one executemany per call
+    def add_patients(self, patients):
+        with self.transaction() as conn:
+            return conn.executemany("INSERT INTO patients (name, age, gender) VALUES (?, ?, ?)", patients).rowcount
+
+    def update_patients(self, patients):
+        # patients: iterable of (patient_id, name, age, gender)
+        with self.transaction() as conn:
+            return conn.executemany("UPDATE patients SET name=?, age=?, gender=? WHERE id=?",
+                                    ((name, age, gender, patient_id)
+                                     for patient_id, name, age, gender in patients)).rowcount
+
+    def delete_patients(self, patient_ids):
+        with self.transaction() as conn:
+            return conn.executemany("DELETE FROM patients WHERE id=?",
+                                    ((patient_id,) for patient_id in patient_ids)).rowcount
+
+    def close(self):
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers = []
+        self._local = threading.local()
+        with self.write_lock:
+            self.conn.close()
@@ -0,0 +1,147 @@
+def patient_key(patient):
+    # name first, then age, then id so equal names still have a stable order
+    return (patient.name.lower(), int(patient.age), int(patient.id))
+
+class AVLNode:
+    def __init__(self, key, value):
+        self.key = key
+        self.value = value
+        self.left = None
+        self.right = None
+        self.height = 1
+
+def _height(node):
+    return node.height if node else 0
+
+def _update(node):
+    node.height = 1 + max(_height(node.left), _height(node.right))
+
+def _rotate_right(node):
+    pivot = node.left
+    node.left = pivot.right
+    pivot.right = node
+    _update(node)
+    _update(pivot)
+    return pivot
+
+def _rotate_left(node):
+    pivot = node.right
+    node.right = pivot.left
+    pivot.left = node
+    _update(node)
+    _update(pivot)
+    return pivot
+
+def _rebalance(node):
+    _update(node)
+    balance = _height(node.left) - _height(node.right)
+    if balance > 1:
+        if _height(node.left.left) < _height(node.left.right):
+            node.left = _rotate_left(node.left)
+        return _rotate_right(node)
+    if balance < -1:
+        if _height(node.right.right) < _height(node.right.left):
+            node.right = _rotate_right(node.right)
+        return _rotate_left(node)
+    return node
+
+class AVLTree:
+    def __init__(self, key=patient_key):
+        self.key = key
+        self.root = None
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return self.range()
+
+    def insert(self, value):
+        key = self.key(value)
+        new_node = AVLNode(key, value)
+        self.size += 1
+        if self.root is None:
+            self.root = new_node
+            return
+
+        # walk down without recursion, remembering the path for rebalancing
+        path = []
+        node = self.root
+        while node:
+            path.append(node)
+            node = node.left if key < node.key else node.right
+        parent = path[-1]
+        if key < parent.key:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+
+        # rebalance bottom-up and re-attach rotated subtrees to their parents
+        for depth in range(len(path) - 1, -1, -1):
+            node = path[depth]
+            old_height = node.height
+            balanced = _rebalance(node)
+            if depth:
+                parent = path[depth - 1]
+                if parent.left is node:
+                    parent.left = balanced
+                else:
+                    parent.right = balanced
+            else:
+                self.root = balanced
+            if balanced is node and node.height == old_height:
+                break
+
+    def insert_many(self, values):
+        for value in values:
+            self.insert(value)
+
+    def search(self, key):
+        node = self.root
+        while node:
+            if key == node.key:
+                return node.value
+            node = node.left if key < node.key else node.right
+        return None
+
+    def range(self, low=None, high=None):
+        # in-order generator over low <= key < high, skipping subtrees outside the bounds
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                if low is not None and node.key < low:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            if high is not None and not node.key < high:
+                return
+            yield node.value
+            node = node.right
+
+    def reverse_range(self, low=None, high=None):
+        # the same bounds as range, walked from the largest key down
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                if high is not None and not node.key < high:
+                    node = node.left
+                else:
+                    stack.append(node)
+                    node = node.right
+            if not stack:
+                return
+            node = stack.pop()
+            if low is not None and node.key < low:
+                return
+            yield node.value
+            node = node.left
+
+    def inorder_traversal(self):
+        return list(self.range())
@@ -1,20 +1,37 @@
+from collections import deque
+from itertools import islice
+
 class Queue:
-    # Initializing an empty list
-    def __init__(self):
-        self.items = []
+    # Initializing an empty deque, both ends are O(1)
+    def __init__(self, items=()):
+        self.items = deque(items)
 
     # We are adding a new item (FI-FO)
     def enqueue(self, item):
-        self.items.insert(0, item)
+        self.items.append(item)
 
     # Removing items (FI-FO) if empty return none
     def dequeue(self):
-        return self.items.pop() if not self.is_empty() else None
+        return self.items.popleft() if not self.is_empty() else None
+
+    # Looking at the next item without removing it
+    def peek(self):
+        return self.items[0] if not self.is_empty() else None
 
     #See if queue is empty then return True otherwise false
     def is_empty(self):
         return len(self.items) == 0
 
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    # Items in queue order, optionally only the first few
+    def display(self, limit=None):
+        return list(islice(self.items, limit))
+
     def checkout(self):
         if self.is_empty():
             return "No patients to checkout."
@@ -0,0 +1,55 @@
+from collections import defaultdict
+
+def trigrams(text):
+    # pad so short words and word starts still produce trigrams
+    text = "  " + " ".join(text.lower().split()) + " "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class TrigramIndex:
+    def __init__(self):
+        self.postings = defaultdict(set)
+        self.grams = {}
+
+    def __len__(self):
+        return len(self.grams)
+
+    def __contains__(self, key):
+        return key in self.grams
+
+    def add(self, key, text):
+        if key in self.grams:
+            self.remove(key)
+        grams = trigrams(text)
+        self.grams[key] = grams
+        for gram in grams:
+            self.postings[gram].add(key)
+
+    def remove(self, key):
+        grams = self.grams.pop(key, None)
+        if grams is None:
+            return
+        for gram in grams:
+            keys = self.postings[gram]
+            keys.discard(key)
+            if not keys:
+                del self.postings[gram]
+
+    def search(self, text, limit=20, threshold=0.3):
+        query = trigrams(text)
+        if not query:
+            return []
+
+        # count shared trigrams per candidate
+        counts = defaultdict(int)
+        for gram in query:
+            for key in self.postings.get(gram, ()):
+                counts[key] += 1
+
+        results = []
+        for key, shared in counts.items():
+            # Dice coefficient between the two trigram sets
+            score = 2.0 * shared / (len(query) + len(self.grams[key]))
+            if score >= threshold:
+                results.append((score, key))
+        results.sort(key=lambda result: (-result[0], result[1]))
+        return results[:limit]
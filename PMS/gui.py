@@ -1,18 +1,27 @@
 # File: gui.py
 import tkinter as tk
+from itertools import islice
 from tkinter import messagebox, ttk
 from database import DatabaseManager
 from patient import Patient
-from datastructures.queue import Queue
-from datastructures.binarySearch import BST
+from search import PatientSearch
+from appointments import AppointmentQueue, TRIAGE_LEVELS
+from datastructures.avlTree import AVLTree, patient_key
+
+PAGE_SIZE = 200
+# the table keeps a sliding window of pages; rows scrolled far out of view are dropped and re-fetched on the way back
+MAX_LOADED_ROWS = 5 * PAGE_SIZE
+QUEUE_WINDOW = 100
 
 class PatientApp:
     def __init__(self, root):
         self.db = DatabaseManager()
+        self.search = PatientSearch(self.db)
+        self.search.start_fuzzy_index()
         self.root = root
         self.root.title("Patient Management System")
 
-        self.appointment_queue = Queue()  # initialize the queue
+        self.appointment_queue = AppointmentQueue(self.db)  # restores appointments saved in the database
 
         # Form Frame
         form_frame = tk.LabelFrame(root, text="Add / Update Patient", padx=10, pady=10)
@@ -21,20 +30,35 @@ class PatientApp:
         tk.Label(form_frame, text="Name:").grid(row=0, column=0, sticky="e")
         tk.Label(form_frame, text="Age:").grid(row=1, column=0, sticky="e")
         tk.Label(form_frame, text="Gender:").grid(row=2, column=0, sticky="e")
+        tk.Label(form_frame, text="Triage:").grid(row=3, column=0, sticky="e")
 
         self.name_var = tk.StringVar()
         self.age_var = tk.StringVar()
         self.gender_var = tk.StringVar()
+        self.triage_var = tk.StringVar(value=TRIAGE_LEVELS[-1])
 
         tk.Entry(form_frame, textvariable=self.name_var).grid(row=0, column=1)
         tk.Entry(form_frame, textvariable=self.age_var).grid(row=1, column=1)
         tk.Entry(form_frame, textvariable=self.gender_var).grid(row=2, column=1)
+        ttk.Combobox(form_frame, textvariable=self.triage_var, values=TRIAGE_LEVELS,
+                     state="readonly", width=17).grid(row=3, column=1)
 
         self.add_btn = tk.Button(form_frame, text="Add Patient", command=self.add_patient)
-        self.add_btn.grid(row=3, column=0, pady=10)
+        self.add_btn.grid(row=4, column=0, pady=10)
 
         self.update_btn = tk.Button(form_frame, text="Update Patient", command=self.update_patient)
-        self.update_btn.grid(row=3, column=1, pady=10)
+        self.update_btn.grid(row=4, column=1, pady=10)
+
+        # Search Frame
+        search_frame = tk.LabelFrame(root, text="Search Patients", padx=10, pady=10)
+        search_frame.pack(padx=10, pady=(0, 10), fill="x")
+
+        self.search_var = tk.StringVar()
+        search_entry = tk.Entry(search_frame, textvariable=self.search_var)
+        search_entry.pack(side="left", fill="x", expand=True)
+        search_entry.bind("<Return>", lambda event: self.search_patients())
+        tk.Button(search_frame, text="Search", command=self.search_patients).pack(side="left", padx=5)
+        tk.Button(search_frame, text="Clear", command=self.clear_search).pack(side="left")
 
         # Table Frame
         table_frame = tk.LabelFrame(root, text="Patient Records", padx=10, pady=10)
@@ -45,7 +69,18 @@ class PatientApp:
         self.tree.heading("Name", text="Name")
         self.tree.heading("Age", text="Age")
         self.tree.heading("Gender", text="Gender")
+
+        # rows are fetched a page at a time as the user scrolls towards either end
+        self.tree_scroll = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.on_tree_scroll)
+        self.tree_scroll.pack(side="right", fill="y")
         self.tree.pack(fill="both", expand=True)
+        self.sort_order = "id"
+        self.sorted_index = None
+        self.search_text = ""
+        self.has_more = False
+        self.has_before = False
+        self.loading = False
 
         self.tree.bind("<ButtonRelease-1>", self.select_patient)
 
@@ -67,6 +102,9 @@ class PatientApp:
         # Sort Button
         self.sort_btn = tk.Button(root, text="Sort Patients Alphabetically", command=self.sort_patients)
         self.sort_btn.pack(pady=5)
+        # sort with ORDER BY on the (name, age, id) index; unchecked sorts in memory with an AVL tree
+        self.sort_in_database = tk.BooleanVar(value=True)
+        tk.Checkbutton(root, text="Sort in database", variable=self.sort_in_database).pack()
 
     def add_patient(self):
         name = self.name_var.get().strip()
@@ -83,11 +121,18 @@ class PatientApp:
             messagebox.showerror("Error", "Age must be a number")
             return
 
-        self.db.add_patient(name, age, gender)
-        self.appointment_queue.enqueue(f"{name} ({gender}, {age})")  # add to queue
+        patient_id = self.db.add_patient(name, age, gender)
+        self.search.patient_added(patient_id, name)
+        priority = TRIAGE_LEVELS.index(self.triage_var.get())
+        self.appointment_queue.enqueue(patient_id, f"{name} ({gender}, {age})", priority)  # add to queue
         messagebox.showinfo("Success", "Patient added and added to appointment queue")
         self.clear_form()
-        self.load_patients()
+        # search results are re-queried so the filter decides whether the new row shows up;
+        # unloaded pages will pick the new row up when scrolled to
+        if self.sort_order == "search":
+            self.show_search_results()
+        elif not self.has_more and self.sort_order == "id":
+            self.insert_row((patient_id, name, age, gender))
 
     def update_patient(self):
         if not self.selected_id:
@@ -108,10 +153,13 @@ class PatientApp:
             messagebox.showerror("Error", "Age must be a number")
             return
 
-        self.db.update_patient(self.selected_id, name, age, gender)
+        patient_id = self.selected_id
+        self.db.update_patient(patient_id, name, age, gender)
+        self.search.patient_updated(patient_id, name)
         messagebox.showinfo("Success", "Patient updated successfully")
         self.clear_form()
-        self.load_patients()
+        if self.tree.exists(str(patient_id)):
+            self.tree.item(str(patient_id), values=(patient_id, name, age, gender))
 
     def delete_patient(self):
         selected = self.tree.focus()
@@ -125,9 +173,12 @@ class PatientApp:
         confirm = messagebox.askyesno("Confirm Delete", f"Delete patient {values[1]}?")
         if confirm:
             self.db.delete_patient(patient_id)
+            self.search.patient_deleted(patient_id)
+            self.appointment_queue.remove_patient(patient_id)
             messagebox.showinfo("Deleted", "Patient deleted successfully")
             self.clear_form()
-            self.load_patients()
+            if self.tree.exists(str(patient_id)):
+                self.tree.delete(str(patient_id))
 
     def select_patient(self, event):
         selected = self.tree.focus()
@@ -144,24 +195,144 @@ class PatientApp:
         self.name_var.set("")
         self.age_var.set("")
         self.gender_var.set("")
+        self.triage_var.set(TRIAGE_LEVELS[-1])
         self.selected_id = None
 
-    def load_patients(self):
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-        for row in self.db.get_all_patients():
-            self.tree.insert("", "end", values=row)
+    def insert_row(self, row, index="end"):
+        # the patient id doubles as the Treeview item id so single rows can be found directly
+        self.tree.insert("", index, iid=str(row[0]), values=row)
+
+    def edge_row(self, last):
+        children = self.tree.get_children()
+        if not children:
+            return None
+        values = self.tree.item(children[-1 if last else 0], 'values')
+        return int(values[0]), str(values[1]), int(values[2]), str(values[3])
+
+    def clear_tree(self):
+        self.tree.delete(*self.tree.get_children())
+
+    def load_patients(self, sort_order="id"):
+        self.clear_tree()
+        self.sort_order = sort_order
+        self.has_more = True
+        self.has_before = False
+        self.load_next_page()
+
+    def fetch_page(self, after):
+        if self.sort_order == "name":
+            return self.db.get_patients_sorted_page(after, PAGE_SIZE)
+        if self.sort_order == "index":
+            return self.index_page(after, forward=True)
+        return self.db.get_patients_page(after[0] if after else 0, PAGE_SIZE)
+
+    def fetch_previous_page(self, before):
+        if self.sort_order == "name":
+            return self.db.get_patients_sorted_page_before(before, PAGE_SIZE)
+        if self.sort_order == "index":
+            return self.index_page(before, forward=False)
+        return self.db.get_patients_page_before(before[0], PAGE_SIZE)
+
+    def index_page(self, row, forward):
+        key = None if row is None else (row[1].lower(), row[2], row[0])
+        if forward:
+            patients = (patient for patient in self.sorted_index.range(low=key) if patient_key(patient) != key)
+        else:
+            patients = self.sorted_index.reverse_range(high=key)
+        rows = [(patient.id, patient.name, patient.age, patient.gender) for patient in islice(patients, PAGE_SIZE)]
+        return rows if forward else rows[::-1]
+
+    def load_next_page(self):
+        if not self.has_more or self.loading:
+            return
+        self.loading = True
+        try:
+            anchor = self.tree.get_children()[-1:]
+            rows = self.fetch_page(self.edge_row(last=True))
+            for row in rows:
+                if not self.tree.exists(str(row[0])):
+                    self.insert_row(row)
+            self.has_more = len(rows) == PAGE_SIZE
+            self.trim_window(from_start=True, anchor=anchor)
+        finally:
+            self.loading = False
+
+    def load_previous_page(self):
+        if not self.has_before or self.loading:
+            return
+        self.loading = True
+        try:
+            anchor = self.tree.get_children()[:1]
+            first = self.edge_row(last=False)
+            rows = self.fetch_previous_page(first) if first else []
+            position = 0
+            for row in rows:
+                if not self.tree.exists(str(row[0])):
+                    self.insert_row(row, position)
+                    position += 1
+            self.has_before = len(rows) == PAGE_SIZE
+            self.trim_window(from_start=False, anchor=anchor)
+        finally:
+            self.loading = False
+
+    def trim_window(self, from_start, anchor):
+        children = self.tree.get_children()
+        excess = len(children) - MAX_LOADED_ROWS
+        if excess <= 0:
+            return
+        if from_start:
+            self.tree.delete(*children[:excess])
+            self.has_before = True
+        else:
+            self.tree.delete(*children[-excess:])
+            self.has_more = True
+        # keep the row the user was looking at in view after the window shifts
+        if anchor and self.tree.exists(anchor[0]):
+            self.tree.see(anchor[0])
+
+    def on_tree_scroll(self, first, last):
+        self.tree_scroll.set(first, last)
+        if self.has_more and float(last) > 0.9:
+            self.root.after_idle(self.load_next_page)
+        elif self.has_before and float(first) < 0.1:
+            self.root.after_idle(self.load_previous_page)
+
+    def search_patients(self):
+        text = self.search_var.get().strip()
+        if not text:
+            self.clear_search()
+            return
+
+        self.search_text = text
+        self.show_search_results()
+
+    def show_search_results(self):
+        self.clear_tree()
+        self.sort_order = "search"
+        self.has_more = False
+        self.has_before = False
+        for row in self.search.search(self.search_text, limit=PAGE_SIZE):
+            self.insert_row(row)
+
+    def clear_search(self):
+        self.search_var.set("")
+        self.load_patients()
 
     def view_queue(self):
         queue_window = tk.Toplevel(self.root)
         queue_window.title("Appointment Queue")
 
 
-        tk.Label(queue_window, text="Patients in Queue:", font=("Arial", 12)).pack(pady=10)
-        queue_listbox = tk.Listbox(queue_window, width=40)
+        waiting = len(self.appointment_queue)
+        title = f"Patients in Queue: {waiting}"
+        if waiting > QUEUE_WINDOW:
+            title += f" (showing next {QUEUE_WINDOW})"
+        tk.Label(queue_window, text=title, font=("Arial", 12)).pack(pady=10)
+        queue_listbox = tk.Listbox(queue_window, width=50)
         queue_listbox.pack(padx=10, pady=10)
 
-        for item in self.appointment_queue.display():
+        # only the front of the queue is materialized
+        for item in self.appointment_queue.display(QUEUE_WINDOW):
             queue_listbox.insert(tk.END, item)
 
     def checkout_patient(self):
@@ -169,19 +340,21 @@ class PatientApp:
         messagebox.showinfo("Checkout Result", result)
 
     def sort_patients(self):
-        bst = BST()
-        patients = self.db.get_all_patients()
-
-        for row in patients:
-            patient = Patient(row[0], row[1], row[2], row[3])
-            bst.insert(patient)
-
-        sorted_patients = bst.inorder_traversal()
-
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-
-        for patient in sorted_patients:
-            self.tree.insert("", "end", values=(patient.id, patient.name, patient.age, patient.gender))
-
-        messagebox.showinfo("Sorted", "Patients sorted alphabetically by name.")
\ No newline at end of file
+        if self.sort_in_database.get():
+            self.load_patients("name")
+        else:
+            index = AVLTree()
+            last_id = 0
+            while True:
+                rows = self.db.get_patients_page(last_id, 10000)
+                for row in rows:
+                    index.insert(Patient(row[0], row[1], row[2], row[3]))
+                if len(rows) < 10000:
+                    break
+                last_id = rows[-1][0]
+
+            # pages are read from the tree with range queries in either direction
+            self.sorted_index = index
+            self.load_patients("index")
+
+        messagebox.showinfo("Sorted", "Patients sorted alphabetically by name.")
@@ -0,0 +1,82 @@
+import threading
+from datastructures.trigramIndex import TrigramIndex
+
+class PatientSearch:
+    def __init__(self, db, page_size=10000, threshold=0.3):
+        self.db = db
+        self.page_size = page_size
+        self.threshold = threshold
+        self.fuzzy_index = None
+        self._lock = threading.Lock()
+        self._pending = None
+        self._builder = None
+
+    def search(self, text, age=None, gender=None, limit=50, fuzzy=True):
+        # indexed prefix/token search first; fuzzy matching only runs when that finds nothing
+        rows = self.db.search_patients(text, age, gender, limit)
+        if rows or not fuzzy or not text.strip() or self.fuzzy_index is None:
+            return rows
+
+        candidates = [patient_id for score, patient_id in self.fuzzy_index.search(text, limit * 4, self.threshold)]
+        for row in self.db.get_patients(candidates):
+            if age is not None and row[2] != age:
+                continue
+            if gender and row[3] != gender:
+                continue
+            rows.append(row)
+            if len(rows) >= limit:
+                break
+        return rows
+
+    def start_fuzzy_index(self):
+        # the trigram index is built on a worker thread so the first search doesn't stall the caller;
+        # until it is ready, searches return the SQL matches only
+        with self._lock:
+            if self.fuzzy_index is None and self._builder is None:
+                self._pending = []
+                self._builder = threading.Thread(target=self._build_fuzzy_index, name="FuzzyIndexBuilder",
+                                                  daemon=True)
+                self._builder.start()
+            return self._builder
+
+    def _build_fuzzy_index(self):
+        index = TrigramIndex()
+        last_id = 0
+        while True:
+            rows = self.db.get_patients_page(last_id, self.page_size)
+            for row in rows:
+                index.add(row[0], row[1])
+            if len(rows) < self.page_size:
+                break
+            last_id = rows[-1][0]
+
+        # replay single-row changes made while the table was being read
+        with self._lock:
+            for patient_id, name in self._pending:
+                self._apply(index, patient_id, name)
+            self._pending = None
+            self.fuzzy_index = index
+
+    @staticmethod
+    def _apply(index, patient_id, name):
+        if name is None:
+            index.remove(patient_id)
+        else:
+            index.add(patient_id, name)
+
+    def _changed(self, patient_id, name):
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((int(patient_id), name))
+            elif self.fuzzy_index is not None:
+                self._apply(self.fuzzy_index, int(patient_id), name)
+
+    # keep the fuzzy index in step with single-row changes
+    def patient_added(self, patient_id, name):
+        self._changed(patient_id, name)
+
+    def patient_updated(self, patient_id, name):
+        self._changed(patient_id, name)
+
+    def patient_deleted(self, patient_id):
+        self._changed(patient_id, None)
@@ -0,0 +1,78 @@
+import pytest
+
+from appointments import AppointmentQueue
+from database import DatabaseManager
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def db():
+    manager = DatabaseManager(":memory:")
+    manager.add_patients([(f"patient{index}", 30, "F") for index in range(1, 6)])
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def test_patients_are_seen_by_triage_level_then_arrival(db, clock):
+    queue = AppointmentQueue(db, clock=clock)
+    for patient_id, priority in [(1, 2), (2, 0), (3, 1), (4, 0)]:
+        queue.enqueue(patient_id, f"patient{patient_id}", priority)
+        clock.now += 1
+
+    assert [queue.dequeue().patient_id for _ in range(4)] == [2, 4, 3, 1]
+    assert queue.dequeue() is None and queue.is_empty()
+
+
+def test_waiting_patients_age_up_the_triage_levels(db, clock):
+    queue = AppointmentQueue(db, aging_interval=100.0, clock=clock)
+    queue.enqueue(1, "patient1", 2)
+    clock.now = 150.0
+    queue.enqueue(2, "patient2", 1)
+
+    assert queue.display() == ["patient1 [Priority]", "patient2 [Priority]"]
+    clock.now = 250.0
+    assert queue.checkout() == "Checked out patient: patient1 [Urgent]"
+
+
+def test_queue_is_restored_from_the_database(db, clock):
+    queue = AppointmentQueue(db, clock=clock)
+    queue.enqueue(1, "patient1", 2)
+    queue.enqueue(2, "patient2", 0)
+    queue.dequeue()
+    queue.enqueue(3, "patient3", 1)
+
+    restored = AppointmentQueue(db, clock=clock)
+
+    assert len(restored) == 2
+    assert restored.display() == ["patient3 (F, 30) [Priority]", "patient1 (F, 30) [Routine]"]
+
+
+def test_removing_a_patient_drops_their_queued_appointments(db, clock):
+    queue = AppointmentQueue(db, clock=clock)
+    queue.enqueue(1, "patient1", 0)
+    queue.enqueue(2, "patient2", 1)
+    queue.enqueue(1, "patient1 again", 2)
+
+    assert queue.remove_patient("1") == 2
+    assert [appointment.patient_id for appointment in queue.snapshot()] == [2]
+    assert queue.dequeue().patient_id == 2
+    assert len(AppointmentQueue(db, clock=clock)) == 0
+
+
+def test_deleting_a_patient_cascades_to_saved_appointments(db, clock):
+    AppointmentQueue(db, clock=clock).enqueue(5, "patient5", 1)
+    db.delete_patient(5)
+
+    assert len(AppointmentQueue(db, clock=clock)) == 0
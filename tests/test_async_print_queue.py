@@ -0,0 +1,75 @@
+import asyncio
+import threading
+
+from AsyncPrintQueue import AsyncPrintQueueManager
+from EventLog import LogLevel
+from Project import PrintQueueManager
+
+
+def test_cross_thread_enqueue_wakes_waiting_claim_with_logging_off():
+    manager = PrintQueueManager(engine="heap", verbose=False, log_level=LogLevel.OFF)
+    front = AsyncPrintQueueManager(manager)
+
+    async def scenario():
+        waiter = asyncio.create_task(front.claim_job(timeout=5.0))
+        await asyncio.sleep(0.05)
+        producer = threading.Thread(target=manager.enqueue_job, args=("alice", "job1", 1))
+        producer.start()
+        job = await waiter
+        producer.join()
+        return job
+
+    job = asyncio.run(scenario())
+    front.close()
+    assert job is not None
+    assert job.job_id == "job1"
+
+
+def test_queue_listener_is_independent_of_log_level():
+    manager = PrintQueueManager(verbose=False, log_level=LogLevel.OFF)
+    changes = []
+    manager.add_queue_listener(changes.append)
+
+    manager.enqueue_job("alice", "job1", 1)
+    manager.claim_job()
+    manager.remove_queue_listener(changes.append)
+    manager.enqueue_job("alice", "job2", 1)
+
+    assert changes == ["enqueued", "claimed"]
+
+
+def test_claim_timeout_is_an_overall_deadline_despite_spurious_wakeups():
+    front = AsyncPrintQueueManager(PrintQueueManager(verbose=False))
+
+    async def scenario():
+        async def nudge():
+            while True:
+                await asyncio.sleep(0.02)
+                front._jobs_available.set()
+
+        nudger = asyncio.create_task(nudge())
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        job = await asyncio.wait_for(front.claim_job(timeout=0.2), 2.0)
+        nudger.cancel()
+        return job, loop.time() - started
+
+    job, elapsed = asyncio.run(scenario())
+    front.close()
+    assert job is None
+    assert elapsed < 1.0
+
+
+def test_front_end_rebinds_to_a_new_event_loop():
+    front = AsyncPrintQueueManager(PrintQueueManager(verbose=False))
+
+    async def submit_and_claim(job_id):
+        waiter = asyncio.create_task(front.claim_job(timeout=1.0))
+        await asyncio.sleep(0.02)
+        await front.enqueue_job("alice", job_id, 1)
+        return await waiter
+
+    first = asyncio.run(submit_and_claim("job1"))
+    second = asyncio.run(submit_and_claim("job2"))
+    front.close()
+    assert (first.job_id, second.job_id) == ("job1", "job2")
@@ -0,0 +1,22 @@
+from database import DatabaseManager
+from datastructures.avlTree import AVLTree
+from patient import Patient
+
+
+def test_reverse_range_mirrors_range():
+    tree = AVLTree(key=lambda value: value)
+    tree.insert_many([5, 1, 9, 3, 7, 3, 8, 2])
+
+    assert list(tree.reverse_range()) == sorted(tree.range(), reverse=True)
+    assert list(tree.reverse_range(low=3, high=8)) == [7, 5, 3, 3]
+    assert list(tree.reverse_range(high=1)) == []
+
+
+def test_patient_index_matches_the_database_sort_order():
+    db = DatabaseManager(":memory:")
+    db.add_patients([(name, 30 + index % 2, "M") for index, name in enumerate(["bob", "Al", "al", "Bob", "al"] * 3)])
+    index = AVLTree()
+    index.insert_many(Patient(*row) for row in db.get_patients_page(0, 100))
+
+    assert [patient.id for patient in index] == [row[0] for row in db.get_patients_sorted_page(None, 100)]
+    db.close()
@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+import Project
+from EventLog import LogLevel
+from Project import BatchTickEngine, PrintJob, PrintQueueManager
+
+requires_numpy = pytest.mark.skipif(Project.np is None, reason="NumPy is not installed")
+SCAN_MODES = ["rows", pytest.param("vectorized", marks=requires_numpy)]
+
+
+def run_workload(engine, batch_tick, seed=7):
+    rng = random.Random(seed)
+    manager = PrintQueueManager(capacity=2000, engine=engine, batch_tick=batch_tick, aging_interval=3.0,
+                                default_expiry=40.0, verbose=False, log_level=LogLevel.OFF)
+    job_number = 0
+    for step in range(120):
+        for _ in range(rng.randrange(0, 12)):
+            expiry = rng.choice([None, 10.0, 25.0])
+            manager.enqueue_job(f"user{rng.randrange(6)}", f"job{job_number}", rng.randint(1, 5),
+                                expiry_time=expiry)
+            job_number += 1
+        for _ in range(rng.randrange(0, 4)):
+            manager.print_job()
+        if rng.random() < 0.2:
+            manager.cancel_job(f"job{rng.randrange(max(1, job_number))}")
+        manager.tick(rng.choice([0.5, 1.0, 2.5]))
+
+    queued = [(job.job_id, job.priority, job.last_aged) for job in manager.queue.get_all_jobs()]
+    printed = [job.job_id for job in manager.completed_jobs]
+    expired = sorted(job.job_id for job in manager.expiry_handler.expired_jobs)
+    return manager.stats, queued, printed, expired
+
+
+@pytest.mark.parametrize("engine", ["circular", "heap", "sharded", "fairshare"])
+@pytest.mark.parametrize("scan", SCAN_MODES)
+def test_batched_tick_matches_standard_tick(engine, scan, monkeypatch):
+    standard = run_workload(engine, batch_tick=False)
+    if scan == "rows":
+        monkeypatch.setattr(Project, "np", None)
+    batched = run_workload(engine, batch_tick=True)
+
+    assert standard[0]['jobs_aged'] > 0 and standard[0]['total_expired'] > 0
+    assert batched == standard
+
+
+def test_circular_aging_resorts_in_one_pass():
+    manager = PrintQueueManager(capacity=50, engine="circular", aging_interval=1.0,
+                                verbose=False, log_level=LogLevel.OFF)
+    for index in range(20):
+        manager.enqueue_job(f"user{index % 3}", f"job{index}", 5 - index % 5)
+    manager.tick(1.0)
+
+    jobs = manager.queue.get_all_jobs()
+    assert jobs == sorted(jobs)
+    assert manager.queue.total_jobs_submitted == 20
+
+
+def run_scans(scan, seed=11):
+    rng = random.Random(seed)
+    engine = BatchTickEngine(aging_interval=2.0)
+    jobs = {}
+    results = []
+    now = 0.0
+    for step in range(200):
+        for _ in range(rng.randrange(0, 6)):
+            job = PrintJob(user_id="u", job_id=f"job{len(jobs)}", priority=rng.randint(1, 5), submission_time=now,
+                           last_aged=now, expiry_time=rng.choice([5.0, 12.5, 30.0]))
+            jobs[job.job_id] = job
+            engine.track_job(job)
+        if jobs and rng.random() < 0.3:
+            engine.untrack_job(jobs[rng.choice(list(jobs))])
+        now += rng.choice([0.5, 1.0, 1.5])
+        aged_rows, expired_rows = scan(engine, now)
+        for row in expired_rows:
+            engine.untrack_job(engine._jobs[row])
+        results.append((list(aged_rows), list(expired_rows), list(engine.table.priority)))
+    return results
+
+
+@requires_numpy
+def test_vectorized_scan_matches_row_scan():
+    rows = run_scans(BatchTickEngine._scan_rows)
+    vectorized = run_scans(BatchTickEngine._scan_vectorized)
+
+    assert any(aged for aged, _, _ in rows) and any(expired for _, expired, _ in rows)
+    assert vectorized == rows
+
+
+@pytest.mark.parametrize("option", ["incremental_aging", "indexed_expiry"])
+def test_batch_tick_rejects_the_incremental_tick_modes(option):
+    with pytest.raises(ValueError):
+        PrintQueueManager(batch_tick=True, **{option: True})
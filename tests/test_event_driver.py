@@ -0,0 +1,46 @@
+import io
+import sys
+
+from EventDriver import ENQUEUE_JOB, EventDriver, read_events, read_jsonl_events
+from EventLog import LogLevel
+from Project import PrintQueueManager
+
+
+def test_reading_stdin_leaves_it_open(monkeypatch):
+    stdin = io.StringIO('{"event": "tick"}\n{"event": "print_job"}\n')
+    monkeypatch.setattr(sys, "stdin", stdin)
+
+    events = list(read_events("-"))
+
+    assert [event_type for event_type, _ in events] == ["tick", "print_job"]
+    assert not stdin.closed
+
+
+def test_report_counts_duplicate_job_ids_as_rejected():
+    job_ids = ["a", "a", "b", "a", "c", "b", "d"]
+    for batch_size in (1, 2, 3, 1000):
+        manager = PrintQueueManager(capacity=3, verbose=False, log_level=LogLevel.OFF)
+        events = [(ENQUEUE_JOB, {"user_id": "u", "job_id": job_id, "priority": 1}) for job_id in job_ids]
+
+        report = EventDriver(manager, batch_size=batch_size).run(events)
+
+        assert report.jobs_submitted == manager.stats['total_submitted'] == 3
+        assert report.jobs_rejected == len(job_ids) - 3
+
+
+def test_replay_accepts_numeric_user_ids():
+    stream = io.StringIO(
+        '{"event": "enqueue_job", "user_id": 7, "job_id": "a", "priority": 1}\n'
+        '{"event": "enqueue_job", "user_id": 8, "job_id": "b", "priority": 2}\n'
+        '{"event": "tick"}\n'
+        '{"event": "print_job"}\n'
+    )
+    for engine in ("circular", "heap", "sharded", "fairshare"):
+        manager = PrintQueueManager(engine=engine, verbose=False, log_level=LogLevel.OFF)
+        stream.seek(0)
+
+        report = EventDriver(manager, show_status=False).run(read_jsonl_events(stream))
+
+        assert report.jobs_submitted == 2
+        assert manager.stats['total_printed'] == 1
+        assert manager.registry.get("a").user_id == 7
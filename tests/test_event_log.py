@@ -0,0 +1,69 @@
+import io
+import threading
+
+from EventLog import EventLog, LogLevel
+from Project import PrintQueueManager
+
+
+class FailingSink(io.StringIO):
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def write(self, text):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+        return super().write(text)
+
+
+class BlockedSink(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def write(self, text):
+        self.release.wait()
+        return super().write(text)
+
+
+def test_listeners_receive_events_below_the_log_level():
+    event_log = EventLog(level=LogLevel.OFF)
+    received = []
+    event_log.add_listener(received.append)
+
+    assert event_log.log(1.0, LogLevel.INFO, "job_added", user_id="u", job_id="j", priority=1) is None
+    assert [record.kind for record in received] == ["job_added"]
+    assert len(event_log) == 0
+
+
+def test_manager_does_not_echo_by_default(capsys):
+    manager = PrintQueueManager()
+    manager.enqueue_job("alice", "job1", 1)
+    manager.print_job()
+
+    assert capsys.readouterr().out == ""
+    assert len(manager.event_log) == 2
+
+
+def test_sink_errors_are_counted_and_the_writer_keeps_draining():
+    sink = FailingSink(failures=1)
+    event_log = EventLog(sink=sink, batch_size=1)
+    event_log.log(1.0, LogLevel.INFO, "queue_empty")
+    event_log.log(2.0, LogLevel.INFO, "queue_empty")
+    event_log.close()
+
+    assert event_log.sink_errors == 1
+    assert sink.getvalue() == "[2.0s] No jobs to print - queue is empty!\n"
+
+
+def test_sink_buffer_is_bounded():
+    sink = BlockedSink()
+    event_log = EventLog(sink=sink, batch_size=1, sink_buffer=4)
+    for index in range(20):
+        event_log.log(float(index), LogLevel.INFO, "queue_empty")
+
+    assert 0 < event_log.sink_dropped <= 20 - 4
+    sink.release.set()
+    event_log.close()
+    assert sink.getvalue().count("\n") == 20 - event_log.sink_dropped
@@ -0,0 +1,36 @@
+from Project import FairShareQueue, PrintJob
+
+
+def make_job(user_id, job_id, priority=1):
+    return PrintJob(user_id=user_id, job_id=job_id, priority=priority)
+
+
+def test_zero_quota_rejects_a_users_first_job():
+    queue = FairShareQueue(quotas={"alice": 0})
+
+    assert not queue.enqueue_job(make_job("alice", "a1"))
+    assert queue.enqueue_job(make_job("bob", "b1"))
+    assert queue.pending_jobs("alice") == 0
+    assert queue.user_stats["alice"].rejected == 1
+    assert "a1" not in queue
+
+
+def test_default_quota_of_zero_applies_before_a_user_has_jobs():
+    queue = FairShareQueue(default_quota=0)
+
+    assert queue.enqueue_many([make_job("alice", "a1"), make_job("bob", "b1")]) == [False, False]
+    assert queue.is_empty()
+
+
+def test_quota_of_one_admits_one_pending_job_at_a_time():
+    queue = FairShareQueue(default_quota=1)
+
+    assert queue.enqueue_many([make_job("alice", "a1"), make_job("alice", "a2"), make_job("bob", "b1")]) == [
+        True, False, True
+    ]
+    assert queue.pending_jobs("alice") == 1
+
+    queue.remove_job("a1")
+    assert queue.enqueue_job(make_job("alice", "a3"))
+    assert not queue.enqueue_job(make_job("alice", "a4"))
+    assert queue.user_stats["alice"].rejected == 2
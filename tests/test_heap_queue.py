@@ -0,0 +1,69 @@
+import pytest
+
+from Project import HeapPriorityQueue, PrintJob, PrintQueueManager
+
+
+def make_job(job_id, priority, submitted, user_id="alice"):
+    return PrintJob(user_id=user_id, job_id=job_id, priority=priority,
+                    submission_time=submitted, last_aged=submitted)
+
+
+def drain(queue):
+    order = []
+    while not queue.is_empty():
+        order.append(queue.dequeue_job().job_id)
+    return order
+
+
+def test_dequeues_by_priority_then_submission_time():
+    queue = HeapPriorityQueue(capacity=10)
+    for job in (make_job("late", 2, 5.0), make_job("urgent", 1, 9.0), make_job("early", 2, 1.0),
+                make_job("low", 5, 0.0)):
+        assert queue.enqueue_job(job)
+
+    assert queue.peek_job().job_id == "urgent"
+    assert [job.job_id for job in queue.top_jobs(2)] == ["urgent", "early"]
+    assert drain(queue) == ["urgent", "early", "late", "low"]
+
+
+def test_equal_keys_keep_submission_order():
+    queue = HeapPriorityQueue(capacity=10)
+    for index in range(5):
+        queue.enqueue_job(make_job(f"job{index}", 3, 1.0))
+
+    assert drain(queue) == [f"job{index}" for index in range(5)]
+
+
+def test_rejects_duplicates_and_jobs_beyond_capacity():
+    queue = HeapPriorityQueue(capacity=2)
+
+    assert queue.enqueue_job(make_job("a", 1, 0.0))
+    assert not queue.enqueue_job(make_job("a", 1, 0.0))
+    assert queue.enqueue_many([make_job("b", 1, 0.0), make_job("c", 1, 0.0)]) == [True, False]
+    assert queue.is_full()
+    assert queue.total_jobs_submitted == 2
+
+
+def test_remove_and_reposition_keep_the_heap_ordered():
+    queue = HeapPriorityQueue(capacity=10)
+    jobs = [make_job(f"job{index}", 5, float(index)) for index in range(6)]
+    queue.enqueue_many(jobs)
+
+    assert queue.remove_job("job0")
+    assert not queue.remove_job("job0")
+    jobs[4].priority = 1
+    assert queue.reposition_job(jobs[4])
+
+    assert drain(queue) == ["job4", "job1", "job2", "job3", "job5"]
+
+
+@pytest.mark.parametrize("engine", ["circular", "heap"])
+def test_manager_dispatch_order_matches_across_engines(engine):
+    manager = PrintQueueManager(capacity=20, engine=engine, aging_interval=100.0, policy="aging")
+    for index, priority in enumerate([3, 1, 2, 1, 3, 2]):
+        manager.enqueue_job("alice", f"job{index}", priority)
+        manager.tick()
+
+    printed = [manager.print_job().job_id for _ in range(6)]
+
+    assert printed == ["job1", "job3", "job2", "job5", "job0", "job4"]
@@ -0,0 +1,51 @@
+import pytest
+
+from Project import HeapPriorityQueue, JobExpiryHandler, JobStatus, PrintJob, PrintQueueManager
+
+
+def make_job(job_id, submitted=0.0, expiry=10.0):
+    return PrintJob(user_id="alice", job_id=job_id, priority=1, submission_time=submitted,
+                    last_aged=submitted, expiry_time=expiry)
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_jobs_expire_at_their_deadline(indexed):
+    handler = JobExpiryHandler(indexed=indexed)
+    queue = HeapPriorityQueue(capacity=10)
+    jobs = [make_job("short", expiry=5.0), make_job("long", expiry=20.0), make_job("later", submitted=3.0)]
+    for job in jobs:
+        queue.enqueue_job(job)
+        handler.track_job(job)
+
+    assert handler.remove_expired_jobs(queue, 4.9) == 0
+    assert handler.remove_expired_jobs(queue, 5.0) == 1
+    assert handler.remove_expired_jobs(queue, 13.0) == 1
+    assert [job.job_id for job in handler.expired_jobs] == ["short", "later"]
+    assert [job.job_id for job in queue.get_all_jobs()] == ["long"]
+    assert jobs[0].status == JobStatus.EXPIRED
+
+
+def test_indexed_expiry_skips_jobs_that_already_left_the_queue():
+    handler = JobExpiryHandler(indexed=True)
+    queue = HeapPriorityQueue(capacity=10)
+    job = make_job("printed", expiry=5.0)
+    queue.enqueue_job(job)
+    handler.track_job(job)
+    queue.dequeue_job()
+    job.status = JobStatus.COMPLETED
+
+    assert handler.remove_expired_jobs(queue, 10.0) == 0
+    assert handler.next_expiry_time() is None
+
+
+def test_expired_store_is_bounded_by_default_and_evicts_oldest_first():
+    assert JobExpiryHandler().expired_jobs.maxlen == JobExpiryHandler.DEFAULT_MAX_EXPIRED_RECORDS
+
+    manager = PrintQueueManager(capacity=20, default_expiry=2.0, max_expired_records=3)
+    for index in range(5):
+        manager.enqueue_job("alice", f"job{index}", 1)
+        manager.tick()
+    manager.tick(5.0)
+
+    assert manager.stats['total_expired'] == 5
+    assert [job.job_id for job in manager.expiry_handler.expired_jobs] == ["job2", "job3", "job4"]
@@ -0,0 +1,58 @@
+from Project import JobRegistry, JobStatus, PrintJob, PrintQueueManager
+
+
+def make_job(job_id):
+    return PrintJob(user_id="alice", job_id=job_id, priority=1)
+
+
+def test_active_ids_are_rejected_until_the_job_finishes():
+    registry = JobRegistry()
+    job = make_job("job")
+
+    assert registry.register(job)
+    assert not registry.register(make_job("job"))
+    registry.set_status(job, JobStatus.PRINTING)
+    assert registry.is_active("job")
+    registry.set_status(job, JobStatus.COMPLETED)
+
+    assert not registry.is_active("job")
+    assert registry.get("job") is job
+    reused = make_job("job")
+    assert registry.register(reused)
+    assert registry.get("job") is reused
+
+
+def test_finished_jobs_are_evicted_oldest_first():
+    registry = JobRegistry(max_finished_jobs=2)
+    jobs = [make_job(f"job{index}") for index in range(4)]
+    for job in jobs:
+        registry.register(job)
+        registry.set_status(job, JobStatus.COMPLETED)
+
+    assert "job0" not in registry and "job1" not in registry
+    assert registry.get("job2") is jobs[2] and registry.get("job3") is jobs[3]
+
+
+def test_evicting_a_finished_job_keeps_a_reused_active_id():
+    registry = JobRegistry(max_finished_jobs=1)
+    first = make_job("job")
+    registry.register(first)
+    registry.set_status(first, JobStatus.CANCELLED)
+    second = make_job("job")
+    registry.register(second)
+    other = make_job("other")
+    registry.register(other)
+    registry.set_status(other, JobStatus.COMPLETED)
+
+    assert registry.get("job") is second
+
+
+def test_manager_uses_the_registry_for_lookups_and_cancellation():
+    manager = PrintQueueManager(capacity=10)
+    manager.enqueue_job("alice", "job1", 2)
+
+    assert not manager.enqueue_job("bob", "job1", 1)
+    assert manager.get_job_info("job1")['user_id'] == "alice"
+    assert manager.cancel_job("job1")
+    assert not manager.cancel_job("job1")
+    assert manager.enqueue_job("bob", "job1", 1)
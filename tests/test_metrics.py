@@ -0,0 +1,38 @@
+from Metrics import QueueMetrics
+from Project import PrintQueueManager
+
+
+def test_prometheus_counters_use_the_total_suffix():
+    manager = PrintQueueManager(metrics=QueueMetrics())
+    manager.enqueue_job("alice", "job1", 1)
+    manager.print_job()
+
+    lines = manager.export_metrics("prometheus").splitlines()
+
+    assert "# TYPE printqueue_printed_total counter" in lines
+    assert "printqueue_printed_total 1" in lines
+    assert "printqueue_jobs_aged_total 0" in lines
+    assert not any("_total_" in line for line in lines)
+    counter_types = [line for line in lines if line.endswith(" counter")]
+    assert counter_types and all(line.split()[2].endswith("_total") for line in counter_types)
+
+
+def test_prometheus_histograms_emit_every_bucket_on_every_scrape():
+    metrics = QueueMetrics()
+    manager = PrintQueueManager(metrics=metrics)
+    bucket_count = len(metrics.operations["cancel"].bounds) + 1
+
+    def cancel_buckets():
+        lines = manager.export_metrics("prometheus").splitlines()
+        return [line for line in lines if line.startswith('printqueue_operation_seconds_bucket{operation="cancel",')]
+
+    empty = cancel_buckets()
+    manager.enqueue_job("alice", "job1", 1)
+    manager.cancel_job("job1")
+    recorded = cancel_buckets()
+
+    assert len(empty) == len(recorded) == bucket_count
+    assert [line.split()[0] for line in empty] == [line.split()[0] for line in recorded]
+    assert empty[-1].endswith('le="+Inf"} 0') and recorded[-1].endswith('le="+Inf"} 1')
+    counts = [int(line.split()[1]) for line in recorded]
+    assert counts == sorted(counts) and counts[0] == 0
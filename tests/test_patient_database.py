@@ -0,0 +1,126 @@
+import sqlite3
+import threading
+
+import pytest
+
+from database import SCHEMA_VERSION, DatabaseManager
+
+NAMES = ["bob", "Alice", "alice", "Carol", "bob", "ALICE", "dave", "Bob", "carol", "alice"]
+
+
+@pytest.fixture
+def db():
+    manager = DatabaseManager(":memory:")
+    manager.add_patients([(name, 30 + index % 3, "F") for index, name in enumerate(NAMES * 5)])
+    yield manager
+    manager.close()
+
+
+def walk_backwards(fetch, last_row, limit):
+    rows = []
+    page = fetch(last_row, limit)
+    while page:
+        rows[:0] = page
+        page = fetch(page[0], limit)
+    return rows
+
+
+def test_id_pages_before_an_id_walk_back_to_the_start(db):
+    everything = db.get_patients_page(0, 1000)
+
+    assert db.get_patients_page_before(everything[10][0], 4) == everything[6:10]
+    assert walk_backwards(lambda row, limit: db.get_patients_page_before(row[0], limit), everything[-1], 7) == \
+        everything[:-1]
+
+
+def test_sorted_pages_before_a_row_walk_back_across_ties(db):
+    everything = db.get_patients_sorted_page(None, 1000)
+
+    assert walk_backwards(db.get_patients_sorted_page_before, everything[-1], 3) == everything[:-1]
+    assert db.get_patients_sorted_page_before(everything[0], 3) == []
+
+
+def walk_forwards(db, limit):
+    rows = []
+    page = db.get_patients_sorted_page(None, limit)
+    while page:
+        rows.extend(page)
+        page = db.get_patients_sorted_page(page[-1], limit)
+    return rows
+
+
+@pytest.mark.parametrize("limit", [1, 3, 7, 100])
+def test_sorted_pages_walk_through_ties_in_name_age_id_order(db, limit):
+    rows = walk_forwards(db, limit)
+
+    assert len(rows) == len(NAMES) * 5
+    assert rows == sorted(rows, key=lambda row: (row[1].lower(), row[2], row[0]))
+
+
+def test_schema_migration_drops_the_replaced_name_index_once(tmp_path):
+    path = str(tmp_path / "patients.db")
+    old = sqlite3.connect(path)
+    old.execute("CREATE TABLE patients (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, "
+                "age INTEGER NOT NULL, gender TEXT NOT NULL)")
+    old.execute("CREATE INDEX idx_patients_name ON patients (name COLLATE NOCASE)")
+    old.close()
+
+    def indexes():
+        manager = DatabaseManager(path)
+        names = {row[0] for row in manager.query("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        version = manager.query("PRAGMA user_version")[0][0]
+        manager.close()
+        return names, version
+
+    names, version = indexes()
+    assert "idx_patients_name" not in names and "idx_patients_name_age_id" in names
+    assert version == SCHEMA_VERSION
+
+    extra = sqlite3.connect(path)
+    extra.execute("CREATE INDEX idx_patients_name ON patients (name)")
+    extra.close()
+    assert "idx_patients_name" in indexes()[0]
+
+
+def test_failed_transactions_roll_back_and_nested_ones_join_the_outer(db):
+    before = db.count_patients()
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.add_patient("Temp", 1, "F")
+            with db.transaction():
+                db.add_patient("Nested", 2, "F")
+            raise RuntimeError("abort")
+
+    assert db.count_patients() == before
+
+
+def test_bulk_writes_report_the_rows_they_changed(db):
+    assert db.add_patients([("Eve", 20, "F"), ("Finn", 21, "M")]) == 2
+    eve, finn = db.search_patients("eve")[0], db.search_patients("finn")[0]
+
+    assert db.update_patients([(eve[0], "Eva", 22, "F"), (finn[0], "Finn", 23, "M")]) == 2
+    assert db.get_patients([finn[0], eve[0]]) == [(finn[0], "Finn", 23, "M"), (eve[0], "Eva", 22, "F")]
+    assert db.delete_patients([eve[0], finn[0], 10 ** 6]) == 2
+    assert db.get_patients([eve[0], finn[0]]) == []
+
+
+def test_reader_threads_get_their_own_connections(tmp_path):
+    manager = DatabaseManager(str(tmp_path / "patients.db"))
+    manager.add_patients([("Gina", 30, "F")] * 10)
+    counts, connections = [], []
+
+    def read():
+        connections.append(manager.reader())
+        counts.append(manager.count_patients())
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counts == [10] * 4
+    assert len({id(conn) for conn in connections}) == 4 and manager.conn not in connections
+    with pytest.raises(sqlite3.OperationalError):
+        manager.reader().execute("DELETE FROM patients")
+    manager.close()
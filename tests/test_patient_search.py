@@ -0,0 +1,94 @@
+import threading
+
+import pytest
+
+from database import DatabaseManager
+from search import PatientSearch
+
+PATIENTS = [("Jonathan Smith", 40, "M"), ("Jon Doe", 31, "M"), ("Jane Roe", 28, "F"), ("Joanna Smyth", 52, "F")]
+
+
+class GatedDatabase(DatabaseManager):
+    # holds the index build after it has read a page, so changes can land mid-build
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.page_read = threading.Event()
+        self.resume = threading.Event()
+
+    def get_patients_page(self, after_id=0, limit=200):
+        rows = super().get_patients_page(after_id, limit)
+        self.page_read.set()
+        self.resume.wait(5)
+        return rows
+
+
+@pytest.fixture
+def db():
+    manager = DatabaseManager(":memory:")
+    manager.add_patients(PATIENTS)
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def search(db):
+    search = PatientSearch(db)
+    search.start_fuzzy_index().join(5)
+    return search
+
+
+def names(rows):
+    return [row[1] for row in rows]
+
+
+def test_prefix_matches_are_not_padded_with_fuzzy_matches(search):
+    assert sorted(names(search.search("jon", limit=200))) == ["Jon Doe", "Jonathan Smith"]
+    assert names(search.search("smith", gender="M")) == ["Jonathan Smith"]
+
+
+def test_fuzzy_matches_are_ranked_by_similarity_when_nothing_matches_the_prefix(search):
+    assert names(search.search("jonathon smiht")) == ["Jonathan Smith", "Jon Doe"]
+    assert names(search.search("jonathon smiht", fuzzy=False)) == []
+    assert names(search.search("jonathon smiht", gender="M", limit=1)) == ["Jonathan Smith"]
+    assert names(search.search("joana smyt", gender="M")) == []
+
+
+def test_searches_before_the_index_is_built_return_sql_matches_only(db):
+    search = PatientSearch(db)
+
+    assert names(search.search("jonathon smiht")) == []
+    assert names(search.search("jane")) == ["Jane Roe"]
+
+
+def test_fuzzy_index_follows_added_updated_and_deleted_patients(db, search):
+    patient_id = db.add_patient("Maximilian Archer", 60, "M")
+    search.patient_added(patient_id, "Maximilian Archer")
+    assert names(search.search("maximillian")) == ["Maximilian Archer"]
+
+    db.update_patient(patient_id, "Bartholomew Archer", 60, "M")
+    search.patient_updated(str(patient_id), "Bartholomew Archer")
+    assert names(search.search("maximillian")) == []
+    assert names(search.search("bartholomeu")) == ["Bartholomew Archer"]
+
+    db.delete_patient(patient_id)
+    search.patient_deleted(str(patient_id))
+    assert patient_id not in search.fuzzy_index
+
+
+def test_changes_made_during_the_background_build_are_replayed():
+    db = GatedDatabase(":memory:")
+    db.add_patients(PATIENTS)
+    search = PatientSearch(db)
+    builder = search.start_fuzzy_index()
+    assert db.page_read.wait(5)
+
+    added = db.add_patient("Maximilian Archer", 60, "M")
+    search.patient_added(added, "Maximilian Archer")
+    db.delete_patient(1)
+    search.patient_deleted(1)
+    db.resume.set()
+    builder.join(5)
+
+    assert added in search.fuzzy_index and 1 not in search.fuzzy_index
+    assert names(search.search("maximillian")) == ["Maximilian Archer"]
+    db.close()
@@ -0,0 +1,67 @@
+import pytest
+
+from database import DatabaseManager
+
+tk = pytest.importorskip("tkinter")
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("Tk needs a display")
+    root.withdraw()
+    monkeypatch.chdir(tmp_path)
+    db = DatabaseManager()
+    db.add_patients([(f"patient{index:05d}", 20 + index % 50, "F") for index in range(3000)])
+    db.close()
+
+    from gui import PatientApp
+    app = PatientApp(root)
+    yield app
+    app.db.close()
+    root.destroy()
+
+
+def loaded_ids(app):
+    return [int(item) for item in app.tree.get_children()]
+
+
+def test_scrolling_keeps_a_bounded_window_of_rows(app):
+    from gui import MAX_LOADED_ROWS
+
+    while app.has_more:
+        app.load_next_page()
+        assert len(app.tree.get_children()) <= MAX_LOADED_ROWS
+
+    assert loaded_ids(app) == list(range(3001 - MAX_LOADED_ROWS, 3001))
+    assert app.has_before
+
+    while app.has_before:
+        app.load_previous_page()
+        assert len(app.tree.get_children()) <= MAX_LOADED_ROWS
+
+    assert loaded_ids(app) == list(range(1, MAX_LOADED_ROWS + 1))
+    assert app.has_more
+
+
+def test_name_order_pages_back_through_evicted_rows(app):
+    app.load_patients("name")
+    while app.has_more:
+        app.load_next_page()
+    while app.has_before:
+        app.load_previous_page()
+
+    assert loaded_ids(app)[:3] == [1, 2, 3]
+
+
+def test_sorting_in_memory_pages_through_the_avl_index(app, monkeypatch):
+    import gui
+
+    monkeypatch.setattr(gui.messagebox, "showinfo", lambda *args: None)
+    app.sort_in_database.set(False)
+    app.sort_patients()
+
+    assert app.sort_order == "index"
+    assert loaded_ids(app)[:5] == [row[0] for row in app.db.get_patients_sorted_page(None, 5)]
@@ -0,0 +1,75 @@
+import threading
+
+from PrinterPool import PrinterPool
+from Project import JobStatus, PrintQueueManager
+
+
+def make_manager(jobs=6):
+    manager = PrintQueueManager(capacity=50)
+    for index in range(jobs):
+        manager.enqueue_job(f"user{index % 2}", f"job{index}", 1 + index % 3)
+    return manager
+
+
+def test_pool_prints_every_job_and_reports_completions():
+    manager = make_manager()
+    completed = []
+    pool = PrinterPool(manager, printers=3, poll_interval=0.01,
+                       on_complete=lambda printer_id, job: completed.append((printer_id, job.job_id)))
+    pool.start()
+    assert pool.wait_until_idle(timeout=5.0)
+    pool.stop(timeout=5.0)
+
+    assert sorted(job_id for _, job_id in completed) == [f"job{index}" for index in range(6)]
+    assert manager.stats['total_printed'] == 6
+    assert sum(stats.jobs_printed for stats in pool.printers.values()) == 6
+    assert all(manager.registry.get(f"job{index}").status == JobStatus.COMPLETED for index in range(6))
+
+
+def test_failed_job_is_finalized_and_reported():
+    manager = make_manager(jobs=3)
+    failures = []
+
+    def print_function(job):
+        if job.job_id == "job1":
+            raise OSError("paper jam")
+
+    pool = PrinterPool(manager, printers=1, poll_interval=0.01, print_function=print_function,
+                       on_failure=lambda printer_id, job, error: failures.append((job.job_id, str(error))))
+    pool.start()
+    assert pool.wait_until_idle(timeout=5.0)
+    pool.stop(timeout=5.0)
+
+    failed = manager.registry.get("job1")
+    assert failures == [("job1", "paper jam")]
+    assert failed.status == JobStatus.FAILED
+    assert pool.failed_jobs == [failed]
+    assert pool.report()['printers']['printer-1']['jobs_failed'] == 1
+    assert manager.stats['total_printed'] == 2
+    assert not manager.registry.is_active("job1")
+    assert manager.enqueue_job("user1", "job1", 1)
+
+
+def test_stop_lets_the_current_job_finish_and_stops_claiming():
+    manager = make_manager(jobs=4)
+    started = threading.Event()
+    release = threading.Event()
+
+    def print_function(job):
+        started.set()
+        release.wait(5.0)
+
+    pool = PrinterPool(manager, printers=1, poll_interval=0.01, print_function=print_function)
+    pool.start()
+    assert started.wait(5.0)
+    stopper = threading.Thread(target=pool.stop)
+    stopper.start()
+    assert pool._stop_event.wait(5.0)
+    release.set()
+    stopper.join(5.0)
+
+    assert not stopper.is_alive()
+    assert pool.busy_printers() == 0
+    assert manager.stats['total_printed'] == 1
+    assert len(manager.queue) == 3
+    assert pool.elapsed_time() > 0
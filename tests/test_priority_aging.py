@@ -0,0 +1,52 @@
+import pytest
+
+from Project import HeapPriorityQueue, JobStatus, PrintJob, PrintQueueManager, PriorityAgingSystem
+
+
+def make_job(job_id, priority, submitted=0.0):
+    return PrintJob(user_id="alice", job_id=job_id, priority=priority,
+                    submission_time=submitted, last_aged=submitted)
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_jobs_age_once_per_interval_down_to_priority_one(incremental):
+    aging = PriorityAgingSystem(aging_interval=5.0, incremental=incremental)
+    queue = HeapPriorityQueue(capacity=10)
+    job = make_job("job", 4)
+    queue.enqueue_job(job)
+    aging.track_job(job)
+
+    aged = []
+    for now in range(1, 31):
+        aging.apply_priority_aging(queue, float(now), on_aged=lambda aged_job: aged.append((now, aged_job.priority)))
+
+    assert aged == [(5, 3), (10, 2), (15, 1)]
+    assert job.original_priority == 4
+
+
+def test_incremental_aging_ignores_jobs_that_left_the_queue():
+    aging = PriorityAgingSystem(aging_interval=5.0, incremental=True)
+    queue = HeapPriorityQueue(capacity=10)
+    kept, removed = make_job("kept", 3), make_job("removed", 3)
+    for job in (kept, removed):
+        queue.enqueue_job(job)
+        aging.track_job(job)
+    queue.remove_job("removed")
+    removed.status = JobStatus.CANCELLED
+
+    assert aging.apply_priority_aging(queue, 5.0) == 1
+    assert (kept.priority, removed.priority) == (2, 3)
+
+
+@pytest.mark.parametrize("engine", ["circular", "heap"])
+def test_incremental_and_full_aging_give_the_same_dispatch_order(engine):
+    orders = []
+    for incremental in (False, True):
+        manager = PrintQueueManager(capacity=50, engine=engine, aging_interval=3.0, default_expiry=1000.0,
+                                    incremental_aging=incremental, policy="aging")
+        for index in range(12):
+            manager.enqueue_job("alice", f"job{index}", 5 - index % 5)
+            manager.tick()
+        orders.append(([manager.print_job().job_id for _ in range(12)], manager.stats['jobs_aged']))
+
+    assert orders[0] == orders[1]
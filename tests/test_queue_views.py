@@ -0,0 +1,92 @@
+import threading
+
+import pytest
+
+from Project import PrintJob, PrintQueueManager, create_queue
+
+ENGINES = ["circular", "heap", "sharded", "fairshare"]
+
+
+def make_job(user_id, job_id, priority):
+    return PrintJob(user_id=user_id, job_id=job_id, priority=priority, submission_time=0.0, last_aged=0.0)
+
+
+def queue_locks(queue):
+    return [shard._lock for shard in queue._shards] if hasattr(queue, "_shards") else [queue._lock]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_view_is_published_by_every_write(engine):
+    queue = create_queue(engine, capacity=20)
+    queue.view()
+    jobs = [make_job(f"user{index % 3}", f"job{index}", 1 + index % 4) for index in range(8)]
+    queue.enqueue_job(jobs[0])
+    queue.enqueue_many(jobs[1:])
+    queue.dequeue_job()
+    queue.remove_job("job5")
+    jobs[7].priority = 1
+    queue.reposition_job(jobs[7])
+
+    assert [row.job_id for row in queue.view()] == [job.job_id for job in queue.get_all_jobs()]
+    assert "job5" not in queue.view()
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_view_rows_do_not_change_under_readers(engine):
+    queue = create_queue(engine, capacity=20)
+    job = make_job("alice", "job1", 4)
+    queue.enqueue_job(job)
+    view = queue.view()
+
+    job.priority = 1
+    job.update_waiting_time(10.0)
+    queue.reposition_job(job)
+
+    assert (view.find("job1").priority, view.find("job1").waiting_time) == (4, 0.0)
+    assert queue.view().find("job1").priority == 1
+    with pytest.raises(AttributeError):
+        view.find("job1").priority = 2
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_readers_do_not_take_the_queue_lock(engine):
+    queue = create_queue(engine, capacity=20)
+    queue.view()
+    queue.enqueue_job(make_job("alice", "job1", 2))
+    held, release = threading.Event(), threading.Event()
+
+    def hold_locks():
+        for lock in queue_locks(queue):
+            lock.acquire()
+        held.set()
+        release.wait()
+        for lock in queue_locks(queue):
+            lock.release()
+
+    holder = threading.Thread(target=hold_locks)
+    holder.start()
+    held.wait()
+    views = []
+    reader = threading.Thread(target=lambda: views.append(queue.view()))
+    reader.start()
+    reader.join(1.0)
+    release.set()
+    holder.join()
+
+    assert not reader.is_alive()
+    assert [row.job_id for row in views[0]] == ["job1"]
+
+
+def test_manager_view_follows_aging_and_waiting_times():
+    manager = PrintQueueManager(capacity=20, engine="heap", aging_interval=1.0)
+    manager.enqueue_job("alice", "job1", 3)
+    manager.enqueue_job("bob", "job2", 2)
+    before = manager.view()
+
+    manager.tick()
+    manager.tick()
+
+    assert [(row.job_id, row.priority) for row in before] == [("job2", 2), ("job1", 3)]
+    after = manager.view()
+    assert [row.priority for row in after] == [1, 1]
+    assert all(row.waiting_time == 2.0 for row in after)
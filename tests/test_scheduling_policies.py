@@ -0,0 +1,61 @@
+import pytest
+
+from Project import FairSharePolicy, PriorityAgingPolicy, PrintJob, create_queue
+
+
+def make_job(user_id, job_id, priority=1):
+    return PrintJob(user_id=user_id, job_id=job_id, priority=priority, submission_time=0.0, last_aged=0.0)
+
+
+class RecordingPolicy(PriorityAgingPolicy):
+    def __init__(self):
+        self.sequences = {}
+
+    def key(self, job, sequence):
+        self.sequences.setdefault(job.job_id, sequence)
+        return super().key(job, sequence)
+
+
+def test_fair_share_key_does_not_charge_the_user():
+    policy = FairSharePolicy()
+    job = make_job("alice", "a1")
+
+    assert policy.key(job, 0) == policy.key(job, 0) == (0.0, 1, 0)
+    assert policy.clock.tags == {}
+
+    policy.on_enqueued(job)
+    policy.on_enqueued(job)
+    assert policy.clock.tags == {"alice": 1.0}
+    assert policy.key(make_job("alice", "a2"), 2)[0] == 1.0
+
+
+@pytest.mark.parametrize("engine", ["circular", "heap"])
+def test_fair_share_policy_interleaves_users_by_weight(engine):
+    queue = create_queue(engine, capacity=20, policy=FairSharePolicy(weights={"alice": 2.0}))
+    queue.enqueue_many([make_job("alice", f"a{index}") for index in range(4)])
+    for index in range(2):
+        queue.enqueue_job(make_job("bob", f"b{index}"))
+
+    order = [queue.dequeue_job().job_id for _ in range(6)]
+
+    assert order == ["a0", "b0", "a1", "a2", "b1", "a3"]
+    assert queue.policy.clock.virtual_time == 1.5
+
+
+def test_removed_jobs_drop_their_fair_share_tags():
+    queue = create_queue("circular", capacity=20, policy="fairshare")
+    queue.enqueue_job(make_job("alice", "a1"))
+    queue.remove_job("a1")
+
+    assert queue.policy._start_tags == {}
+
+
+def test_circular_queue_passes_submission_sequences_to_the_policy():
+    policy = RecordingPolicy()
+    queue = create_queue("circular", capacity=20, policy=policy)
+    queue.enqueue_job(make_job("alice", "a1"))
+    queue.enqueue_many([make_job("bob", "b1"), make_job("bob", "b2")])
+    queue.enqueue_job(make_job("carol", "c1"))
+
+    assert [policy.sequences[job_id] for job_id in ("a1", "b1", "b2", "c1")] == [0, 1, 2, 3]
+    assert [job.job_id for job in queue.get_all_jobs()] == ["a1", "b1", "b2", "c1"]
@@ -0,0 +1,74 @@
+import threading
+
+import pytest
+
+from Project import PrintJob, ShardedQueue
+
+
+def make_job(job_id, priority, user_id="alice", submitted=0.0):
+    return PrintJob(user_id=user_id, job_id=job_id, priority=priority,
+                    submission_time=submitted, last_aged=submitted)
+
+
+@pytest.mark.parametrize("partition", ["user", "priority"])
+def test_strict_dequeue_order_is_global_across_shards(partition):
+    queue = ShardedQueue(capacity=50, shards=3, partition=partition)
+    jobs = [make_job(f"job{index}", 1 + index % 4, f"user{index % 5}", float(index)) for index in range(20)]
+    assert queue.enqueue_many(jobs) == [True] * 20
+
+    order = [queue.dequeue_job() for _ in range(20)]
+
+    assert [(job.priority, job.submission_time) for job in order] == sorted(
+        (job.priority, job.submission_time) for job in jobs)
+    assert queue.is_empty() and queue._shard_of == {}
+
+
+def test_reposition_moves_a_job_to_its_new_priority_shard():
+    queue = ShardedQueue(capacity=10, shards=4, partition="priority")
+    job = make_job("job", 4)
+    queue.enqueue_job(job)
+    queue.enqueue_job(make_job("other", 2, submitted=1.0))
+
+    job.priority = 1
+    assert queue.reposition_job(job)
+
+    assert queue._shard_of["job"] == 0
+    assert queue.dequeue_job() is job
+    assert queue.remove_job("other")
+    assert not queue.remove_job("other")
+    assert len(queue) == 0 and queue._shard_of == {}
+
+
+def test_concurrent_producers_and_consumers_keep_the_index_consistent():
+    queue = ShardedQueue(capacity=10000, shards=4, partition="priority")
+    dequeued = []
+    producers_done = threading.Event()
+
+    def produce(worker):
+        for index in range(500):
+            job = make_job(f"w{worker}-{index}", 1 + index % 4, f"user{worker}", float(index))
+            queue.enqueue_job(job)
+            if index % 3 == 0 and job.priority > 1:
+                job.priority -= 1
+                queue.reposition_job(job)
+            if index % 7 == 0:
+                queue.remove_job(job.job_id)
+
+    def consume():
+        while not (producers_done.is_set() and queue.is_empty()):
+            job = queue.dequeue_job()
+            if job is not None:
+                dequeued.append(job.job_id)
+
+    producers = [threading.Thread(target=produce, args=(worker,)) for worker in range(4)]
+    consumers = [threading.Thread(target=consume) for _ in range(2)]
+    for thread in producers + consumers:
+        thread.start()
+    for thread in producers:
+        thread.join()
+    producers_done.set()
+    for thread in consumers:
+        thread.join()
+
+    assert len(dequeued) == len(set(dequeued))
+    assert len(queue) == 0 and queue._shard_of == {}
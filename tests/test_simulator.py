@@ -0,0 +1,58 @@
+from EventLog import LogLevel
+from Project import PrintQueueManager
+from Simulator import DiscreteEventSimulator, synthetic_trace
+
+
+class RecordingJournal:
+    def __init__(self):
+        self.operations = []
+
+    def append(self, operation, *arguments):
+        self.operations.append(operation)
+
+    def append_many(self, operation, rows):
+        self.operations.extend(operation for _ in rows)
+
+    def maybe_checkpoint(self, manager):
+        return None
+
+    def close(self):
+        pass
+
+
+def replay(journal=None):
+    manager = PrintQueueManager(capacity=5000, engine="heap", aging_interval=2.0, default_expiry=6.0,
+                                incremental_aging=True, indexed_expiry=True, log_level=LogLevel.OFF,
+                                journal=journal)
+    simulator = DiscreteEventSimulator(manager, printers=2, print_time=0.6)
+    report = simulator.run(synthetic_trace(3000, arrival_rate=4.0, cancel_ratio=0.05, seed=3))
+    return report, [job.job_id for job in manager.completed_jobs]
+
+
+def test_simulator_defaults_to_logging_off():
+    simulator = DiscreteEventSimulator()
+
+    assert simulator.manager.event_log.level == LogLevel.OFF
+    simulator.run(synthetic_trace(100, seed=1))
+    assert len(simulator.manager.event_log) == 0
+
+
+def test_skipping_idle_ticks_does_not_change_the_outcome():
+    skipped, skipped_order = replay()
+    journal = RecordingJournal()
+    ticked, ticked_order = replay(journal)
+
+    assert skipped.manager_stats['jobs_aged'] > 0 and skipped.manager_stats['total_expired'] > 0
+    assert skipped.manager_stats == ticked.manager_stats
+    assert skipped_order == ticked_order
+    assert skipped.simulated_time == ticked.simulated_time
+    assert journal.operations.count("tick") > 0
+
+
+def test_printers_never_exceed_the_configured_count():
+    simulator = DiscreteEventSimulator(printers=3, print_time=5.0, capacity=1000, default_expiry=1000.0)
+    report = simulator.run(synthetic_trace(200, arrival_rate=10.0, seed=2))
+
+    assert report.jobs_printed == report.submissions == 200
+    assert simulator.free_printers == 3
+    assert report.mean_wait > 0
@@ -0,0 +1,50 @@
+import pytest
+
+from Project import PrintQueueManager
+
+ENGINES = ["circular", "heap", "sharded", "fairshare"]
+
+
+def queued_ids(manager):
+    return sorted(job.job_id for job in manager.view())
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_simultaneous_batch_rejects_queued_and_repeated_ids(engine):
+    manager = PrintQueueManager(capacity=10, engine=engine)
+    manager.enqueue_job("alice", "x", 2)
+
+    results = manager.handle_simultaneous_submissions([
+        ("bob", "x", 1, "Document"), ("bob", "y", 1, "Document"), ("carol", "y", 3, "Document")
+    ])
+
+    assert results == {"x": False, "y": True}
+    assert queued_ids(manager) == ["x", "y"]
+    assert manager.cancel_job("x")
+    assert queued_ids(manager) == ["y"]
+    assert manager.registry.get("y").user_id == "bob"
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_simultaneous_batch_respects_capacity(engine):
+    manager = PrintQueueManager(capacity=3, engine=engine)
+
+    results = manager.handle_simultaneous_submissions([
+        ("alice", f"job{index}", 1, "Document") for index in range(5)
+    ])
+
+    assert sum(results.values()) == 3
+    assert len(queued_ids(manager)) == 3
+    assert all(manager.registry.is_active(job_id) for job_id in queued_ids(manager))
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_queue_batch_enqueue_rejects_duplicate_ids(engine):
+    manager = PrintQueueManager(capacity=10, engine=engine)
+    manager.enqueue_job("alice", "x", 2)
+    jobs = [manager.registry.get("x")]
+    results = manager.enqueue_batch([("bob", "x", 1), ("bob", "y", 1), ("bob", "y", 1)])
+
+    assert results == {"x": False, "y": True}
+    assert queued_ids(manager) == ["x", "y"]
+    assert manager.queue.enqueue_many(jobs) == [False]
@@ -0,0 +1,70 @@
+import json
+import random
+
+import pytest
+
+from Project import PrintQueueManager
+from Snapshots import QueueSnapshot, apply_diff, diff_snapshots
+
+
+def test_snapshot_holds_the_top_rows_and_counts_the_rest():
+    manager = PrintQueueManager(capacity=20, engine="heap")
+    for index in range(8):
+        manager.enqueue_job(f"user{index % 2}", f"job{index}", 1 + index % 4)
+
+    snapshot = manager.snapshot(top_k=3)
+
+    assert [row.job_id for row in snapshot.rows] == ["job0", "job4", "job1"]
+    assert (snapshot.size, snapshot.hidden_jobs, snapshot.capacity) == (8, 5, 20)
+    assert snapshot.ranks()["job4"] == 2
+    assert json.loads(snapshot.to_json())['rows'][0][0] == "job0"
+
+
+def test_unchanged_queue_produces_an_empty_delta():
+    manager = PrintQueueManager(capacity=20, engine="heap")
+    manager.enqueue_job("alice", "job1", 2)
+    manager.snapshot_delta()
+
+    delta = manager.snapshot_delta()
+
+    assert delta.is_empty()
+    assert set(delta.to_dict()) == {'base', 'v', 't', 'size'}
+
+
+@pytest.mark.parametrize("engine", ["circular", "heap", "sharded", "fairshare"])
+def test_applying_deltas_reproduces_the_full_snapshot(engine):
+    rng = random.Random(5)
+    manager = PrintQueueManager(capacity=200, engine=engine, aging_interval=2.0, default_expiry=15.0)
+    client = QueueSnapshot(0, 0.0, 0, 200, ())
+    for step in range(60):
+        for _ in range(rng.randrange(4)):
+            manager.enqueue_job(f"user{rng.randrange(4)}", f"job{step}-{rng.randrange(10 ** 6)}", rng.randint(1, 5))
+        if rng.random() < 0.5:
+            manager.print_job()
+        if rng.random() < 0.2:
+            queued = [job.job_id for job in manager.view()]
+            if queued:
+                manager.cancel_job(rng.choice(queued))
+        manager.tick()
+
+        delta = manager.snapshot_delta(top_k=10)
+        client = apply_diff(client, delta)
+        full = manager.snapshot(top_k=10)
+        assert client.rows == full.rows
+        assert (client.size, client.stats) == (full.size, full.stats)
+
+
+def test_diff_reports_moves_priority_updates_and_removals():
+    manager = PrintQueueManager(capacity=20, engine="heap", aging_interval=1.0)
+    for index, priority in enumerate([3, 3, 2]):
+        manager.enqueue_job("alice", f"job{index}", priority)
+    before = manager.snapshot()
+    manager.print_job()
+    manager.tick()
+    after = manager.snapshot()
+
+    delta = diff_snapshots(before, after)
+
+    assert delta.removed == ("job2",)
+    assert ("job0", 1) in delta.moved and ("job1", 2) in delta.moved
+    assert dict(delta.updated) == {"job0": 2, "job1": 2}
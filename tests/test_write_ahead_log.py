@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+import WriteAheadLog as write_ahead_log
+from Project import JobStatus, PrintQueueManager
+from WriteAheadLog import ROTATED_SUFFIX, WriteAheadLog
+
+MANAGER_OPTIONS = dict(capacity=500, aging_interval=2.0, default_expiry=5.0)
+
+
+def run_workload(manager):
+    for index in range(20):
+        manager.enqueue_job(f"user{index % 4}", f"single{index}", index % 5)
+    manager.enqueue_batch([(f"user{index % 7}", f"batch{index}", index % 5) for index in range(200)])
+    manager.handle_simultaneous_submissions([("sim", f"sim{index}", 2, "Document") for index in range(3)])
+    for _ in range(3):
+        manager.tick()
+        manager.print_job()
+    manager.cancel_job("batch150")
+    manager.enqueue_job("late", "late0", 1, expiry_time=100.0)
+    for _ in range(4):
+        manager.tick()
+    manager.print_job()
+
+
+def recover(path):
+    manager = PrintQueueManager(**MANAGER_OPTIONS)
+    WriteAheadLog(path, fsync=False).recover(manager)
+    return manager
+
+
+def assert_same_state(recovered, live):
+    assert recovered.stats == live.stats
+    assert recovered.time_manager.current_time == live.time_manager.current_time
+    live_pending = {job.job_id for job in live.view()}
+    live_pending.update(job.job_id for job in live.registry._jobs.values() if job.status == JobStatus.PRINTING)
+    assert {job.job_id for job in recovered.view()} == live_pending
+
+
+@pytest.mark.parametrize("checkpoint_every", [None, 1, 3, 64])
+def test_recovered_stats_match_the_live_manager(tmp_path, checkpoint_every):
+    path = str(tmp_path / "queue.wal")
+    journal = WriteAheadLog(path, fsync=False, checkpoint_every=checkpoint_every)
+    live = journal.open(**MANAGER_OPTIONS)
+    run_workload(live)
+    journal.close()
+
+    assert live.stats['total_submitted'] == 221
+    assert live.stats['total_expired'] > 0
+    assert_same_state(recover(path), live)
+
+
+def test_checkpoint_keeps_records_left_by_an_interrupted_checkpoint(tmp_path, monkeypatch):
+    path = str(tmp_path / "queue.wal")
+    journal = WriteAheadLog(path, fsync=False)
+    live = journal.open(**MANAGER_OPTIONS)
+    live.enqueue_batch([("user", f"job{index}", index % 5) for index in range(100)])
+    journal.close()
+    os.replace(path, path + ROTATED_SUFFIX)
+
+    journal = WriteAheadLog(path, fsync=False)
+    live = journal.open(**MANAGER_OPTIONS)
+    live.tick()
+    live.print_job()
+
+    replace = os.replace
+
+    def crash_before_snapshot(source, destination):
+        if source.endswith(".tmp"):
+            raise OSError("crashed")
+        replace(source, destination)
+
+    monkeypatch.setattr(write_ahead_log.os, "replace", crash_before_snapshot)
+    with pytest.raises(OSError):
+        journal.checkpoint(live)
+    monkeypatch.undo()
+    journal.close()
+
+    assert_same_state(recover(path), live)